@@ -0,0 +1,68 @@
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from os import makedirs, path
+from benchmarks.datasets import build_database
+from benchmarks.harness import SCENARIOS, compare, metadata, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Run repository and CLI benchmarks and compare them against a baseline.",
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--operations", type=int, default=200, help="Samples for single operations.")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples for batches, pages and CLI runs.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default="benchmarks/data", help="Cache of generated datasets.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--baseline", help="JSON results to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown, 0.2 = 20%%.")
+    args = parser.parse_args()
+
+    makedirs(args.data_dir, exist_ok=True)
+    results = {}
+
+    for rows in args.rows:
+        dataset = build_database(args.data_dir, rows, args.seed)
+
+        # Scenarios write, so they run against a copy of the cached dataset.
+        with tempfile.TemporaryDirectory() as directory:
+            database = path.join(directory, "tasks.db")
+            shutil.copyfile(dataset, database)
+
+            for name in args.scenario:
+                cases = SCENARIOS[name](database, rows, args.operations, args.repeat)
+
+                for case, timings in cases.items():
+                    key = f"{rows}/{name}/{case}"
+                    results[key] = summarize(timings)
+                    print(f"{key:<48} {results[key]['median_ms']:>12.3f} ms", flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"metadata": metadata(), "results": results}, file, indent=4)
+
+    if not args.baseline:
+        return
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+
+    regressions = compare(results, baseline, args.threshold)
+
+    for key, before, after, ratio in regressions:
+        print(f"REGRESSION {key}: {before:.3f} ms -> {after:.3f} ms ({ratio:.2f}x)")
+
+    if regressions:
+        sys.exit(1)
+
+    print(f"No regressions above {args.threshold:.0%} against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from os import path
+from task_cli.async_repository import AsyncTaskRepository
+from task_cli.database import init_db
+from task_cli.model import CreateTask, Status, UpdateTask
+
+
+async def client(repo: AsyncTaskRepository, operations: int, write_ratio: float, latencies: dict):
+    rng = random.Random()
+
+    for index in range(operations):
+        start = time.perf_counter()
+
+        if rng.random() < write_ratio:
+            kind = "write"
+            task = await repo.add(CreateTask(status=Status.TODO, description=f"Load #{index}"))
+
+            if task is not None and rng.random() < 0.5:
+                await repo.update(task, UpdateTask(status=Status.IN_PROGRESS))
+        else:
+            kind = "read"
+            await repo.find_by_id(rng.randrange(1, 1000))
+
+        latencies[kind].append(time.perf_counter() - start)
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        database = path.join(directory, "bench.db")
+        init_db(database)
+        latencies = {"read": [], "write": []}
+
+        async with AsyncTaskRepository(database, args.readers, args.max_batch) as repo:
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    client(repo, args.operations, args.write_ratio, latencies)
+                    for _ in range(args.coroutines)
+                )
+            )
+            elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{args.coroutines} coroutines x {args.operations} operations in {elapsed:.2f} s")
+    print(f"throughput: {total / elapsed:,.0f} ops/s\n")
+    print(f"{'kind':<6} {'count':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+
+    for kind, values in latencies.items():
+        if values:
+            print(
+                f"{kind:<6} {len(values):>8} {statistics.median(values) * 1000:>8.2f}"
+                f" {percentile(values, 0.99) * 1000:>8.2f} {max(values) * 1000:>8.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for AsyncTaskRepository.")
+    parser.add_argument("--coroutines", type=int, default=2000)
+    parser.add_argument("--operations", type=int, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.5)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--max-batch", type=int, default=256)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
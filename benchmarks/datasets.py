@@ -0,0 +1,77 @@
+import random
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from os import path, remove, replace
+from task_cli.database import migrate
+
+STATUS_WEIGHTS = {"todo": 0.25, "in-progress": 0.05, "done": 0.70}
+DUE_DATE_RATIO = 0.4
+VERBS = (
+    "Fix", "Review", "Write", "Update", "Plan", "Call", "Email", "Prepare",
+    "Schedule", "Test", "Deploy", "Refactor", "Draft", "Book", "Pay", "Clean",
+)
+NOUNS = (
+    "invoice", "report", "release", "meeting", "dentist", "budget", "roadmap",
+    "newsletter", "database", "migration", "onboarding", "contract", "slides",
+    "backup", "dashboard", "groceries", "taxes", "presentation", "interview",
+    "documentation", "benchmark", "server", "garden", "car", "flight",
+)
+
+
+def generate_rows(rows: int, seed: int = 0, now: datetime | None = None):
+    rng = random.Random(seed)
+    now = now or datetime(2025, 6, 1)
+    statuses = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=rows)
+
+    for index, status in enumerate(statuses):
+        description = f"{rng.choice(VERBS)} {rng.choice(NOUNS)} and {rng.choice(NOUNS)} #{index + 1}"
+        created_at = now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        updated_at = None
+        due_date = None
+
+        if status != "todo":
+            updated_at = created_at + timedelta(seconds=rng.randrange(30 * 24 * 3600))
+
+        if rng.random() < DUE_DATE_RATIO:
+            due_date = (created_at + timedelta(days=rng.randrange(-7, 60))).date().isoformat()
+
+        yield (
+            description,
+            status,
+            due_date,
+            created_at.isoformat(sep=" ", timespec="seconds"),
+            updated_at.isoformat(sep=" ", timespec="seconds") if updated_at else None,
+        )
+
+
+def populate(connection: sqlite3.Connection, rows: int, seed: int = 0) -> int:
+    with connection:
+        cursor = connection.executemany(
+            """
+            INSERT INTO tasks (description, status, due_date, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            generate_rows(rows, seed),
+        )
+
+    return cursor.rowcount
+
+
+def build_database(directory: str, rows: int, seed: int = 0) -> str:
+    database = path.join(directory, f"tasks-{rows}-{seed}.db")
+
+    if path.exists(database):
+        return database
+
+    partial = database + ".partial"
+
+    if path.exists(partial):
+        remove(partial)
+
+    with closing(sqlite3.connect(partial)) as connection:
+        migrate(connection)
+        populate(connection, rows, seed)
+
+    replace(partial, database)
+    return database
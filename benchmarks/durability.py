@@ -0,0 +1,60 @@
+import argparse
+import tempfile
+import time
+from os import path
+from task_cli.database import DURABILITY_PROFILES, init_db
+from task_cli.model import CreateTask, Status, UpdateTask
+from task_cli.repository import GroupCommit, TaskRepository
+
+GUARANTEES = {
+    "strict": ("yes", "yes"),
+    "normal": ("yes", "last commits may roll back"),
+    "fast": ("yes", "database may corrupt"),
+}
+
+
+def run(database: str, profile: str, group_commit: GroupCommit | None, writes: int) -> float:
+    init_db(database)
+
+    with TaskRepository(database, durability=profile, group_commit=group_commit) as repo:
+        start = time.perf_counter()
+
+        for index in range(writes):
+            task = repo.add(CreateTask(status=Status.TODO, description=f"Task #{index}"))
+
+            if task is not None and index % 2:
+                repo.update(task, UpdateTask(status=Status.DONE))
+
+        elapsed = time.perf_counter() - start
+
+    return (writes + writes // 2) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write throughput per durability profile.")
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--group-size", type=int, default=100)
+    args = parser.parse_args()
+
+    modes = {"off": None, f"{args.group_size} writes": GroupCommit(args.group_size, 0.1)}
+
+    print("| profile | group commit | writes/s | survives app crash | survives power loss |")
+    print("|---|---|---:|---|---|")
+
+    for profile in DURABILITY_PROFILES:
+        for mode, group_commit in modes.items():
+            with tempfile.TemporaryDirectory() as directory:
+                throughput = run(path.join(directory, "bench.db"), profile, group_commit, args.writes)
+
+            app_crash, power_loss = GUARANTEES[profile]
+
+            if group_commit is not None:
+                window = f"loses open window (≤ {args.group_size} writes / 100 ms)"
+                app_crash = window
+                power_loss = window if power_loss == "yes" else f"{power_loss}; {window}"
+
+            print(f"| {profile} | {mode} | {throughput:,.0f} | {app_crash} | {power_loss} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import io
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from task_cli.model import CreateTask, Status, UpdateTask
+from task_cli.render import FORMATS, render_tasks
+from task_cli.repository import TaskRepository
+
+BATCH_SIZE = 1000
+PAGE_SIZE = 1000
+LIST_LIMIT = 10_000
+CLI_COMMANDS = {
+    "list": ["list", "--limit", "100"],
+    "list todo tsv": ["list", "todo", "--limit", "100", "--format", "tsv"],
+    "add": ["add", "Benchmark task"],
+}
+
+
+def measure(function, repeat: int) -> list[float]:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def bench_add(database: str, rows: int, operations: int, repeat: int) -> dict:
+    task = CreateTask(status=Status.TODO, description="Benchmark task")
+
+    with TaskRepository(database) as repo:
+        return {
+            "single": measure(lambda: repo.add(task), operations),
+            f"add_many x{BATCH_SIZE}": measure(lambda: repo.add_many([task] * BATCH_SIZE), repeat),
+        }
+
+
+def bench_update(database: str, rows: int, operations: int, repeat: int) -> dict:
+    rng = random.Random(0)
+    statuses = list(Status)
+
+    def update():
+        data = UpdateTask(status=rng.choice(statuses))
+        repo.update_by_id(rng.randint(1, rows), data)
+
+    def update_many():
+        repo.update_many(
+            (rng.randint(1, rows), UpdateTask(status=rng.choice(statuses)))
+            for _ in range(BATCH_SIZE)
+        )
+
+    with TaskRepository(database) as repo:
+        return {
+            "single": measure(update, operations),
+            f"update_many x{BATCH_SIZE}": measure(update_many, repeat),
+        }
+
+
+def bench_find_by_status(database: str, rows: int, operations: int, repeat: int) -> dict:
+    results = {}
+
+    with TaskRepository(database) as repo:
+        for status in Status:
+            results[f"{status.value} first page"] = measure(
+                lambda: list(repo.iter_by_status([status], limit=PAGE_SIZE)), repeat
+            )
+
+        results["by id"] = measure(lambda: repo.find_by_id(rows // 2), operations)
+
+    return results
+
+
+def bench_list(database: str, rows: int, operations: int, repeat: int) -> dict:
+    results = {}
+
+    with TaskRepository(database) as repo:
+        for format in FORMATS:
+            results[f"{format} x{LIST_LIMIT}"] = measure(
+                lambda: render_tasks(repo.iter_by_status(limit=LIST_LIMIT), format, io.StringIO()),
+                repeat,
+            )
+
+    return results
+
+
+def bench_cli(database: str, rows: int, operations: int, repeat: int) -> dict:
+    # The CLI opens tasks.db in its working directory; the socket path points
+    # nowhere so that a running server cannot take over the invocation.
+    directory = os.path.dirname(database)
+    env = dict(os.environ, TASK_CLI_SOCKET=os.path.join(directory, "missing.sock"))
+    results = {}
+
+    for name, argv in CLI_COMMANDS.items():
+        command = [sys.executable, "-m", "task_cli.task_cli", *argv]
+        results[name] = measure(
+            lambda: subprocess.run(command, cwd=directory, env=env, capture_output=True, check=True),
+            repeat,
+        )
+
+    return results
+
+
+# Read-only scenarios run first so that writes do not skew them.
+SCENARIOS = {
+    "find_by_status": bench_find_by_status,
+    "list": bench_list,
+    "cli": bench_cli,
+    "add": bench_add,
+    "update": bench_update,
+}
+
+
+def summarize(timings: list[float]) -> dict:
+    median = statistics.median(timings)
+
+    return {
+        "median_ms": median * 1000,
+        "min_ms": min(timings) * 1000,
+        "ops_per_sec": 1 / median if median else None,
+        "samples": len(timings),
+    }
+
+
+def metadata() -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[tuple]:
+    regressions = []
+
+    for key, current in results.items():
+        previous = baseline.get(key)
+
+        if previous is None or not previous["median_ms"]:
+            continue
+
+        ratio = current["median_ms"] / previous["median_ms"]
+
+        if ratio > 1 + threshold:
+            regressions.append((key, previous["median_ms"], current["median_ms"], ratio))
+
+    return regressions
@@ -0,0 +1,85 @@
+import argparse
+import gc
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import closing
+from datetime import datetime
+from os import path
+from benchmarks.datasets import generate_rows, populate
+from task_cli.database import init_db
+from task_cli.model import Status, Task
+from task_cli.repository import TaskRepository
+
+
+def legacy_hydrate(row):
+    return Task(
+        id=row[0],
+        description=row[1],
+        status=Status(row[2]),
+        due_date=datetime.fromisoformat(row[3]).date() if row[3] else None,
+        created_at=datetime.fromisoformat(row[4]),
+        updated_at=datetime.fromisoformat(row[5]) if row[5] else None,
+    )
+
+
+def measure(function, repeat: int) -> float:
+    timings = []
+    gc.collect()
+    gc.disable()
+
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row Task hydration cost.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-speedup",
+        type=float,
+        default=None,
+        help="Exit with an error if Task.from_row is not at least this much faster.",
+    )
+    args = parser.parse_args()
+
+    rows = [
+        (index, *values)
+        for index, values in enumerate(generate_rows(args.rows), start=1)
+    ]
+
+    legacy = measure(lambda: list(map(legacy_hydrate, rows)), args.repeat)
+    trusted = measure(lambda: list(map(Task.from_row, rows)), args.repeat)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = path.join(directory, "bench.db")
+        init_db(database)
+
+        with closing(sqlite3.connect(database)) as connection:
+            populate(connection, args.rows)
+
+        with TaskRepository(database) as repo:
+            listing = measure(lambda: sum(1 for _ in repo.iter_by_status()), args.repeat)
+
+    speedup = legacy / trusted
+
+    print(f"legacy hydration:      {legacy / args.rows * 1e9:8.0f} ns/row")
+    print(f"Task.from_row:         {trusted / args.rows * 1e9:8.0f} ns/row ({speedup:.1f}x)")
+    print(f"iter_by_status (all):  {listing / args.rows * 1e9:8.0f} ns/row")
+
+    if args.min_speedup is not None and speedup < args.min_speedup:
+        print(f"Speedup {speedup:.1f}x is below {args.min_speedup}x.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from os import path
+from benchmarks.datasets import populate
+from task_cli.database import SCHEMA_VERSION, migrate
+from task_cli.model import Status
+from task_cli.repository import TaskRepository
+
+QUERIES = {
+    "first page": "SELECT * FROM tasks WHERE status = ? ORDER BY id LIMIT 50",
+    "count": "SELECT COUNT(*) FROM tasks WHERE status = ?",
+    "due in range": (
+        "SELECT * FROM tasks WHERE status = ? AND due_date BETWEEN '2025-05-01' AND '2025-05-07'"
+    ),
+}
+
+
+def measure(function, repeat: int) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) * 1000
+
+
+def run(database: str, repeat: int):
+    results = {}
+
+    with closing(sqlite3.connect(database)) as connection, TaskRepository(database) as repo:
+        for status in Status:
+            for name, query in QUERIES.items():
+                results[(status.value, name)] = measure(
+                    lambda: connection.execute(query, (status.value,)).fetchall(), repeat
+                )
+
+            results[(status.value, "find_by_status")] = measure(
+                lambda: repo.find_by_status([status]), 1
+            )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List-by-status latency before and after indexes.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = path.join(directory, "bench.db")
+
+        with closing(sqlite3.connect(database)) as connection:
+            migrate(connection, target=1)
+            populate(connection, args.rows)
+
+        before = run(database, args.repeat)
+
+        with closing(sqlite3.connect(database)) as connection:
+            start = time.perf_counter()
+            migrate(connection, SCHEMA_VERSION)
+            print(f"Migration to v{SCHEMA_VERSION}: {time.perf_counter() - start:.2f} s\n")
+
+        after = run(database, args.repeat)
+
+    print(f"{'status':<12} {'query':<16} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+
+    for (status, name), elapsed in before.items():
+        improved = after[(status, name)]
+        print(
+            f"{status:<12} {name:<16} {elapsed:>10.2f} {improved:>10.2f} {elapsed / improved:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from os import path
+from benchmarks.datasets import populate
+from task_cli.database import init_db
+from task_cli.repository import TaskRepository
+
+
+def measure(function, repeat: int) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search versus LIKE scans.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--queries", nargs="+", default=["dentist", "invoice budget", "#123456"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = path.join(directory, "bench.db")
+        init_db(database)
+
+        with closing(sqlite3.connect(database)) as connection:
+            populate(connection, args.rows)
+
+        with TaskRepository(database) as repo:
+            connection = repo.pool.acquire()
+
+            print("LIKE scans every row; search returns the 20 best-ranked matches.\n")
+            print(f"{'query':<16} {'LIKE ms':>10} {'search ms':>10} {'speedup':>8}")
+
+            for query in args.queries:
+                conditions = " AND ".join("description LIKE ?" for _ in query.split())
+                like = f"SELECT * FROM tasks WHERE {conditions}"
+                patterns = [f"%{term}%" for term in query.split()]
+
+                scan = measure(lambda: connection.execute(like, patterns).fetchall(), args.repeat)
+                search = measure(lambda: repo.search(query), args.repeat)
+
+                print(f"{query:<16} {scan:>10.2f} {search:>10.2f} {scan / search:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import multiprocessing
+import sqlite3
+import tempfile
+import time
+from os import path
+from task_cli.database import DURABILITY_PROFILES
+from task_cli.model import CreateTask, Status
+from task_cli.sharding import ShardedTaskRepository
+
+
+def write(database: str, shards: int, home: int, profile: str, writes: int, barrier, failures):
+    failed = 0
+
+    with ShardedTaskRepository(database, shards, durability=profile, home=home) as repo:
+        barrier.wait()
+
+        for index in range(writes):
+            try:
+                repo.add(CreateTask(status=Status.TODO, description=f"Task #{index}"))
+            except sqlite3.OperationalError:
+                # "database is locked" once the busy timeout runs out.
+                failed += 1
+
+    with failures.get_lock():
+        failures.value += failed
+
+
+def run(
+    database: str, shards: int, writers: int, profile: str, writes: int
+) -> tuple[float, int]:
+    ShardedTaskRepository(database, shards).init_db()
+    barrier = multiprocessing.Barrier(writers + 1)
+    failures = multiprocessing.Value("i", 0)
+    processes = [
+        multiprocessing.Process(
+            target=write,
+            args=(database, shards, index % shards, profile, writes, barrier, failures),
+        )
+        for index in range(writers)
+    ]
+
+    for process in processes:
+        process.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+
+    for process in processes:
+        process.join()
+
+    elapsed = time.perf_counter() - start
+    return (writers * writes - failures.value) / elapsed, failures.value
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Single-row add throughput of concurrent writers per number of shards."
+    )
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--writes", type=int, default=500, help="Adds per writer process.")
+    parser.add_argument("--durability", choices=DURABILITY_PROFILES, default="strict")
+    args = parser.parse_args()
+
+    print("| writers | 1 database writes/s | failed | sharded writes/s | failed |")
+    print("|---:|---:|---:|---:|---:|")
+
+    # Every run uses as many writers as shards, each with its own home shard,
+    # and is compared with the same writers sharing a single database.
+    for shards in args.shards:
+        with tempfile.TemporaryDirectory() as directory:
+            single, single_failed = run(
+                path.join(directory, "single.db"), 1, shards, args.durability, args.writes
+            )
+
+        with tempfile.TemporaryDirectory() as directory:
+            sharded, sharded_failed = run(
+                path.join(directory, "sharded.db"), shards, shards, args.durability, args.writes
+            )
+
+        print(
+            f"| {shards} | {single:,.0f} | {single_failed} | {sharded:,.0f} | {sharded_failed} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
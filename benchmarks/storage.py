@@ -0,0 +1,55 @@
+import argparse
+import tempfile
+import time
+from os import path
+from task_cli.database import DURABILITY_PROFILES, init_db
+from task_cli.log_store import LogTaskStore
+from task_cli.model import CreateTask, Status, UpdateTask
+from task_cli.repository import TaskRepository
+
+
+def open_store(directory: str, backend: str, profile: str):
+    if backend == "log":
+        return LogTaskStore(path.join(directory, "bench.log"), durability=profile)
+
+    database = path.join(directory, "bench.db")
+    init_db(database)
+    return TaskRepository(database, durability=profile)
+
+
+def run(directory: str, backend: str, profile: str, writes: int) -> tuple[float, float]:
+    with open_store(directory, backend, profile) as store:
+        start = time.perf_counter()
+
+        for index in range(writes):
+            store.add(CreateTask(status=Status.TODO, description=f"Task #{index}"))
+
+        added = time.perf_counter() - start
+        start = time.perf_counter()
+
+        for id in range(1, writes + 1):
+            store.update_by_id(id, UpdateTask(status=Status.DONE))
+
+        updated = time.perf_counter() - start
+
+    return writes / added, writes / updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-row write throughput per storage backend.")
+    parser.add_argument("--writes", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("| profile | backend | adds/s | updates/s |")
+    print("|---|---|---:|---:|")
+
+    for profile in DURABILITY_PROFILES:
+        for backend in ("sqlite", "log"):
+            with tempfile.TemporaryDirectory() as directory:
+                adds, updates = run(directory, backend, profile, args.writes)
+
+            print(f"| {profile} | {backend} | {adds:,.0f} | {updates:,.0f} |")
+
+
+if __name__ == "__main__":
+    main()
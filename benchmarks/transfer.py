@@ -0,0 +1,75 @@
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import closing
+from os import path, remove
+from benchmarks.datasets import populate
+from task_cli.database import init_db
+from task_cli.repository import TaskRepository
+from task_cli.transfer import DEFAULT_CHUNK_SIZE, FORMATS, export_tasks, import_tasks
+
+
+def measure(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import and export throughput.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--durability", default="strict")
+    parser.add_argument(
+        "--min-rows-per-second",
+        type=float,
+        default=None,
+        help="Exit with an error if an import or export is slower than this.",
+    )
+    args = parser.parse_args()
+    slowest = None
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = path.join(directory, "source.db")
+        target = path.join(directory, "target.db")
+        init_db(source)
+
+        with closing(sqlite3.connect(source)) as connection:
+            populate(connection, args.rows)
+
+        print(f"{'format':<8} {'export rows/s':>14} {'import rows/s':>14}")
+
+        for format in FORMATS:
+            file_name = path.join(directory, f"tasks.{format}")
+
+            with TaskRepository(source, durability=args.durability) as repo:
+                exported = measure(
+                    lambda: export_tasks(repo, file_name, format, args.chunk_size)
+                )
+
+            if path.exists(target):
+                remove(target)
+
+            init_db(target)
+
+            with TaskRepository(target, durability=args.durability) as repo:
+                imported = measure(
+                    lambda: import_tasks(repo, file_name, format, args.chunk_size)
+                )
+
+            rates = (args.rows / exported, args.rows / imported)
+            slowest = min(*rates, slowest or rates[0])
+            print(f"{format:<8} {rates[0]:>14,.0f} {rates[1]:>14,.0f}")
+
+    if args.min_rows_per_second is not None and slowest < args.min_rows_per_second:
+        print(
+            f"{slowest:,.0f} rows/s is below {args.min_rows_per_second:,.0f} rows/s.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import gc
+import sys
+import tempfile
+import time
+from dataclasses import MISSING, fields
+from datetime import date
+from os import path
+from task_cli.database import init_db
+from task_cli.model import CreateTask, Status, UpdateTask
+from task_cli.repository import TaskRepository, bind_update
+
+
+def legacy_update_task(**kwargs) -> UpdateTask:
+    data = object.__new__(UpdateTask)
+    data._dirty_fields = set(kwargs.keys())
+
+    for obj_field in fields(data):
+        if obj_field.name == "_dirty_fields":
+            continue
+
+        value = None
+
+        if obj_field.name in kwargs:
+            value = kwargs[obj_field.name]
+        elif obj_field.default_factory is not MISSING:
+            value = obj_field.default_factory()
+        elif obj_field.default is not MISSING:
+            value = obj_field.default
+
+        setattr(data, obj_field.name, value)
+
+    data._dirty_fields.add("updated_at")
+    data.__post_init__()
+    return data
+
+
+def legacy_bind_update(data: UpdateTask) -> tuple[str, list]:
+    field_keys = []
+    field_values = []
+    items = {
+        field.name: getattr(data, field.name)
+        for field in fields(data)
+        if field.name != "_dirty_fields"
+    }.items()
+
+    for field, value in items:
+        if data.is_set(field):
+            field_keys.append(f"{field} = ?")
+
+            if type(value) is Status:
+                field_values.append(value.value)
+            elif type(value) is date:
+                field_values.append(value.isoformat())
+            else:
+                field_values.append(value)
+
+    return f"UPDATE tasks SET {', '.join(field_keys)} WHERE id = ?", field_values
+
+
+def measure(function, repeat: int) -> float:
+    timings = []
+    gc.collect()
+    gc.disable()
+
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-update CPU cost of building update SQL.")
+    parser.add_argument("--updates", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-speedup",
+        type=float,
+        default=None,
+        help="Exit with an error if construction and binding are not at least this much faster.",
+    )
+    args = parser.parse_args()
+
+    # The field combinations of mark-*, due and update.
+    kwargs = [
+        {"status": Status.DONE},
+        {"due_date": date(2025, 5, 1)},
+        {"description": "Task (edited)"},
+    ] * (args.updates // 3)
+    count = len(kwargs)
+
+    legacy_construct = measure(lambda: [legacy_update_task(**k) for k in kwargs], args.repeat)
+    construct = measure(lambda: [UpdateTask(**k) for k in kwargs], args.repeat)
+
+    updates = [UpdateTask(**k) for k in kwargs]
+    legacy_bind = measure(lambda: list(map(legacy_bind_update, updates)), args.repeat)
+    bind = measure(lambda: list(map(bind_update, updates)), args.repeat)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = path.join(directory, "bench.db")
+        init_db(database)
+
+        with TaskRepository(database, durability="fast") as repo:
+            repo.add_many(
+                CreateTask(status=Status.TODO, description=f"Task #{index}")
+                for index in range(count)
+            )
+            pairs = list(zip(range(1, count + 1), updates))
+            update_many = measure(lambda: repo.update_many(pairs), args.repeat)
+
+    legacy = legacy_construct + legacy_bind
+    speedup = legacy / (construct + bind)
+
+    def per_update(seconds: float) -> str:
+        return f"{seconds / count * 1e9:8.0f} ns/update"
+
+    print(f"legacy UpdateTask:      {per_update(legacy_construct)}")
+    print(f"UpdateTask:             {per_update(construct)} ({legacy_construct / construct:.1f}x)")
+    print(f"legacy SQL and values:  {per_update(legacy_bind)}")
+    print(f"bind_update:            {per_update(bind)} ({legacy_bind / bind:.1f}x)")
+    print(f"both:                   {per_update(construct + bind)} ({speedup:.1f}x)")
+    print(f"update_many (fast):     {per_update(update_many)}")
+
+    if args.min_speedup is not None and speedup < args.min_speedup:
+        print(f"Speedup {speedup:.1f}x is below {args.min_speedup}x.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
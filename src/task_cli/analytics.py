@@ -0,0 +1,161 @@
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import compress
+from task_cli.model import EPOCH_DAY, MISSING_VALUE, OPEN_STATUSES, STATUS_CODES, Status
+from task_cli.repository import TaskRepository
+
+DEFAULT_PAGE_SIZE = 50_000
+DEFAULT_REPORT_DAYS = 28
+# Upper bounds in days (inclusive) of the open task age histogram buckets.
+AGE_BUCKETS = (0, 1, 7, 30, 90, 365)
+
+
+def to_epoch_day(value: date) -> int:
+    return value.toordinal() - EPOCH_DAY
+
+
+def from_epoch_day(day: int) -> date:
+    return date.fromordinal(EPOCH_DAY + day)
+
+
+def status_mask(*statuses: Status) -> bytes:
+    # Translation table turning a column of status codes into 0/1 flags,
+    # which itertools.compress and bytes.count consume at C speed.
+    table = bytearray(256)
+
+    for status in statuses:
+        table[STATUS_CODES[status]] = 1
+
+    return bytes(table)
+
+
+def since_day(counts: Counter, since: int) -> Counter:
+    return Counter({day: count for day, count in counts.items() if day >= since})
+
+
+@dataclass
+class Snapshot:
+    today: int
+    ids: array = field(default_factory=lambda: array("q"))
+    statuses: bytearray = field(default_factory=bytearray)
+    created: array = field(default_factory=lambda: array("i"))
+    updated: array = field(default_factory=lambda: array("i"))
+    due: array = field(default_factory=lambda: array("i"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mask(self, *statuses: Status) -> bytearray:
+        return self.statuses.translate(status_mask(*statuses))
+
+    def status_counts(self) -> dict[Status, int]:
+        return {status: self.statuses.count(code) for status, code in STATUS_CODES.items()}
+
+    def completion_rate(self) -> float:
+        return self.statuses.count(STATUS_CODES[Status.DONE]) / len(self) if len(self) else 0.0
+
+    # Counter tallies a column in C; only the distinct days are then visited
+    # in Python, never the individual tasks.
+    def created_per_day(self, since: int) -> Counter:
+        return since_day(Counter(self.created), since)
+
+    def completed_per_day(self, since: int) -> Counter:
+        return since_day(Counter(compress(self.updated, self.mask(Status.DONE))), since)
+
+    def overdue(self) -> int:
+        due = Counter(compress(self.due, self.mask(*OPEN_STATUSES)))
+        return sum(count for day, count in due.items() if MISSING_VALUE < day < self.today)
+
+    def age_histogram(self, buckets: tuple[int, ...] = AGE_BUCKETS) -> dict[str, int]:
+        days = Counter(compress(self.created, self.mask(*OPEN_STATUSES)))
+        labels = [
+            f"{previous + 1}-{bound}d" if previous + 1 < bound else f"{bound}d"
+            for previous, bound in zip((-1, *buckets), buckets)
+        ]
+        labels.append(f">{buckets[-1]}d")
+        histogram = dict.fromkeys(labels, 0)
+
+        for day, count in days.items():
+            age = self.today - day
+            index = next((i for i, bound in enumerate(buckets) if age <= bound), len(buckets))
+            histogram[labels[index]] += count
+
+        return histogram
+
+
+def load_snapshot(
+    repository: TaskRepository,
+    today: date | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Snapshot:
+    snapshot = Snapshot(to_epoch_day(today or date.today()))
+    codes = " ".join(f"WHEN '{status.value}' THEN {code}" for status, code in STATUS_CODES.items())
+
+    # Dates are converted to days since 1970-01-01 by SQLite, and each page is
+    # transposed with zip so that the columns are extended without a Python
+    # loop per row.
+    with repository.transaction() as connection:
+        cursor = connection.execute(
+            f"""
+            SELECT
+                id,
+                CASE status {codes} END,
+                IFNULL(CAST(julianday(created_at) - 2440587.5 AS INTEGER), {MISSING_VALUE}),
+                IFNULL(CAST(julianday(updated_at) - 2440587.5 AS INTEGER), {MISSING_VALUE}),
+                IFNULL(CAST(julianday(due_date) - 2440587.5 AS INTEGER), {MISSING_VALUE})
+            FROM tasks
+            """
+        )
+
+        while rows := cursor.fetchmany(page_size):
+            ids, statuses, created, updated, due = zip(*rows)
+            snapshot.ids.extend(ids)
+            snapshot.statuses.extend(statuses)
+            snapshot.created.extend(created)
+            snapshot.updated.extend(updated)
+            snapshot.due.extend(due)
+
+    return snapshot
+
+
+def build_report(snapshot: Snapshot, days: int = DEFAULT_REPORT_DAYS) -> dict:
+    since = snapshot.today - days + 1
+    created = snapshot.created_per_day(since)
+    completed = snapshot.completed_per_day(since)
+
+    return {
+        "date": from_epoch_day(snapshot.today).isoformat(),
+        "total": len(snapshot),
+        "by_status": {status.value: count for status, count in snapshot.status_counts().items()},
+        "completion_rate": snapshot.completion_rate(),
+        "overdue": snapshot.overdue(),
+        "open_age": snapshot.age_histogram(),
+        "per_day": [
+            {
+                "date": from_epoch_day(day).isoformat(),
+                "created": created[day],
+                "completed": completed[day],
+            }
+            for day in range(since, snapshot.today + 1)
+        ],
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [f"Report for {report['date']}", f"total: {report['total']}"]
+    lines.extend(f"{status}: {count}" for status, count in report["by_status"].items())
+    lines.append(f"completion rate: {report['completion_rate']:.1%}")
+    lines.append(f"overdue: {report['overdue']}")
+    lines.append("")
+    lines.append("Open tasks by age")
+    lines.extend(f"  {label:<10} {count:>10}" for label, count in report["open_age"].items())
+    lines.append("")
+    lines.append(f"  {'date':<10} {'created':>10} {'completed':>10}")
+    lines.extend(
+        f"  {day['date']:<10} {day['created']:>10} {day['completed']:>10}"
+        for day in report["per_day"]
+    )
+
+    return "\n".join(lines)
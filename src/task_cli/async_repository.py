@@ -0,0 +1,131 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from task_cli.connection import ConnectionPool
+from task_cli.database import durability_pragmas
+from task_cli.model import CreateTask, Status, Task, UpdateTask
+from task_cli.repository import TaskRepository
+
+DEFAULT_READERS = 4
+DEFAULT_MAX_BATCH = 256
+
+
+class AsyncTaskRepository:
+    def __init__(
+        self,
+        db: str,
+        readers: int = DEFAULT_READERS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        durability: str = "normal",
+    ):
+        self.db = db
+        self.max_batch = max_batch
+        self.repository = TaskRepository(
+            db,
+            ConnectionPool(db, size=readers + 1, pragmas=durability_pragmas(durability)),
+        )
+        self._readers = ThreadPoolExecutor(readers, thread_name_prefix="task-reader")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="task-writer")
+        self._queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def __read(self, function: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, function, *args)
+
+    async def __write(self, function: Callable, *args) -> Any:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self.__write_loop(self._queue))
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((function, args, future))
+        return await future
+
+    async def __write_loop(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await queue.get()
+
+            if item is None:
+                return
+
+            batch = [item]
+
+            while len(batch) < self.max_batch and not queue.empty():
+                item = queue.get_nowait()
+
+                if item is None:
+                    stopping = True
+                    break
+
+                batch.append(item)
+
+            try:
+                outcomes = await loop.run_in_executor(self._writer, self.__apply, batch)
+            except Exception as error:
+                outcomes = [(None, error)] * len(batch)
+
+            for (_, _, future), (result, failure) in zip(batch, outcomes):
+                if future.done():
+                    continue
+
+                if failure is not None:
+                    future.set_exception(failure)
+                else:
+                    future.set_result(result)
+
+    def __apply(self, batch: list) -> list:
+        outcomes: list[tuple[Any, Exception | None]] = []
+
+        with self.repository.transaction() as connection:
+            for function, args, _ in batch:
+                connection.execute("SAVEPOINT mutation")
+
+                try:
+                    outcomes.append((function(*args), None))
+                except Exception as error:
+                    connection.execute("ROLLBACK TO mutation")
+                    outcomes.append((None, error))
+                finally:
+                    connection.execute("RELEASE mutation")
+
+        return outcomes
+
+    async def find_by_id(self, id: int) -> Task | None:
+        return await self.__read(self.repository.find_by_id, id)
+
+    async def find_by_status(self, status: list[Status] | None = None) -> list[Task]:
+        return await self.__read(self.repository.find_by_status, status)
+
+    async def add(self, task: CreateTask) -> Task | None:
+        return await self.__write(self.repository.add, task)
+
+    async def update(self, task: Task, data: UpdateTask) -> Task | None:
+        return await self.__write(self.repository.update, task, data)
+
+    async def delete_by_id(self, id: int) -> bool:
+        return await self.__write(self.repository.delete_by_id, id)
+
+    async def size(self) -> int:
+        return await self.__read(self.repository.size)
+
+    async def close(self):
+        if self._queue is not None and self._writer_task is not None:
+            self._queue.put_nowait(None)
+            await self._writer_task
+            self._queue = None
+            self._writer_task = None
+
+        self._readers.shutdown()
+        self._writer.shutdown()
+        self.repository.close()
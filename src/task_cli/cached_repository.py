@@ -0,0 +1,369 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from copy import copy
+from dataclasses import dataclass
+from task_cli.connection import ConnectionPool
+from task_cli.database import default_durability
+from task_cli.model import CreateTask, Status, Task, TaskSelection, UpdateTask
+from task_cli.repository import GroupCommit, TaskRepository
+from task_cli.store import DEFAULT_PAGE_SIZE
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key):
+        value = self.entries.get(key)
+
+        if value is None:
+            self.stats.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def discard(self, keys: Iterable):
+        for key in keys:
+            if self.entries.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self):
+        self.stats.invalidations += len(self.entries)
+        self.entries.clear()
+
+
+class CachedTaskRepository(TaskRepository):
+    def __init__(
+        self,
+        db: str,
+        pool: ConnectionPool | None = None,
+        durability: str = default_durability,
+        group_commit: GroupCommit | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        check_interval: float = 0.0,
+    ):
+        super().__init__(db, pool, durability, group_commit)
+        self.cache = LRUCache(cache_size)
+        self.check_interval = check_interval
+        self._cache_lock = threading.Lock()
+        self._data_versions: dict[sqlite3.Connection, tuple[int, float]] = {}
+        self._staged = threading.local()
+        # Incremented by every change of the cache other than filling it after
+        # a read, so a read can tell whether a write happened while it ran.
+        self._generation = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def close(self):
+        super().close()
+
+        with self._cache_lock:
+            self._generation += 1
+            self.cache.clear()
+            self._data_versions.clear()
+
+    def __check_data_version(self):
+        # data_version changes when any other connection, including ones in
+        # other processes, commits. A connection seen for the first time has
+        # no reference point, so the cache is dropped to stay correct. Reading
+        # it costs about as much as a lookup by id, hence check_interval.
+        connection = self.pool.acquire()
+        now = time.monotonic()
+        version, checked_at = self._data_versions.get(connection, (None, None))
+
+        if checked_at is not None and now - checked_at < self.check_interval:
+            return
+
+        current = connection.execute("PRAGMA data_version").fetchone()[0]
+
+        with self._cache_lock:
+            if current != version:
+                self._generation += 1
+                self.cache.clear()
+
+            self._data_versions[connection] = (current, now)
+
+    @contextmanager
+    def transaction(self):
+        # Cache writes made inside a transaction are staged and applied once
+        # it ends without an error, and dropped if it is rolled back.
+        if self.__staging() is not None:
+            with super().transaction() as connection:
+                yield connection
+
+            return
+
+        self._staged.writes = []
+
+        try:
+            with super().transaction() as connection:
+                yield connection
+
+            writes = self._staged.writes
+        finally:
+            self._staged.writes = None
+
+        with self._cache_lock:
+            for write in writes:
+                write()
+
+    def __staging(self) -> list[Callable[[], None]] | None:
+        return getattr(self._staged, "writes", None)
+
+    def __write(self, write: Callable[[], None], invalidates: bool = False):
+        # Invalidations also take effect at once, so other threads stop
+        # reading entries that the transaction is about to change.
+        def apply():
+            self._generation += 1
+            write()
+
+        staged = self.__staging()
+
+        if staged is not None:
+            staged.append(apply)
+
+        if staged is None or invalidates:
+            with self._cache_lock:
+                apply()
+
+    def __fill(self, key: tuple, value, generation: int):
+        # Another thread may have written and invalidated the entry after this
+        # thread read its old value, so it is only cached if nothing changed.
+        def fill():
+            if self._generation == generation:
+                self.cache.put(key, value)
+
+        staged = self.__staging()
+
+        if staged is not None:
+            staged.append(fill)
+        else:
+            with self._cache_lock:
+                fill()
+
+    def __cached_status(self, id: int) -> Status | None:
+        task = self.cache.entries.get(("id", id))
+        return task.status if task is not None else None
+
+    def __invalidate(self, *statuses: Status | None):
+        # None stands for a status that is not known, which may match any query.
+        def write():
+            self.cache.discard(
+                [
+                    key
+                    for key in self.cache.entries
+                    if key[0] == "status"
+                    and (key[1] is None or None in statuses or not key[1].isdisjoint(statuses))
+                ]
+            )
+
+        self.__write(write, invalidates=True)
+
+    def __discard(self, id: int):
+        self.__write(lambda: self.cache.discard([("id", id)]), invalidates=True)
+
+    def __clear(self):
+        self.__write(self.cache.clear, invalidates=True)
+
+    def __store(self, task: Task):
+        # Callers get copies, so changing a returned task leaves the cache alone.
+        task = copy(task)
+        self.__write(lambda: self.cache.put(("id", task.id), task))
+
+    def __refresh(self, task: Task):
+        task = copy(task)
+
+        def write():
+            if ("id", task.id) in self.cache.entries:
+                self.cache.put(("id", task.id), task)
+
+        self.__write(write)
+
+    def find_by_id(self, id: int) -> Task | None:
+        self.__check_data_version()
+
+        generation = self._generation
+
+        # Inside a transaction the database has this thread's own changes,
+        # which the cache does not have yet.
+        if self.__staging() is None:
+            with self._cache_lock:
+                task = self.cache.get(("id", id))
+                generation = self._generation
+
+            if task is not None:
+                return copy(task)
+
+        task = super().find_by_id(id)
+
+        if task is not None:
+            self.__fill(("id", id), copy(task), generation)
+
+        return task
+
+    def find_by_status(self, status: list[Status] | None = None) -> list[Task]:
+        key = ("status", None if status is None else frozenset(status))
+        self.__check_data_version()
+        generation = self._generation
+        tasks = None
+
+        if self.__staging() is None:
+            with self._cache_lock:
+                tasks = self.cache.get(key)
+                generation = self._generation
+
+        if tasks is None:
+            tasks = tuple(map(copy, super().find_by_status(status)))
+            self.__fill(key, tasks, generation)
+
+        return list(map(copy, tasks))
+
+    def add(self, task: CreateTask) -> Task | None:
+        self.__check_data_version()
+        created = super().add(task)
+
+        if created is not None:
+            self.__invalidate(created.status)
+            self.__store(created)
+
+        return created
+
+    def add_many(self, tasks: Iterable[CreateTask]) -> int:
+        tasks = list(tasks)
+        self.__check_data_version()
+        count = super().add_many(tasks)
+        self.__invalidate(*{task.status for task in tasks})
+        return count
+
+    def import_many(self, tasks: Iterable[CreateTask]) -> int:
+        tasks = list(tasks)
+        self.__check_data_version()
+        count = super().import_many(tasks)
+        self.__invalidate(*{task.status for task in tasks})
+        return count
+
+    def update_by_id(
+        self,
+        id: int,
+        data: UpdateTask,
+        if_status: list[Status] | None = None,
+    ) -> Task | None:
+        self.__check_data_version()
+
+        with self._cache_lock:
+            previous = self.__cached_status(id)
+
+        task = super().update_by_id(id, data, if_status)
+
+        if task is None:
+            return None
+
+        if data.is_set("status"):
+            self.__invalidate(task.status, previous)
+        else:
+            self.__invalidate(task.status)
+
+        self.__store(task)
+        return task
+
+    def update_many(self, updates: Iterable[tuple[int, UpdateTask]]) -> int:
+        count = super().update_many(updates)
+        self.__clear()
+        return count
+
+    def iter_matching(
+        self, selection: TaskSelection, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        self.__check_data_version()
+
+        for task in super().iter_matching(selection, page_size):
+            self.__refresh(task)
+            yield task
+
+    def update_matching(self, selection: TaskSelection, data: UpdateTask) -> int:
+        try:
+            return super().update_matching(selection, data)
+        finally:
+            self.__clear()
+
+    def iter_update_matching(
+        self, selection: TaskSelection, data: UpdateTask, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        # The changes are visible to this thread while the tasks are streamed
+        # and are committed or rolled back when the iterator ends, so the
+        # cache is dropped at both points.
+        self.__clear()
+
+        try:
+            yield from super().iter_update_matching(selection, data, page_size)
+        finally:
+            self.__clear()
+
+    def delete_by_id(self, id: int) -> bool:
+        self.__check_data_version()
+
+        with self._cache_lock:
+            previous = self.__cached_status(id)
+
+        deleted = super().delete_by_id(id)
+
+        if deleted:
+            self.__discard(id)
+            self.__invalidate(previous)
+
+        return deleted
+
+    def delete_many(self, ids: Iterable[int]) -> int:
+        count = super().delete_many(ids)
+        self.__clear()
+        return count
+
+    def delete_matching(self, selection: TaskSelection) -> int:
+        try:
+            return super().delete_matching(selection)
+        finally:
+            self.__clear()
+
+    def iter_delete_matching(
+        self, selection: TaskSelection, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        self.__clear()
+
+        try:
+            yield from super().iter_delete_matching(selection, page_size)
+        finally:
+            self.__clear()
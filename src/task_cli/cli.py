@@ -1,16 +1,52 @@
+import os
 import sys
 import argparse
-from datetime import datetime
-from task_cli.database import default_database
-from task_cli.model import CreateTask, Status, UpdateTask
-from task_cli.repository import TaskRepository
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from functools import partial
+from task_cli.database import (
+    DURABILITY_PROFILES,
+    default_database,
+    default_durability,
+    migrate,
+    snapshot_path,
+)
+from task_cli.instrumentation import span
+from task_cli.model import (
+    OPEN_STATUSES,
+    STATUS_BY_VALUE,
+    CreateTask,
+    Status,
+    TaskSelection,
+    UpdateTask,
+)
+from task_cli.options import default_shards, default_storage
+from task_cli.render import FORMATS as RENDER_FORMATS, render_agenda, render_tasks
+from task_cli.repository import DEFAULT_PAGE_SIZE, TaskRepository
+from task_cli.store import TaskReader, TaskStore
+
+
+def int_at_least(value: str, minimum: int) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+
+    if number < minimum:
+        raise argparse.ArgumentTypeError(f"must be at least {minimum}: '{value}'")
+
+    return number
+
+
+positive_int = partial(int_at_least, minimum=1)
+non_negative_int = partial(int_at_least, minimum=0)
 
 
 def build_list_parser(subparsers):
     parser_list = subparsers.add_parser(
         "list",
         help="List tasks.",
-        usage="%(prog)s [status]",
+        usage="%(prog)s [status] [--limit N] [--after ID] [--page-size N] [--format FORMAT]",
     )
     parser_list.add_argument(
         "status",
@@ -19,6 +55,30 @@ def build_list_parser(subparsers):
         default=None,
         type=str,
     )
+    parser_list.add_argument(
+        "--limit",
+        help="Maximum number of tasks to show.",
+        default=None,
+        type=non_negative_int,
+    )
+    parser_list.add_argument(
+        "--after",
+        help="Show only tasks with an ID greater than this one.",
+        default=0,
+        type=int,
+    )
+    parser_list.add_argument(
+        "--page-size",
+        help="Number of tasks fetched from the database at a time.",
+        default=DEFAULT_PAGE_SIZE,
+        type=positive_int,
+    )
+    parser_list.add_argument(
+        "--format",
+        help="Output format.",
+        choices=RENDER_FORMATS,
+        default="table",
+    )
 
 
 def build_add_parser(subparsers):
@@ -55,19 +115,68 @@ def build_update_parser(subparsers):
     )
 
 
+def parse_id_range(value: str) -> tuple[int, int]:
+    start, separator, end = value.partition("-")
+
+    try:
+        return (int(start), int(end)) if separator else (int(value), int(value))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid id or range: '{value}'") from None
+
+
+def parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid date, use YYYY-MM-DD") from None
+
+
+def parse_due_date(value: str) -> date | None:
+    # "-" clears the due date; raises ValueError for anything but YYYY-MM-DD.
+    if value == "-":
+        return None
+
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+SELECTION_USAGE = "[<id> | <from>-<to> ...] [--status STATUS] [--due-before DATE] [--format FORMAT]"
+
+
+def add_selection_arguments(parser):
+    parser.add_argument(
+        "ids",
+        help="IDs of the tasks, or inclusive ranges of IDs such as 10-500.",
+        nargs="*",
+        type=parse_id_range,
+    )
+    parser.add_argument(
+        "--status",
+        help="Only select tasks with this status; can be repeated.",
+        choices=[status.value for status in Status],
+        action="append",
+    )
+    parser.add_argument(
+        "--due-before",
+        help="Only select tasks due before this date (YYYY-MM-DD).",
+        default=None,
+        type=parse_date,
+    )
+    parser.add_argument(
+        "--format",
+        help="Print the changed tasks in this format instead of their number.",
+        choices=RENDER_FORMATS,
+        default=None,
+    )
+
+
 def build_delete_parser(subparsers):
     parser_delete = subparsers.add_parser(
         "delete",
-        help="Delete a task.",
-        usage="%(prog)s <id>",
+        help="Delete tasks.",
+        usage=f"%(prog)s {SELECTION_USAGE}",
     )
 
-    parser_delete.add_argument(
-        "id",
-        help="ID of the task.",
-        nargs=1,
-        type=int,
-    )
+    add_selection_arguments(parser_delete)
 
 
 def build_due_parser(subparsers):
@@ -90,50 +199,456 @@ def build_due_parser(subparsers):
     )
 
 
-def build_mark_parser(subparsers):
-    for status in Status:
-        mark_parser = subparsers.add_parser(
-            f"mark-{status.value.lower()}",
-            help=f'Mark task as "{status.value}".',
-            usage="%(prog)s <id>",
-        )
+def build_mark_parser(subparsers, status: Status):
+    mark_parser = subparsers.add_parser(
+        f"mark-{status.value.lower()}",
+        help=f'Mark tasks as "{status.value}".',
+        usage=f"%(prog)s {SELECTION_USAGE}",
+    )
+
+    add_selection_arguments(mark_parser)
 
-        mark_parser.add_argument(
-            "id",
-            help="Set task status.",
-            nargs=1,
+
+def build_search_parser(subparsers):
+    parser_search = subparsers.add_parser(
+        "search",
+        help="Search task descriptions.",
+        usage="%(prog)s <query> [--limit N] [--page N] [--format FORMAT]",
+    )
+    parser_search.add_argument(
+        "query",
+        help="Words to search for, each matched as a prefix.",
+        nargs="+",
+        type=str,
+    )
+    parser_search.add_argument(
+        "--limit",
+        help="Number of results per page.",
+        default=20,
+        type=int,
+    )
+    parser_search.add_argument(
+        "--page",
+        help="Page of results to show, starting from 1.",
+        default=1,
+        type=int,
+    )
+    parser_search.add_argument(
+        "--format",
+        help="Output format.",
+        choices=RENDER_FORMATS,
+        default="table",
+    )
+
+
+def build_schedule_parser(subparsers, command: str):
+    has_days = command != "overdue"
+    has_format = command != "agenda"
+    usage = "%(prog)s" + (" [--days N]" if has_days else "") + " [--limit N]"
+
+    parser_schedule = subparsers.add_parser(
+        command,
+        help=SCHEDULE_HELP[command],
+        usage=usage + (" [--format FORMAT]" if has_format else ""),
+    )
+
+    if has_days:
+        parser_schedule.add_argument(
+            "--days",
+            help="Number of days after today to include (default: %(default)s).",
+            default=7,
             type=int,
         )
 
+    parser_schedule.add_argument(
+        "--limit",
+        help="Maximum number of tasks to show.",
+        default=None,
+        type=non_negative_int,
+    )
+
+    if has_format:
+        parser_schedule.add_argument(
+            "--format",
+            help="Output format.",
+            choices=RENDER_FORMATS,
+            default="table",
+        )
+
+
+def build_report_parser(subparsers):
+    parser_report = subparsers.add_parser(
+        "report",
+        help="Show completion rate, open task ages and tasks created and completed per day.",
+        usage="%(prog)s [--days N] [--format text|json]",
+    )
+    parser_report.add_argument(
+        "--days",
+        help="Number of days covered by the per-day table (default: %(default)s).",
+        default=28,
+        type=int,
+    )
+    parser_report.add_argument(
+        "--format",
+        help="Output format.",
+        choices=("text", "json"),
+        default="text",
+    )
+
+
+def build_changes_parser(subparsers):
+    parser_changes = subparsers.add_parser(
+        "changes",
+        help="Stream the journal of task changes as JSON Lines.",
+        usage="%(prog)s [--since SEQ] [--limit N] [--page-size N]",
+    )
+    parser_changes.add_argument(
+        "--since",
+        help="Show only changes with a sequence number greater than this one.",
+        default=0,
+        type=int,
+    )
+    parser_changes.add_argument(
+        "--limit",
+        help="Maximum number of changes to show.",
+        default=None,
+        type=non_negative_int,
+    )
+    parser_changes.add_argument(
+        "--page-size",
+        help="Number of changes fetched from the database at a time.",
+        default=DEFAULT_PAGE_SIZE,
+        type=positive_int,
+    )
+
+
+def build_snapshot_parser(subparsers):
+    parser_snapshot = subparsers.add_parser(
+        "snapshot",
+        help="Write a snapshot of the tasks that 'list' and 'stats' read instead of the database.",
+        usage="%(prog)s [--remove]",
+    )
+    parser_snapshot.add_argument(
+        "--remove",
+        help="Remove the snapshot so that 'list' and 'stats' read the database again.",
+        action="store_true",
+    )
+
+
+def build_stats_parser(subparsers):
+    parser_stats = subparsers.add_parser(
+        "stats",
+        help="Show task counts per status, overdue tasks and the oldest open task.",
+        usage="%(prog)s [--check | --rebuild]",
+    )
+    group = parser_stats.add_mutually_exclusive_group()
+    group.add_argument(
+        "--check",
+        help="Verify the stored counters against the tasks table.",
+        action="store_true",
+    )
+    group.add_argument(
+        "--rebuild",
+        help="Recompute the stored counters from the tasks table.",
+        action="store_true",
+    )
+
+
+SCHEDULE_HELP = {
+    "overdue": "List open tasks whose due date has passed.",
+    "upcoming": "List open tasks due today or within the next days.",
+    "agenda": "Show overdue and upcoming open tasks grouped by due date.",
+}
+
+TRANSFER_HELP = {
+    "import": "Import tasks from a JSON Lines or CSV file.",
+    "export": "Export tasks to a JSON Lines or CSV file.",
+}
+
+
+def build_transfer_parser(subparsers, command: str):
+    from task_cli.transfer import DEFAULT_CHUNK_SIZE, FORMATS
 
-def create_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
+    parser_transfer = subparsers.add_parser(
+        command,
+        help=TRANSFER_HELP[command],
+        usage="%(prog)s <file> [--format jsonl|csv] [--chunk-size N]",
+    )
+    parser_transfer.add_argument(
+        "file",
+        help="Path to the file.",
+        nargs=1,
+        type=str,
+    )
+    parser_transfer.add_argument(
+        "--format",
+        help="File format, detected from the file extension by default.",
+        choices=FORMATS,
+        default=None,
+    )
+    parser_transfer.add_argument(
+        "--chunk-size",
+        help="Number of tasks processed per batch.",
+        type=positive_int,
+        default=DEFAULT_CHUNK_SIZE,
+    )
+
+
+def build_batch_parser(subparsers):
+    from task_cli.batch import DEFAULT_CHUNK_SIZE
+
+    parser_batch = subparsers.add_parser(
+        "batch",
+        help="Run add, update, delete, due and mark-* commands read line by line from a file.",
+        usage="%(prog)s [file] [--chunk-size N]",
+    )
+    parser_batch.add_argument(
+        "file",
+        help="File with one command per line, or '-' for standard input (default).",
+        nargs="?",
+        default="-",
+    )
+    parser_batch.add_argument(
+        "--chunk-size",
+        help="Number of commands committed per transaction.",
+        type=positive_int,
+        default=DEFAULT_CHUNK_SIZE,
+    )
+
+
+def build_serve_parser(subparsers):
+    parser_serve = subparsers.add_parser(
+        "serve",
+        help="Run a server that executes commands sent by other task-cli invocations.",
+        usage="%(prog)s [--socket PATH]",
+    )
+    parser_serve.add_argument(
+        "--socket",
+        help="Path of the Unix domain socket to listen on.",
+        default=None,
+        type=str,
+    )
+
+
+PARSER_BUILDERS: dict[str, Callable] = {
+    "list": build_list_parser,
+    "add": build_add_parser,
+    "update": build_update_parser,
+    "delete": build_delete_parser,
+    "due": build_due_parser,
+    **{
+        f"mark-{status.value.lower()}": partial(build_mark_parser, status=status)
+        for status in Status
+    },
+    "search": build_search_parser,
+    "overdue": partial(build_schedule_parser, command="overdue"),
+    "upcoming": partial(build_schedule_parser, command="upcoming"),
+    "agenda": partial(build_schedule_parser, command="agenda"),
+    "stats": build_stats_parser,
+    "report": build_report_parser,
+    "changes": build_changes_parser,
+    "snapshot": build_snapshot_parser,
+    "import": partial(build_transfer_parser, command="import"),
+    "export": partial(build_transfer_parser, command="export"),
+    "batch": build_batch_parser,
+    "serve": build_serve_parser,
+}
+
+
+# Commands that only need the TaskStore interface, and so also run on the log
+# storage and on sharded databases.
+STORE_COMMANDS = (
+    "list",
+    "add",
+    "update",
+    "delete",
+    "due",
+    *(f"mark-{status.value}" for status in Status),
+    "overdue",
+    "upcoming",
+    "agenda",
+)
+
+
+class HelpFormatter(argparse.HelpFormatter):
+    # argparse creates formatters while adding arguments, not only for help,
+    # and looks up the default width through shutil, which is slow to import.
+    def __init__(self, prog: str, width: int | None = None, **kwargs):
+        if width is None:
+            try:
+                width = os.get_terminal_size().columns - 2
+            except OSError:
+                width = 78
+
+        super().__init__(prog, width=width, **kwargs)
+
+
+class ArgumentParser(argparse.ArgumentParser):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("formatter_class", HelpFormatter)
+        super().__init__(*args, **kwargs)
+
+
+def create_parser(command: str | None = None) -> argparse.ArgumentParser:
+    parser = ArgumentParser(
         prog="task-cli",
         description="A CLI tool for managing TODOs.",
     )
+    parser.add_argument(
+        "--durability",
+        help="Durability profile of database connections (default: %(default)s).",
+        choices=DURABILITY_PROFILES,
+        default=default_durability,
+    )
+    parser.add_argument(
+        "--profile",
+        help="Record timings of this invocation to FILE: a cProfile dump if it ends with .prof, "
+        "a Chrome trace otherwise. Also enabled by TASK_CLI_TRACE=FILE.",
+        metavar="FILE",
+        default=None,
+    )
+    parser.add_argument(
+        "--storage",
+        help="Storage backend: an SQLite database (tasks.db) or an append-only log (tasks.log) "
+        "(default: %(default)s). Also set by TASK_CLI_STORAGE.",
+        choices=("sqlite", "log"),
+        default=default_storage,
+    )
+    parser.add_argument(
+        "--shards",
+        help="Number of database files tasks are spread over (default: %(default)s). "
+        "Must stay the same for a database. Also set by TASK_CLI_SHARDS.",
+        metavar="N",
+        default=default_shards,
+        type=int,
+    )
+
+    # Only the invoked command's parser is built when it is known; help and
+    # errors for unknown commands still get the full list.
+    subparsers = parser.add_subparsers(dest="command", parser_class=ArgumentParser)
 
-    subparsers = parser.add_subparsers(dest="command")
-    build_list_parser(subparsers)
-    build_add_parser(subparsers)
-    build_update_parser(subparsers)
-    build_delete_parser(subparsers)
-    build_due_parser(subparsers)
-    build_mark_parser(subparsers)
+    for name, build in PARSER_BUILDERS.items():
+        if command not in PARSER_BUILDERS or name == command:
+            build(subparsers)
 
     return parser
 
 
 def process_command(args: argparse.Namespace):
-    repository = TaskRepository(default_database)
-
     if not args.command:
         print("No command provided.", file=sys.stderr)
         print("Use 'task-cli --help' for more information.", file=sys.stderr)
         return
 
+    if args.command == "serve":
+        process_serve_command(args.socket, args.durability)
+        return
+
+    if args.shards > 1 or args.storage != "sqlite":
+        process_store_command(args)
+        return
+
+    if args.command == "snapshot":
+        process_snapshot_command(default_database, args.remove, args.durability)
+        return
+
+    if args.command in ("list", "stats") and process_snapshot_read(args):
+        return
+
+    with TaskRepository(default_database, durability=args.durability) as repository:
+        with span("migrate"):
+            migrate(repository.pool.acquire())
+
+        with span("command", command=args.command):
+            dispatch_command(repository, args)
+
+
+def process_store_command(args: argparse.Namespace):
+    if args.command not in STORE_COMMANDS:
+        unsupported_command(args.command)
+
+    repository: TaskStore
+
+    if args.storage == "log":
+        from task_cli.log_store import LogStoreError, LogTaskStore, default_log
+
+        if args.shards > 1:
+            print("The log storage cannot be sharded.", file=sys.stderr)
+            sys.exit(1)
+
+        try:
+            repository = LogTaskStore(default_log, durability=args.durability)
+        except LogStoreError as error:
+            print(error, file=sys.stderr)
+            sys.exit(1)
+    else:
+        from task_cli.sharding import ShardedTaskRepository
+
+        sharded = ShardedTaskRepository(default_database, args.shards, durability=args.durability)
+
+        with span("migrate"):
+            sharded.init_db()
+
+        repository = sharded
+
+    with repository:
+        with span("command", command=args.command):
+            dispatch_command(repository, args)
+
+
+def process_snapshot_read(args: argparse.Namespace) -> bool:
+    file_name = snapshot_path(default_database)
+
+    if not os.path.exists(file_name) or args.command == "stats" and (args.check or args.rebuild):
+        return False
+
+    from task_cli.snapshot import TaskSnapshot, rebuild_in_background
+
+    with span("snapshot"):
+        snapshot = TaskSnapshot.open(file_name, default_database)
+
+    # A stale snapshot is rebuilt by another process while the database
+    # answers this command.
+    if snapshot is None:
+        rebuild_in_background(default_database, file_name, args.durability)
+        return False
+
+    with snapshot, span("command", command=args.command):
+        if args.command == "list":
+            process_list_command(
+                snapshot, args.status, args.limit, args.after, args.page_size, args.format
+            )
+        else:
+            process_stats_command(snapshot)
+
+    return True
+
+
+def unsupported_command(command: str):
+    print(f"Command '{command}' needs an SQLite database without shards.", file=sys.stderr)
+    sys.exit(1)
+
+
+def dispatch_command(repository: TaskStore, args: argparse.Namespace):
+    # STORE_COMMANDS run on any TaskStore; the others need a TaskRepository.
+    if args.command not in STORE_COMMANDS:
+        if isinstance(repository, TaskRepository):
+            dispatch_repository_command(repository, args)
+        else:
+            unsupported_command(args.command)
+
+        return
+
     match args.command:
         case "list":
-            process_list_command(repository, args.status)
+            process_list_command(
+                repository,
+                args.status,
+                args.limit,
+                args.after,
+                args.page_size,
+                args.format,
+            )
             return
         case "add":
             process_add_command(repository, args.description[0])
@@ -142,19 +657,57 @@ def process_command(args: argparse.Namespace):
             process_update_command(repository, args.id[0], args.description[0])
             return
         case "delete":
-            process_delete_command(repository, args.id[0])
+            process_delete_command(repository, build_selection(args), args.format)
             return
         case "due":
             process_due_command(repository, args.id[0], args.date[0])
-
-    if not args.command.startswith("mark-"):
-        return
+            return
+        case "overdue" | "upcoming" | "agenda":
+            process_schedule_command(
+                repository,
+                args.command,
+                getattr(args, "days", 0),
+                args.limit,
+                getattr(args, "format", "table"),
+            )
+            return
 
     _, _, new_status = args.command.rpartition("mark-")
-    process_set_status(repository, args.id[0], new_status)
+    process_set_status(repository, build_selection(args), new_status, args.format)
 
 
-def process_list_command(repository: TaskRepository, status: str):
+def dispatch_repository_command(repository: TaskRepository, args: argparse.Namespace):
+    match args.command:
+        case "search":
+            process_search_command(
+                repository, " ".join(args.query), args.limit, args.page, args.format
+            )
+        case "stats" if args.check or args.rebuild:
+            process_counts_command(repository, args.rebuild)
+        case "stats":
+            process_stats_command(repository)
+        case "report":
+            process_report_command(repository, args.days, args.format)
+        case "changes":
+            process_changes_command(repository, args.since, args.limit, args.page_size)
+        case "snapshot":
+            process_snapshot_command(repository.db, args.remove, args.durability)
+        case "batch":
+            process_batch_command(repository, args.file, args.chunk_size)
+        case "import" | "export":
+            process_transfer_command(
+                repository, args.command, args.file[0], args.format, args.chunk_size
+            )
+
+
+def process_list_command(
+    repository: TaskReader,
+    status: str | None,
+    limit: int | None = None,
+    after: int = 0,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    format: str = "table",
+):
     filter_status = []
 
     for valid_status in Status:
@@ -162,20 +715,20 @@ def process_list_command(repository: TaskRepository, status: str):
             filter_status = [valid_status]
             break
 
-    tasks = (
-        repository.find_by_status(filter_status)
-        if status
-        else repository.find_by_status()
+    tasks = repository.iter_by_status(
+        filter_status if status else None,
+        after=after,
+        limit=limit,
+        page_size=page_size,
     )
 
-    for task in tasks:
-        print(task)
+    count = render_tasks(tasks, format, sys.stdout, page_size)
 
-    if len(tasks) == 0:
+    if count == 0 and format in ("table", "boxed"):
         print("No tasks to show.")
 
 
-def process_add_command(repository: TaskRepository, description: str):
+def process_add_command(repository: TaskStore, description: str):
     task = CreateTask(
         description=description,
         status=Status.TODO,
@@ -191,68 +744,280 @@ def process_add_command(repository: TaskRepository, description: str):
     print(created_task)
 
 
-def process_update_command(repository: TaskRepository, id: int, description: str):
-    task = repository.find_by_id(id)
+def process_update_command(repository: TaskStore, id: int, description: str):
+    task = repository.update_by_id(id, UpdateTask(description=description))
 
     if task is None:
         print(f"Task with id {id} was not found.", file=sys.stderr)
         return
 
-    if repository.update(task, UpdateTask(description=description)):
-        print(repository.find_by_id(id))
+    print(task)
+
+
+def build_selection(args: argparse.Namespace) -> TaskSelection:
+    return TaskSelection(
+        ids=[start for start, end in args.ids if start == end],
+        ranges=[(start, end) for start, end in args.ids if start != end],
+        status=[STATUS_BY_VALUE[value] for value in args.status] if args.status else None,
+        due_before=args.due_before,
+    )
+
+
+def single_id(selection: TaskSelection) -> int | None:
+    if (
+        len(selection.ids) == 1
+        and not selection.ranges
+        and selection.status is None
+        and selection.due_before is None
+    ):
+        return selection.ids[0]
+
+    return None
+
+
+def process_delete_command(
+    repository: TaskStore, selection: TaskSelection, format: str | None = None
+):
+    if selection == TaskSelection():
+        print("Select tasks by id, range, --status or --due-before.", file=sys.stderr)
         return
 
-    print("Could not update task.", file=sys.stderr)
+    id = single_id(selection)
 
+    if id is not None and format is None:
+        if repository.delete_by_id(id):
+            print("Task was deleted successfully.")
+            return
 
-def process_delete_command(repository: TaskRepository, id: int):
-    if repository.delete_by_id(id):
-        print("Task was deleted successfully.")
+        print("Could not delete task.", file=sys.stderr)
         return
 
-    print("Could not delete task.", file=sys.stderr)
+    if format is not None:
+        render_tasks(repository.iter_delete_matching(selection), format, sys.stdout)
+        return
 
+    print(f"{repository.delete_matching(selection)} task(s) deleted.")
 
-def process_due_command(repository: TaskRepository, id: int, new_date: str):
-    task = repository.find_by_id(id)
+
+def process_due_command(repository: TaskStore, id: int, new_date: str):
+    try:
+        due_date = parse_due_date(new_date)
+    except ValueError:
+        print("Invalid date format. Use YYYY-MM-DD.", file=sys.stderr)
+        return
+
+    task = repository.update_by_id(id, UpdateTask(due_date=due_date))
 
     if task is None:
         print(f"Task with id {id} was not found.", file=sys.stderr)
         return
 
-    if new_date == "-":
-        repository.update(task, UpdateTask(due_date=None))
-        print(repository.find_by_id(id))
+    print(task)
+
+
+def process_set_status(
+    repository: TaskStore,
+    selection: TaskSelection,
+    status: str,
+    format: str | None = None,
+):
+    if status not in STATUS_BY_VALUE:
+        print("Could not set new task status.", file=sys.stderr)
         return
 
-    try:
-        datetime.strptime(new_date, "%Y-%m-%d")
-    except ValueError:
-        print("Invalid date format. Use YYYY-MM-DD.", file=sys.stderr)
+    if selection == TaskSelection():
+        print("Select tasks by id, range, --status or --due-before.", file=sys.stderr)
         return
 
-    if repository.update(
-        task,
-        UpdateTask(due_date=datetime.strptime(new_date, "%Y-%m-%d").date()),
-    ):
-        print(repository.find_by_id(id))
+    data = UpdateTask(status=STATUS_BY_VALUE[status])
+    id = single_id(selection)
+
+    if id is not None and format is None:
+        task = repository.update_by_id(id, data)
+
+        if not task:
+            print("Could not find task to update.", file=sys.stderr)
+            return
+
+        print(task)
         return
 
-    print("Could not update task.", file=sys.stderr)
+    if format is not None:
+        render_tasks(repository.iter_update_matching(selection, data), format, sys.stdout)
+        return
 
+    print(f"{repository.update_matching(selection, data)} task(s) updated.")
+
+
+def process_search_command(
+    repository: TaskRepository,
+    query: str,
+    limit: int,
+    page: int,
+    format: str,
+):
+    if limit < 1 or page < 1:
+        print("Limit and page must be positive.", file=sys.stderr)
+        return
+
+    tasks = repository.search(query, limit=limit, offset=(page - 1) * limit)
+
+    if render_tasks(tasks, format, sys.stdout) == 0 and format in ("table", "boxed"):
+        print("No matching tasks.")
 
-def process_set_status(repository: TaskRepository, id: int, status: str):
-    for valid_status in Status:
-        if valid_status.value == status:
-            task = repository.find_by_id(id)
 
-            if not task:
-                print("Could not find task to update.", file=sys.stderr)
-                return
+def process_schedule_command(
+    repository: TaskReader,
+    command: str,
+    days: int,
+    limit: int | None,
+    format: str,
+):
+    if days < 0:
+        print("Days must not be negative.", file=sys.stderr)
+        return
+
+    today = date.today()
+
+    match command:
+        case "overdue":
+            tasks = repository.overdue(today, limit)
+        case "upcoming":
+            tasks = repository.upcoming(days, today, limit)
+        case _:
+            tasks = repository.iter_by_due_date(
+                end=today + timedelta(days=days + 1), status=list(OPEN_STATUSES), limit=limit
+            )
+
+            if render_agenda(tasks, today, sys.stdout) == 0:
+                print("Nothing on the agenda.")
 
-            repository.update(task, UpdateTask(status=valid_status))
-            task = repository.find_by_id(task.id)
-            print(task)
             return
 
-    print("Could not set new task status.", file=sys.stderr)
+    if render_tasks(tasks, format, sys.stdout) == 0 and format in ("table", "boxed"):
+        print("No tasks to show.")
+
+
+def process_counts_command(repository: TaskRepository, rebuild: bool):
+    mismatches = repository.rebuild_counts() if rebuild else repository.check_counts()
+
+    for status, (stored, actual) in mismatches.items():
+        print(f"{status.value}: stored {stored}, actual {actual}", file=sys.stderr)
+
+    if rebuild:
+        print("Counters were rebuilt.")
+    elif mismatches:
+        sys.exit(1)
+    else:
+        print("Counters are consistent.")
+
+
+def process_stats_command(repository: TaskReader):
+    counts = repository.counts()
+
+    for status, count in counts.by_status.items():
+        print(f"{status.value}: {count}")
+
+    print(f"total: {counts.total}")
+    print(f"overdue: {counts.overdue}")
+
+    if counts.oldest_open is not None:
+        task = counts.oldest_open
+        created_at = task.created_at.isoformat(sep=" ", timespec="seconds")
+        print(f"oldest open: #{task.id} {task.description} (created {created_at})")
+
+
+def process_report_command(repository: TaskRepository, days: int, format: str):
+    from task_cli.analytics import build_report, format_report, load_snapshot
+    from task_cli.utils import serialize
+
+    if days < 1:
+        print("Days must be positive.", file=sys.stderr)
+        return
+
+    report = build_report(load_snapshot(repository), days)
+    print(serialize(report) if format == "json" else format_report(report))
+
+
+def process_changes_command(
+    repository: TaskRepository,
+    since: int,
+    limit: int | None,
+    page_size: int,
+):
+    import json
+
+    for change in repository.iter_changes(since, limit, page_size):
+        record = {
+            "seq": change.seq,
+            "op": change.op.value,
+            "task_id": change.task_id,
+            "fields": change.fields,
+            "changed_at": change.changed_at.isoformat(sep=" "),
+        }
+        sys.stdout.write(json.dumps(record) + "\n")
+
+
+def process_snapshot_command(db: str, remove: bool, durability: str):
+    from os import path, remove as remove_file
+    from task_cli.snapshot import build_snapshot
+
+    file_name = snapshot_path(db)
+
+    if remove:
+        for name in (file_name, file_name + ".lock"):
+            if path.exists(name):
+                remove_file(name)
+
+        print("Snapshot removed.")
+        return
+
+    count = build_snapshot(db, file_name, durability)
+    print(f"Snapshot of {count} task(s) written to '{file_name}'.")
+
+
+def process_transfer_command(
+    repository: TaskRepository,
+    command: str,
+    file_name: str,
+    format: str | None,
+    chunk_size: int,
+):
+    from task_cli.transfer import export_tasks, import_tasks
+
+    transfer = import_tasks if command == "import" else export_tasks
+
+    try:
+        count = transfer(repository, file_name, format, chunk_size)
+    except (OSError, ValueError, KeyError) as error:
+        print(f"Could not {command} tasks: {error}", file=sys.stderr)
+        return
+
+    print(f"{count} task(s) {command}ed successfully.")
+
+
+def process_batch_command(repository: TaskRepository, file_name: str, chunk_size: int):
+    from task_cli.batch import run_batch
+
+    try:
+        if file_name == "-":
+            _, failed = run_batch(repository, sys.stdin, sys.stdout, chunk_size)
+        else:
+            with open(file_name, encoding="utf-8") as file:
+                _, failed = run_batch(repository, file, sys.stdout, chunk_size)
+    except OSError as error:
+        print(f"Could not read commands: {error}", file=sys.stderr)
+        sys.exit(1)
+
+    if failed:
+        sys.exit(1)
+
+
+def process_serve_command(path: str | None, durability: str):
+    from task_cli.client import socket_path
+    from task_cli.server import serve
+
+    try:
+        serve(path or socket_path(), default_database, durability)
+    except OSError as error:
+        print(f"Could not start server: {error}", file=sys.stderr)
@@ -0,0 +1,193 @@
+import sqlite3
+import threading
+import time
+from task_cli import instrumentation
+from task_cli.database import apply_pragmas
+
+
+class TracedCursor(sqlite3.Cursor):
+    def __trace(self, method, sql: str, *args):
+        start = time.perf_counter()
+
+        try:
+            return method(sql, *args)
+        finally:
+            self._event = instrumentation.record(
+                {
+                    "name": "sql",
+                    "cat": "sql",
+                    "args": {"query": " ".join(sql.split()), "rows": max(self.rowcount, 0)},
+                },
+                start,
+                time.perf_counter(),
+            )
+
+    def __fetched(self, start: float, rows: int):
+        event = getattr(self, "_event", None)
+
+        if event is not None:
+            event["dur"] += (time.perf_counter() - start) * 1e6
+            event["args"]["rows"] += rows
+
+    def execute(self, sql, parameters=()):
+        return self.__trace(super().execute, sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self.__trace(super().executemany, sql, parameters)
+
+    def executescript(self, script):
+        return self.__trace(super().executescript, script)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self.__fetched(start, row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self.__fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self.__fetched(start, len(rows))
+        return rows
+
+
+class TracedConnection(sqlite3.Connection):
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self.cursor().executemany(sql, parameters)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+    def commit(self):
+        with instrumentation.span("commit", "sql"):
+            super().commit()
+
+
+class ConnectionPool:
+    # Every thread gets its own connection, kept until the thread releases it
+    # or ends; there is no limit on the number of threads. At most `size`
+    # released connections are kept open for reuse.
+    def __init__(
+        self,
+        database: str,
+        size: int = 4,
+        cached_statements: int = 128,
+        timeout: float = 5.0,
+        pragmas: dict | None = None,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+
+        self.database = database
+        self.size = size
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self.pragmas = pragmas or {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._owners: dict[sqlite3.Connection, threading.Thread] = {}
+        self._idle: list[sqlite3.Connection] = []
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        factory = sqlite3.Connection
+
+        if instrumentation.enabled:
+            instrumentation.count("connections")
+            factory = TracedConnection
+
+        connection = sqlite3.connect(
+            self.database,
+            timeout=self.timeout,
+            factory=factory,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,
+        )
+
+        apply_pragmas(connection, self.pragmas)
+        return connection
+
+    def _reclaim(self) -> sqlite3.Connection | None:
+        for connection, owner in self._owners.items():
+            if not owner.is_alive():
+                if connection.in_transaction:
+                    connection.rollback()
+
+                return connection
+
+        return None
+
+    def acquire(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+
+        if connection is not None:
+            return connection
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed.")
+
+            if self._idle:
+                connection = self._idle.pop()
+            elif len(self._owners) < self.size:
+                connection = self._connect()
+            else:
+                connection = self._reclaim() or self._connect()
+
+            self._owners[connection] = threading.current_thread()
+
+        self._local.connection = connection
+        return connection
+
+    def release(self):
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            return
+
+        self._local.connection = None
+
+        if connection.in_transaction:
+            connection.rollback()
+
+        with self._lock:
+            self._owners.pop(connection, None)
+
+            if self._closed or len(self._idle) >= self.size:
+                connection.close()
+            else:
+                self._idle.append(connection)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            connections = [*self._owners, *self._idle]
+            self._owners.clear()
+            self._idle.clear()
+
+        self._local = threading.local()
+
+        for connection in connections:
+            connection.close()
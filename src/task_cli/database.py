@@ -1,19 +1,221 @@
+import os
 import sqlite3
+from contextlib import closing
 
 default_database = "tasks.db"
+default_durability = os.environ.get("TASK_CLI_DURABILITY", "strict")
 
+DURABILITY_PROFILES: dict[str, dict] = {
+    "strict": {
+        "synchronous": "FULL",
+    },
+    "normal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16384,
+        "temp_store": "MEMORY",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
 
-def init_db(database: str = default_database):
-    with sqlite3.connect(database) as connection:
-        connection.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                description TEXT NOT NULL,
-                status TEXT NOT NULL CHECK (status IN ('todo', 'in-progress', 'done')),
-                due_date DATE NULL DEFAULT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT NULL
-            )
-            """
-        )
+MIGRATIONS = (
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        description TEXT NOT NULL,
+        status TEXT NOT NULL CHECK (status IN ('todo', 'in-progress', 'done')),
+        due_date DATE NULL DEFAULT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT NULL
+    );
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+    CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+    CREATE INDEX IF NOT EXISTS idx_tasks_status_due_date ON tasks (status, due_date);
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5 (
+        description,
+        content = 'tasks',
+        content_rowid = 'id'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts (rowid, description) VALUES (new.id, new.description);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF description ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+        INSERT INTO tasks_fts (rowid, description) VALUES (new.id, new.description);
+    END;
+
+    INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild');
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS task_counts (
+        status TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_tasks_status_created_at ON tasks (status, created_at);
+
+    CREATE TRIGGER IF NOT EXISTS task_counts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_counts (status, count) VALUES (new.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS task_counts_delete AFTER DELETE ON tasks BEGIN
+        UPDATE task_counts SET count = count - 1 WHERE status = old.status;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS task_counts_update AFTER UPDATE OF status ON tasks
+    WHEN old.status IS NOT new.status BEGIN
+        UPDATE task_counts SET count = count - 1 WHERE status = old.status;
+        INSERT INTO task_counts (status, count) VALUES (new.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END;
+
+    DELETE FROM task_counts;
+    INSERT INTO task_counts (status, count) SELECT status, COUNT(*) FROM tasks GROUP BY status;
+    """,
+    """
+    DROP INDEX IF EXISTS idx_tasks_due_date;
+    CREATE INDEX IF NOT EXISTS idx_tasks_due_date_status ON tasks (due_date, status);
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS task_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+        task_id INTEGER NOT NULL,
+        fields TEXT NULL,
+        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TRIGGER IF NOT EXISTS task_changes_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_changes (op, task_id, fields)
+        VALUES ('insert', new.id, json_object(
+            'description', new.description,
+            'status', new.status,
+            'due_date', new.due_date,
+            'created_at', new.created_at,
+            'updated_at', new.updated_at
+        ));
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS task_changes_update AFTER UPDATE ON tasks
+    WHEN old.description IS NOT new.description
+        OR old.status IS NOT new.status
+        OR old.due_date IS NOT new.due_date
+        OR old.updated_at IS NOT new.updated_at
+    BEGIN
+        INSERT INTO task_changes (op, task_id, fields)
+        SELECT 'update', new.id, json_group_object(name, value) FROM (
+            SELECT 'description' AS name, new.description AS value
+            WHERE old.description IS NOT new.description
+            UNION ALL SELECT 'status', new.status WHERE old.status IS NOT new.status
+            UNION ALL SELECT 'due_date', new.due_date WHERE old.due_date IS NOT new.due_date
+            UNION ALL SELECT 'updated_at', new.updated_at WHERE old.updated_at IS NOT new.updated_at
+        );
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS task_changes_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO task_changes (op, task_id) VALUES ('delete', old.id);
+    END;
+
+    INSERT INTO task_changes (op, task_id, fields)
+    SELECT 'insert', id, json_object(
+        'description', description,
+        'status', status,
+        'due_date', due_date,
+        'created_at', created_at,
+        'updated_at', updated_at
+    )
+    FROM tasks
+    WHERE NOT EXISTS (SELECT 1 FROM task_changes)
+    ORDER BY id;
+    """,
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def durability_pragmas(profile: str) -> dict:
+    if profile not in DURABILITY_PROFILES:
+        raise ValueError(f"Unknown durability profile '{profile}'.")
+
+    return DURABILITY_PROFILES[profile]
+
+
+def apply_pragmas(connection: sqlite3.Connection, pragmas: dict):
+    for name, value in pragmas.items():
+        connection.execute(f"PRAGMA {name} = {value}")
+
+
+def schema_version(connection: sqlite3.Connection) -> int:
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def split_statements(script: str):
+    statement = ""
+
+    for line in script.splitlines(keepends=True):
+        statement += line
+
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+
+    if statement.strip():
+        yield statement
+
+
+def migrate(connection: sqlite3.Connection, target: int = SCHEMA_VERSION) -> int:
+    # Each step takes the write lock before reading the version, so processes
+    # migrating the same database at once apply every step exactly once.
+    while schema_version(connection) < target:
+        if connection.in_transaction:
+            connection.commit()
+
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            version = schema_version(connection) + 1
+
+            if version <= target:
+                for statement in split_statements(MIGRATIONS[version - 1]):
+                    connection.execute(statement)
+
+                connection.execute(f"PRAGMA user_version = {version}")
+
+            connection.commit()
+        except BaseException:
+            if connection.in_transaction:
+                connection.rollback()
+
+            raise
+
+    return schema_version(connection)
+
+
+def init_db(database: str = default_database) -> int:
+    with closing(sqlite3.connect(database)) as connection:
+        return migrate(connection)
+
+
+# Read-only copy of a database written by task_cli.snapshot; defined here so
+# that checking for one does not import that module.
+def snapshot_path(db: str) -> str:
+    return os.path.splitext(db)[0] + ".snapshot"
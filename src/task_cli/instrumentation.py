@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+
+# Call sites only pay for a flag check or a shared no-op context manager
+# unless instrumentation was enabled for this process.
+enabled = False
+events: list[dict] = []
+counters: dict[str, int] = {}
+target: str | None = None
+profiler = None
+origin = time.perf_counter()
+
+
+class Span:
+    __slots__ = ("event", "start")
+
+    def __init__(self, name: str, category: str, args: dict):
+        self.event = {"name": name, "cat": category, "args": args}
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        record(self.event, self.start, time.perf_counter())
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+def span(name: str, category: str = "task-cli", **args) -> Span | NullSpan:
+    if not enabled:
+        return NULL_SPAN
+
+    return Span(name, category, args)
+
+
+def record(event: dict, start: float, end: float) -> dict:
+    event["ph"] = "X"
+    event["ts"] = (start - origin) * 1e6
+    event["dur"] = (end - start) * 1e6
+    events.append(event)
+    return event
+
+
+def count(name: str, value: int = 1):
+    counters[name] = counters.get(name, 0) + value
+    events.append(
+        {
+            "name": name,
+            "ph": "C",
+            "ts": (time.perf_counter() - origin) * 1e6,
+            "args": {name: counters[name]},
+        }
+    )
+
+
+def trace_target(argv: list[str]) -> str | None:
+    for index, argument in enumerate(argv):
+        if argument == "--profile" and index + 1 < len(argv):
+            return argv[index + 1]
+
+        if argument.startswith("--profile="):
+            return argument.partition("=")[2]
+
+    return os.environ.get("TASK_CLI_TRACE") or None
+
+
+def enable(file_name: str):
+    global enabled, target, profiler
+
+    enabled = True
+    target = file_name
+
+    if file_name.endswith(".prof"):
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+
+def summarize() -> list[tuple[str, int, float]]:
+    phases: dict[str, tuple[int, float]] = {}
+
+    for event in events:
+        if event["ph"] == "X":
+            calls, total = phases.get(event["name"], (0, 0.0))
+            phases[event["name"]] = (calls + 1, total + event["dur"] / 1000)
+
+    return [(name, calls, total) for name, (calls, total) in phases.items()]
+
+
+def write_trace(file_name: str):
+    import json
+
+    pid = os.getpid()
+    trace = [{**event, "pid": pid, "tid": 0} for event in events]
+
+    with open(file_name, "w", encoding="utf-8") as file:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
+
+
+def finish(file=None):
+    global enabled, target, profiler
+
+    if not enabled or target is None:
+        return
+
+    file = file or sys.stderr
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(target)
+    else:
+        write_trace(target)
+
+    print(f"{'phase':<12} {'calls':>8} {'total ms':>10}", file=file)
+
+    for name, calls, total in summarize():
+        print(f"{name:<12} {calls:>8} {total:>10.2f}", file=file)
+
+    for name, value in counters.items():
+        print(f"{name}: {value}", file=file)
+
+    print(f"Profile written to {target}.", file=file)
+
+    enabled = False
+    target = None
+    profiler = None
+    events.clear()
+    counters.clear()
@@ -0,0 +1,482 @@
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import date
+from task_cli.database import DURABILITY_PROFILES, default_durability
+from task_cli.model import (
+    OPEN_STATUSES,
+    STATUS_CODES,
+    STATUSES,
+    CreateTask,
+    Status,
+    Task,
+    TaskCounts,
+    UpdateTask,
+)
+from task_cli.repository import GroupCommit
+from task_cli.store import DEFAULT_PAGE_SIZE, TaskStore
+
+default_log = "tasks.log"
+
+MAGIC = b"TASKLOG1"
+# crc32 of the rest of the record, payload length, op and task id.
+RECORD = struct.Struct("<IIBq")
+# Status code and byte lengths of the description, due date, created_at and
+# updated_at, which follow as UTF-8 text in the format SQLite stores them in.
+TASK = struct.Struct("<BHBBB")
+
+PUT = 1
+DELETE = 2
+# Carries the next id to assign, so that compaction does not lose it.
+SEQUENCE = 3
+# Starts a group of records, counted in the id field, that only takes effect
+# if all of them were written.
+BEGIN = 4
+
+COMPACT_MIN_BYTES = 1 << 20
+
+
+class LogStoreError(Exception):
+    pass
+
+
+def encode_record(op: int, id: int, payload: bytes = b"") -> bytes:
+    body = RECORD.pack(0, len(payload), op, id)[4:] + payload
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+
+def encode_task(task: Task) -> bytes:
+    fields = [
+        task.description.encode(),
+        task.due_date.isoformat().encode() if task.due_date else b"",
+        task.created_at.isoformat(sep=" ").encode(),
+        task.updated_at.isoformat(sep=" ").encode() if task.updated_at else b"",
+    ]
+
+    return TASK.pack(STATUS_CODES[task.status], *map(len, fields)) + b"".join(fields)
+
+
+def read_record(buffer, offset: int) -> tuple[int, int, int] | None:
+    # Returns the op, id and size of the record, or None if it is torn or
+    # corrupt, which ends the valid part of the log.
+    if offset + RECORD.size > len(buffer):
+        return None
+
+    crc, length, op, id = RECORD.unpack_from(buffer, offset)
+    end = offset + RECORD.size + length
+
+    if end > len(buffer) or zlib.crc32(buffer[offset + 4 : end]) != crc:
+        return None
+
+    return op, id, RECORD.size + length
+
+
+def read_index_entry(buffer, offset: int) -> tuple[int, str]:
+    status, description_length, due_length, _, _ = TASK.unpack_from(buffer, offset + RECORD.size)
+    start = offset + RECORD.size + TASK.size + description_length
+    return status, str(buffer[start : start + due_length], "utf-8")
+
+
+def decode_task(buffer, offset: int) -> Task:
+    id = RECORD.unpack_from(buffer, offset)[3]
+    status, *lengths = TASK.unpack_from(buffer, offset + RECORD.size)
+    start = offset + RECORD.size + TASK.size
+    values = []
+
+    for length in lengths:
+        values.append(str(buffer[start : start + length], "utf-8"))
+        start += length
+
+    return Task.from_row((id, values[0], STATUSES[status].value, *values[1:]))
+
+
+class LogTaskStore(TaskStore):
+    # Tasks are kept in an append-only file of checksummed records: adds and
+    # updates append the task's full state and deletes a tombstone. An
+    # in-memory index maps each live id to its latest record, which is read
+    # back through a memory map. Opening the log replays it to rebuild the
+    # index and cuts off a torn or corrupt tail left by a crash. Once
+    # superseded records outweigh the live ones, the live records are copied
+    # to a new file that replaces the log. Only one process may have a log
+    # open at a time.
+    def __init__(
+        self,
+        path: str = default_log,
+        durability: str = default_durability,
+        group_commit: GroupCommit | None = None,
+    ):
+        if durability not in DURABILITY_PROFILES:
+            raise ValueError(f"Unknown durability profile '{durability}'.")
+
+        self.path = path
+        self.sync = durability == "strict"
+        self.group_commit = group_commit
+        self._lock = threading.RLock()
+        self._pending = bytearray()
+        self._pending_writes = 0
+        self._timer: threading.Timer | None = None
+        self._fd = self.__lock(os.open(path, os.O_RDWR | os.O_CREAT, 0o644))
+
+        if os.fstat(self._fd).st_size == 0:
+            os.write(self._fd, MAGIC)
+            os.fsync(self._fd)
+
+        self.recovered_bytes = self.__load()
+
+    def __lock(self, fd: int) -> int:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            raise LogStoreError(f"Log '{self.path}' is open in another process.") from None
+
+        return fd
+
+    def __load(self) -> int:
+        self._map = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+
+        if self._map[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise LogStoreError(f"'{self.path}' is not a task log.")
+
+        # id -> (offset, size, status code, due date), in id order.
+        self._index: dict[int, tuple[int, int, int, str]] = {}
+        self._next_id = 1
+        self._live = 0
+        self._garbage = 0
+        offset = end = len(MAGIC)
+        group = []
+        remaining = 0
+
+        while (record := read_record(self._map, offset)) is not None:
+            op, id, size = record
+
+            if op == BEGIN:
+                if remaining:
+                    break
+
+                remaining = id + 1
+            else:
+                group.append((offset, op, id, size))
+
+            offset += size
+            remaining = max(remaining - 1, 0)
+
+            if not remaining:
+                for offset_in_group, op, id, size in group:
+                    self.__apply(self._map, offset_in_group, offset_in_group, op, id, size)
+
+                group.clear()
+                end = offset
+
+        recovered = len(self._map) - end
+
+        if recovered:
+            os.ftruncate(self._fd, end)
+            os.fsync(self._fd)
+            self._map.close()
+            self._map = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+
+        self._size = end
+        return recovered
+
+    def __apply(self, buffer, position: int, offset: int, op: int, id: int, size: int):
+        # position is where the record is found in buffer, offset where it is
+        # (or will be) in the log.
+        previous = self._index.pop(id, None) if op == DELETE else self._index.get(id)
+
+        if previous is not None:
+            self._live -= previous[1]
+            self._garbage += previous[1]
+
+        if op == PUT:
+            self._index[id] = (offset, size, *read_index_entry(buffer, position))
+            self._live += size
+        else:
+            self._garbage += size
+
+        self._next_id = max(self._next_id, id if op == SEQUENCE else id + 1)
+
+    def __write(self, records: list[tuple[int, int, bytes]]):
+        if len(records) > 1:
+            self._pending += encode_record(BEGIN, len(records))
+
+        for op, id, payload in records:
+            position = len(self._pending)
+            self._pending += encode_record(op, id, payload)
+            size = len(self._pending) - position
+            self.__apply(self._pending, position, self._size + position, op, id, size)
+
+        self._pending_writes += 1
+
+        if self.group_commit is None or self._pending_writes >= self.group_commit.max_writes:
+            self.__flush()
+        elif self._pending_writes == 1:
+            # Writes the group out once max_delay has passed, even when no
+            # further write arrives.
+            self._timer = threading.Timer(self.group_commit.max_delay, self.__expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+        if self._garbage >= COMPACT_MIN_BYTES and self._garbage > self._live:
+            self.compact()
+
+    def __expire(self):
+        with self._lock:
+            if self._timer is threading.current_thread() and self._fd >= 0:
+                self.__flush()
+
+    def __flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        os.pwrite(self._fd, self._pending, self._size)
+
+        if self.sync:
+            os.fdatasync(self._fd)
+
+        self._size += len(self._pending)
+        self._pending.clear()
+        self._pending_writes = 0
+
+    def __view(self):
+        # Written records are read through the map, which is replaced by a
+        # larger one when the log has grown past it; pending ones are written
+        # out first. Replaced maps are not closed: iterators still reading one
+        # keep it alive, and it is unmapped once the last of them is done.
+        self.__flush()
+
+        if len(self._map) < self._size:
+            self._map = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+
+        return self._map
+
+    def __read(self, id: int) -> Task | None:
+        entry = self._index.get(id)
+
+        if entry is None:
+            return None
+
+        offset, size, _, _ = entry
+
+        if offset >= self._size:
+            return decode_task(self._pending, offset - self._size)
+
+        # Remapping after every append costs more than reading the few
+        # records written since the last one directly.
+        if offset + size > len(self._map):
+            return decode_task(os.pread(self._fd, size, offset), 0)
+
+        return decode_task(self._map, offset)
+
+    def close(self):
+        with self._lock:
+            if self._fd < 0:
+                return
+
+            self.__flush()
+            os.fsync(self._fd)
+            self._map.close()
+            os.close(self._fd)
+            self._fd = -1
+
+    def flush(self):
+        with self._lock:
+            self.__flush()
+
+    def compact(self):
+        with self._lock:
+            view = self.__view()
+            temporary = self.path + ".compact"
+
+            with open(temporary, "wb") as file:
+                file.write(MAGIC)
+                file.write(encode_record(SEQUENCE, self._next_id))
+
+                for offset, size, _, _ in self._index.values():
+                    file.write(view[offset : offset + size])
+
+                file.flush()
+                os.fsync(file.fileno())
+
+            # The new file is locked before it replaces the log, so no other
+            # process can open it in between.
+            fd = self.__lock(os.open(temporary, os.O_RDWR))
+            os.replace(temporary, self.path)
+            os.close(self._fd)
+            self._fd = fd
+            self.__load()
+
+    def find_by_id(self, id: int) -> Task | None:
+        with self._lock:
+            return self.__read(id)
+
+    def iter_by_status(
+        self,
+        status: list[Status] | None = None,
+        after: int = 0,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]:
+        codes = None if status is None else {STATUS_CODES[s] for s in status}
+
+        with self._lock:
+            view = self.__view()
+            offsets = [
+                offset
+                for id, (offset, _, code, _) in self._index.items()
+                if id > after and (codes is None or code in codes)
+            ]
+
+        for offset in offsets[:limit]:
+            yield decode_task(view, offset)
+
+    def iter_by_due_date(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        status: list[Status] | None = None,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]:
+        codes = None if status is None else {STATUS_CODES[s] for s in status}
+        low = start.isoformat() if start else ""
+        high = end.isoformat() if end else "9999-12-32"
+
+        with self._lock:
+            view = self.__view()
+            matches = sorted(
+                (due_date, STATUSES[code].value, id, offset)
+                for id, (offset, _, code, due_date) in self._index.items()
+                if due_date and low <= due_date < high and (codes is None or code in codes)
+            )
+
+        for *_, offset in matches[:limit]:
+            yield decode_task(view, offset)
+
+    def add(self, task: CreateTask) -> Task | None:
+        with self._lock:
+            created = self.__create(task, self._next_id)
+            self.__write([(PUT, created.id, encode_task(created))])
+            return created
+
+    def __create(self, task: CreateTask, id: int) -> Task:
+        # created_at is the UTC time in seconds, like SQLite's CURRENT_TIMESTAMP.
+        created_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+        return Task.from_row(
+            (
+                id,
+                task.description,
+                task.status.value,
+                task.due_date.isoformat() if task.due_date else None,
+                created_at,
+                None,
+            )
+        )
+
+    def add_many(self, tasks: Iterable[CreateTask]) -> int:
+        with self._lock:
+            records: list[tuple[int, int, bytes]] = []
+
+            for task in tasks:
+                created = self.__create(task, self._next_id + len(records))
+                records.append((PUT, created.id, encode_task(created)))
+
+            if records:
+                self.__write(records)
+
+            return len(records)
+
+    def __update(self, task: Task, data: UpdateTask) -> Task:
+        for field, value in data.items():
+            if data.is_set(field):
+                setattr(task, field, value)
+
+        return task
+
+    def update_by_id(
+        self,
+        id: int,
+        data: UpdateTask,
+        if_status: list[Status] | None = None,
+    ) -> Task | None:
+        with self._lock:
+            task = self.__read(id)
+
+            if task is None or (if_status is not None and task.status not in if_status):
+                return None
+
+            self.__write([(PUT, id, encode_task(self.__update(task, data)))])
+            return task
+
+    def update_many(self, updates: Iterable[tuple[int, UpdateTask]]) -> int:
+        with self._lock:
+            tasks: dict[int, Task] = {}
+            count = 0
+
+            # Later updates of the same id start from the result of earlier ones.
+            for id, data in updates:
+                task = tasks.get(id) or self.__read(id)
+
+                if task is not None:
+                    tasks[id] = self.__update(task, data)
+                    count += 1
+
+            if tasks:
+                self.__write([(PUT, id, encode_task(task)) for id, task in tasks.items()])
+
+            return count
+
+    def delete_by_id(self, id: int) -> bool:
+        with self._lock:
+            if id not in self._index:
+                return False
+
+            self.__write([(DELETE, id, b"")])
+            return True
+
+    def delete_many(self, ids: Iterable[int]) -> int:
+        with self._lock:
+            records = [(DELETE, id, b"") for id in dict.fromkeys(ids) if id in self._index]
+
+            if records:
+                self.__write(records)
+
+            return len(records)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def counts(self, today: date | None = None) -> TaskCounts:
+        day = (today or date.today()).isoformat()
+        open_codes = {STATUS_CODES[status] for status in OPEN_STATUSES}
+        by_status = [0] * len(STATUSES)
+        overdue = 0
+        oldest = None
+
+        with self._lock:
+            for id, (_, _, code, due_date) in self._index.items():
+                by_status[code] += 1
+
+                if code in open_codes:
+                    overdue += bool(due_date) and due_date < day
+                    oldest = oldest or id
+
+            # created_at is set when a task is added, so the open task with
+            # the lowest id is the oldest one.
+            return TaskCounts(
+                by_status=dict(zip(STATUSES, by_status)),
+                overdue=overdue,
+                oldest_open=self.__read(oldest) if oldest is not None else None,
+            )
@@ -1,5 +1,4 @@
 from enum import Enum
-from typing import Union
 from datetime import datetime, date
 from dataclasses import dataclass, field, fields, MISSING
 from task_cli.validator import is_valid_description
@@ -11,10 +10,23 @@ class Status(Enum):
     DONE = "done"
 
 
+STATUS_BY_VALUE = {status.value: status for status in Status}
+# Numbers that stand for statuses in the log and snapshot files and in
+# analytics columns, so the order of Status must not change.
+STATUSES = tuple(Status)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+# Those formats store dates as days and times as microseconds since EPOCH,
+# and NULL as MISSING_VALUE.
+EPOCH = datetime(1970, 1, 1)
+EPOCH_DAY = EPOCH.toordinal()
+MISSING_VALUE = -(2**31)
+
+
 @dataclass
 class CreateTask:
     status: Status
     description: str
+    due_date: date | None = None
 
     def __post_init__(self):
         if not is_valid_description(self.description):
@@ -27,27 +39,21 @@ class UpdateTask:
     description: str | None = None
     due_date: date | None = None
     updated_at: datetime = field(default_factory=datetime.now)
-    _dirty_fields: set[str] = field(init=False, default_factory=set, repr=False)
+    _dirty_fields: frozenset[str] = field(init=False, default_factory=frozenset, repr=False)
 
     def __init__(self, **kwargs):
-        self._dirty_fields = set(kwargs.keys())
-
-        for obj_field in fields(self):
-            if obj_field.name == "_dirty_fields":
-                continue
-
-            value = None
+        self._dirty_fields = frozenset((*kwargs, "updated_at"))
 
-            if obj_field.name in kwargs:
-                value = kwargs[obj_field.name]
-            elif obj_field.default_factory is not MISSING:
-                value = obj_field.default_factory()
-            elif obj_field.default is not MISSING:
-                value = obj_field.default
+        for name, default, default_factory in UPDATE_TASK_FIELDS:
+            if name in kwargs:
+                value = kwargs[name]
+            elif default_factory is not MISSING:
+                value = default_factory()
+            else:
+                value = default
 
-            setattr(self, obj_field.name, value)
+            setattr(self, name, value)
 
-        self._dirty_fields.add("updated_at")
         self.__post_init__()
 
     def __post_init__(self):
@@ -55,29 +61,60 @@ class UpdateTask:
             raise ValueError("Invalid description.")
 
     def items(self):
-        return {
-            field.name: getattr(self, field.name)
-            for field in fields(self)
-            if field.name != "_dirty_fields"
-        }.items()
+        return {name: getattr(self, name) for name in UPDATE_TASK_FIELD_NAMES}.items()
 
     def is_set(self, field_name: str) -> bool:
         return field_name in self._dirty_fields
 
+    def dirty_fields(self) -> frozenset[str]:
+        return self._dirty_fields
+
+
+# Name, default and default factory of every UpdateTask field, collected once
+# instead of on every construction.
+UPDATE_TASK_FIELDS = tuple(
+    (
+        obj_field.name,
+        None if obj_field.default is MISSING else obj_field.default,
+        obj_field.default_factory,
+    )
+    for obj_field in fields(UpdateTask)
+    if obj_field.name != "_dirty_fields"
+)
+UPDATE_TASK_FIELD_NAMES = tuple(name for name, _, _ in UPDATE_TASK_FIELDS)
+
+
+# Bound once, so hydrating a row looks up globals instead of class attributes.
+parse_date = date.fromisoformat
+parse_datetime = datetime.fromisoformat
+new_object = object.__new__
 
-@dataclass(unsafe_hash=True)
+
+@dataclass(unsafe_hash=True, slots=True)
 class Task:
     id: int
     status: Status
     description: str
     due_date: date | None
     created_at: datetime
-    updated_at: Union[datetime, None]
+    updated_at: datetime | None
 
     def __post_init__(self):
         if not is_valid_description(self.description):
             raise ValueError("Invalid description.")
 
+    @classmethod
+    def from_row(cls, row: tuple) -> "Task":
+        # Rows read from the database were validated on write, so this skips
+        # __init__ and __post_init__ and only converts the column values.
+        task = new_object(cls)
+        task.id, task.description, status, due_date, created_at, updated_at = row
+        task.status = STATUS_BY_VALUE[status]
+        task.due_date = parse_date(due_date) if due_date else None
+        task.created_at = parse_datetime(created_at)
+        task.updated_at = parse_datetime(updated_at) if updated_at else None
+        return task
+
     def __str__(self):
         rows = []
         max_title_len = 0
@@ -86,28 +123,21 @@ class Task:
         value_padding = 1
         extra_symbols = 5
 
-        for obj_field in fields(self):
-            value = getattr(self, obj_field.name)
-            value_repr = "-"
+        for name in TASK_FIELD_NAMES:
+            value = getattr(self, name)
 
             if isinstance(value, datetime):
-                value_repr = value.strftime("%Y-%m-%d %H:%M:%S")
+                value_repr = value.isoformat(sep=" ", timespec="seconds")
             elif value is None:
                 value_repr = "-"
             else:
                 value_repr = str(value)
 
-            max_title_len = max(max_title_len, len(obj_field.name))
+            max_title_len = max(max_title_len, len(name))
             max_value_len = max(max_value_len, len(value_repr))
+            rows.append((name.upper(), value_repr))
 
-            rows.append(
-                (
-                    obj_field.name.upper(),
-                    value_repr,
-                )
-            )
-
-        border_width = (
+        border = "-" * (
             max_title_len
             + title_padding
             + max_value_len
@@ -115,18 +145,94 @@ class Task:
             + extra_symbols
         )
 
-        text = "-" * border_width
+        lines = [border]
 
         for title, value in rows:
-            text += (
-                "\n| "
+            lines.append(
+                "| "
                 + title.ljust(max_title_len + title_padding)
                 + "| "
                 + value.ljust(max_value_len + value_padding)
                 + "|"
             )
 
-        text += "\n"
-        text += "-" * border_width
+        lines.append(border)
+
+        return "\n".join(lines)
+
+
+TASK_FIELD_NAMES = tuple(field.name for field in fields(Task))
+
+
+def to_record(task: Task) -> dict:
+    return {name: getattr(task, name) for name in TASK_FIELD_NAMES}
 
-        return text
+
+OPEN_STATUSES = (Status.TODO, Status.IN_PROGRESS)
+
+
+@dataclass
+class TaskCounts:
+    by_status: dict[Status, int]
+    overdue: int
+    oldest_open: Task | None
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_status.values())
+
+
+@dataclass
+class TaskSelection:
+    # Tasks whose id is in `ids` or in one of the inclusive `ranges`, or all
+    # tasks when both are empty, narrowed down by status and due date.
+    ids: list[int] = field(default_factory=list)
+    ranges: list[tuple[int, int]] = field(default_factory=list)
+    status: list[Status] | None = None
+    due_before: date | None = None
+
+    def matches(self, task: Task) -> bool:
+        if (self.ids or self.ranges) and task.id not in self.ids and not any(
+            start <= task.id <= end for start, end in self.ranges
+        ):
+            return False
+
+        if self.status is not None and task.status not in self.status:
+            return False
+
+        return self.due_before is None or (
+            task.due_date is not None and task.due_date < self.due_before
+        )
+
+
+class ChangeOp(Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+CHANGE_OP_BY_VALUE = {op.value: op for op in ChangeOp}
+
+
+@dataclass(slots=True)
+class Change:
+    seq: int
+    op: ChangeOp
+    task_id: int
+    # Column values as stored, e.g. ISO dates; only changed columns for updates.
+    fields: dict
+    changed_at: datetime
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Change":
+        import json
+
+        seq, op, task_id, fields, changed_at = row
+
+        return cls(
+            seq,
+            CHANGE_OP_BY_VALUE[op],
+            task_id,
+            json.loads(fields) if fields else {},
+            datetime.fromisoformat(changed_at),
+        )
@@ -0,0 +1,41 @@
+import os
+
+# Read without argparse or sqlite3, so the entry point can decide whether a
+# server can run the command before importing the CLI.
+default_shards = int(os.environ.get("TASK_CLI_SHARDS", "1"))
+default_storage = os.environ.get("TASK_CLI_STORAGE", "sqlite")
+
+GLOBAL_OPTIONS_WITH_VALUES = ("--durability", "--profile", "--shards", "--storage")
+
+
+def find_command(argv: list[str]) -> str | None:
+    # None when there is no command, or when help is asked for before it,
+    # which argparse answers with the list of all commands.
+    arguments = iter(argv)
+
+    for argument in arguments:
+        if argument in GLOBAL_OPTIONS_WITH_VALUES:
+            next(arguments, None)
+        elif argument in ("-h", "--help"):
+            return None
+        elif not argument.startswith("-"):
+            return argument
+
+    return None
+
+
+def storage_options(argv: list[str]) -> tuple[str, str]:
+    # The --storage and --shards values given before the command, the last
+    # one winning as with argparse, or their defaults.
+    values = {"--storage": default_storage, "--shards": str(default_shards)}
+    arguments = iter(argv)
+
+    for argument in arguments:
+        option, separator, value = argument.partition("=")
+
+        if option in GLOBAL_OPTIONS_WITH_VALUES:
+            values[option] = value if separator else next(arguments, "")
+        elif not argument.startswith("-"):
+            break
+
+    return values["--storage"], values["--shards"]
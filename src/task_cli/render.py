@@ -0,0 +1,155 @@
+import sys
+from datetime import date, datetime, timedelta
+from enum import Enum
+from collections.abc import Iterable
+from task_cli.instrumentation import span
+from task_cli.model import TASK_FIELD_NAMES, Task, to_record
+from task_cli.utils import chunked, serialize
+
+# typing is only imported by type checkers, since it slows down CLI startup.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from typing import TextIO
+
+FORMATS = ("table", "boxed", "jsonl", "tsv")
+DEFAULT_WINDOW_SIZE = 1000
+COLUMN_GAP = "  "
+ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+DESCRIPTION_INDEX = TASK_FIELD_NAMES.index("description")
+
+
+def format_value(value) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+
+    if isinstance(value, Enum):
+        return value.value
+
+    return str(value)
+
+
+def to_row(task: Task, missing: str = "-") -> list[str]:
+    row = [
+        missing if value is None else format_value(value)
+        for value in to_record(task).values()
+    ]
+    row[DESCRIPTION_INDEX] = row[DESCRIPTION_INDEX].translate(ESCAPES)
+    return row
+
+
+class TableRenderer:
+    # Tasks are rendered a window at a time without knowing the later ones,
+    # so columns only widen; rows before a wider value stay narrower.
+    def __init__(self):
+        self.header = [name.upper() for name in TASK_FIELD_NAMES]
+        self.widths = [len(title) for title in self.header]
+
+    def render(self, tasks: list[Task], first: bool) -> str:
+        rows = [to_row(task) for task in tasks]
+
+        for index, column in enumerate(zip(*rows)):
+            self.widths[index] = max(self.widths[index], *map(len, column))
+
+        template = COLUMN_GAP.join(f"{{:<{width}}}" for width in self.widths[:-1])
+        template += COLUMN_GAP + "{}\n"
+
+        if first:
+            rows.insert(0, self.header)
+
+        return "".join(template.format(*row) for row in rows)
+
+
+def render_boxed(tasks: list[Task], first: bool) -> str:
+    return "".join(f"{task}\n" for task in tasks)
+
+
+def render_jsonl(tasks: list[Task], first: bool) -> str:
+    return "".join(serialize(to_record(task), indent=None) + "\n" for task in tasks)
+
+
+def render_tsv(tasks: list[Task], first: bool) -> str:
+    lines = ["\t".join(TASK_FIELD_NAMES) + "\n"] if first else []
+
+    lines.extend("\t".join(to_row(task, missing="")) + "\n" for task in tasks)
+    return "".join(lines)
+
+
+def render_tasks(
+    tasks: Iterable[Task],
+    format: str = "table",
+    file: "TextIO | None" = None,
+    window_size: int = DEFAULT_WINDOW_SIZE,
+) -> int:
+    file = file or sys.stdout
+    count = 0
+
+    match format:
+        case "table":
+            render = TableRenderer().render
+        case "boxed":
+            render = render_boxed
+        case "jsonl":
+            render = render_jsonl
+        case "tsv":
+            render = render_tsv
+        case _:
+            raise ValueError(f"Unknown output format '{format}'.")
+
+    for window in chunked(tasks, window_size):
+        with span("render", format=format, rows=len(window)):
+            file.write(render(window, count == 0))
+            file.flush()
+
+        count += len(window)
+
+    return count
+
+
+def agenda_heading(due_date: date, today: date) -> str:
+    if due_date < today:
+        return "Overdue"
+
+    if due_date == today:
+        return "Today"
+
+    if due_date == today + timedelta(days=1):
+        return "Tomorrow"
+
+    return due_date.strftime("%A %Y-%m-%d")
+
+
+def render_agenda(
+    tasks: Iterable[Task],
+    today: date,
+    file: "TextIO | None" = None,
+    window_size: int = DEFAULT_WINDOW_SIZE,
+) -> int:
+    file = file or sys.stdout
+    heading = None
+    count = 0
+
+    for window in chunked(tasks, window_size):
+        with span("render", format="agenda", rows=len(window)):
+            lines = []
+
+            for task in window:
+                current = agenda_heading(task.due_date, today)
+
+                if current != heading:
+                    lines.append(f"{current}\n")
+                    heading = current
+
+                line = f"  #{task.id} [{task.status.value}] {task.description.translate(ESCAPES)}"
+
+                if task.due_date < today:
+                    line += f" (due {task.due_date.isoformat()})"
+
+                lines.append(line + "\n")
+
+            file.write("".join(lines))
+            file.flush()
+
+        count += len(window)
+
+    return count
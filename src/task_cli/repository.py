@@ -1,57 +1,408 @@
 import sqlite3
-from typing import List, Union
-from datetime import date, datetime
-from task_cli.model import CreateTask, Status, Task, UpdateTask
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date
+from task_cli.connection import ConnectionPool
+from task_cli.instrumentation import span
+from task_cli.database import default_durability, durability_pragmas
+from task_cli.model import (
+    OPEN_STATUSES,
+    STATUS_BY_VALUE,
+    Change,
+    CreateTask,
+    Status,
+    Task,
+    TaskCounts,
+    UPDATE_TASK_FIELD_NAMES,
+    TaskSelection,
+    UpdateTask,
+)
+from task_cli.store import DEFAULT_PAGE_SIZE, TaskStore
 
+RETURNING_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
 
-class TaskRepository:
-    def __init__(self, db: str):
+
+@dataclass
+class GroupCommit:
+    max_writes: int = 100
+    max_delay: float = 0.1
+
+
+# Per-row insert triggers that import_many suspends, with the statement that
+# applies their effect to all tasks inserted after the given id at once.
+BULK_INSERT_TRIGGERS = (
+    (
+        "tasks_fts_insert",
+        "INSERT INTO tasks_fts (rowid, description) "
+        "SELECT id, description FROM tasks WHERE id > ?",
+    ),
+    (
+        "task_changes_insert",
+        "INSERT INTO task_changes (op, task_id, fields) "
+        "SELECT 'insert', id, json_object("
+        "'description', description, 'status', status, 'due_date', due_date, "
+        "'created_at', created_at, 'updated_at', updated_at"
+        ") FROM tasks WHERE id > ? ORDER BY id",
+    ),
+    (
+        "task_counts_insert",
+        "INSERT INTO task_counts (status, count) "
+        "SELECT status, COUNT(*) FROM tasks WHERE id > ? GROUP BY status "
+        "ON CONFLICT (status) DO UPDATE SET count = count + excluded.count",
+    ),
+)
+
+
+# Values of these types are converted to what their column stores; others are
+# stored as they are.
+UPDATE_CONVERTERS: dict[type, Callable] = {Status: attrgetter("value"), date: date.isoformat}
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledUpdate:
+    names: tuple[str, ...]
+    assignments: str
+    by_id: str
+    by_id_returning: str
+
+
+@lru_cache(maxsize=64)
+def compile_update(dirty_fields: frozenset[str]) -> CompiledUpdate:
+    # Updates set only a few distinct combinations of fields, so the SQL of
+    # each combination is built once and reused.
+    names = tuple(name for name in UPDATE_TASK_FIELD_NAMES if name in dirty_fields)
+    assignments = ", ".join(f"{name} = ?" for name in names)
+    by_id = f"UPDATE tasks SET {assignments} WHERE id = ?"
+    return CompiledUpdate(names, assignments, by_id, by_id + " RETURNING *")
+
+
+def bind_update(data: UpdateTask) -> tuple[CompiledUpdate, list]:
+    compiled = compile_update(data.dirty_fields())
+    values = []
+
+    for name in compiled.names:
+        value = getattr(data, name)
+        convert = UPDATE_CONVERTERS.get(type(value))
+        values.append(value if convert is None else convert(value))
+
+    return compiled, values
+
+
+def build_match_query(query: str) -> str:
+    terms = ('"' + term.replace('"', '""') + '"*' for term in query.split())
+    return " ".join(terms)
+
+
+class TaskRepository(TaskStore):
+    def __init__(
+        self,
+        db: str,
+        pool: ConnectionPool | None = None,
+        durability: str = default_durability,
+        group_commit: GroupCommit | None = None,
+    ):
         self.db = db
+        self.pool = (
+            pool
+            if pool is not None
+            else ConnectionPool(db, pragmas=durability_pragmas(durability))
+        )
+        self.group_commit = group_commit
+        self._local = threading.local()
+        self._group_lock = threading.RLock()
+        self._group_timers: dict[sqlite3.Connection, threading.Timer] = {}
+
+    def close(self):
+        if not self.pool.closed:
+            with self._group_lock:
+                for connection in list(self._group_timers):
+                    self.__commit_group(connection)
+
+        self.pool.close()
+
+    def flush(self):
+        connection = self.pool.acquire()
+
+        if not getattr(self._local, "depth", 0):
+            self.__commit_group(connection)
+
+    @contextmanager
+    def transaction(self):
+        # A suspended RETURNING iterator holds the thread's transaction open;
+        # writes made meanwhile would commit or roll back with it.
+        if getattr(self._local, "streaming", False):
+            raise RuntimeError("Finish or close the open RETURNING iterator first.")
+
+        connection = self.pool.acquire()
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+
+        try:
+            if depth:
+                yield connection
+            elif self.group_commit is None:
+                with connection as transaction:
+                    if not transaction.in_transaction:
+                        transaction.execute("BEGIN")
+
+                    yield transaction
+            else:
+                with self.__grouped(connection, self.group_commit) as transaction:
+                    yield transaction
+        finally:
+            self._local.depth -= 1
+
+    @contextmanager
+    def __grouped(self, connection, group_commit: GroupCommit):
+        # Writes to a group and the timer that commits it once max_delay has
+        # passed take the group lock, so an idle writer never keeps the
+        # transaction and its write lock open for longer.
+        with self._group_lock:
+            if not connection.in_transaction:
+                connection.execute("BEGIN")
+                self._local.pending = 0
+                timer = threading.Timer(
+                    group_commit.max_delay, self.__expire_group, (connection,)
+                )
+                timer.daemon = True
+                self._group_timers[connection] = timer
+                timer.start()
+
+            connection.execute("SAVEPOINT grouped")
+
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK TO grouped")
+                raise
+            finally:
+                connection.execute("RELEASE grouped")
+
+            self._local.pending += 1
+
+            if self._local.pending >= group_commit.max_writes:
+                self.__commit_group(connection)
+
+    def __expire_group(self, connection: sqlite3.Connection):
+        # Runs on the timer's thread; a group committed and reopened since the
+        # timer started has a timer of its own.
+        with self._group_lock:
+            if self._group_timers.get(connection) is threading.current_thread():
+                self.__commit_group(connection)
 
-    def __hydrate(self, row):
-        return Task(
-            id=row[0],
-            description=row[1],
-            status=Status(row[2]),
-            due_date=datetime.fromisoformat(row[3]).date() if row[3] else None,
-            created_at=datetime.fromisoformat(row[4]),
-            updated_at=datetime.fromisoformat(row[5]) if row[5] else None,
+    def __commit_group(self, connection: sqlite3.Connection):
+        with self._group_lock:
+            timer = self._group_timers.pop(connection, None)
+
+            if timer is not None:
+                timer.cancel()
+
+            if connection.in_transaction:
+                connection.commit()
+
+    def __insert_values(self, task: CreateTask):
+        return (
+            task.description,
+            task.status.value,
+            task.due_date.isoformat() if task.due_date else None,
         )
 
-    def find_by_id(self, id: int) -> Union[Task, None]:
-        with sqlite3.connect(self.db) as connection:
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM tasks WHERE id = ?", (id,))
-            row = cursor.fetchone()
+    def __compile_selection(self, selection: TaskSelection):
+        id_conditions = []
+        conditions = []
+        values: list[str | int] = []
 
-            if not row:
-                return None
+        # A list of ids is passed as one JSON array, as a placeholder per id
+        # would run into SQLite's limit on the number of parameters.
+        if selection.ids:
+            import json
 
-            return self.__hydrate(row)
+            id_conditions.append("id IN (SELECT value FROM json_each(?))")
+            values.append(json.dumps(selection.ids))
 
-    def find_by_status(self, status: List[Status] | None = None) -> List[Task]:
-        if status is None:
-            status = [Status.TODO, Status.IN_PROGRESS, Status.DONE]
+        for start, end in selection.ranges:
+            id_conditions.append("id BETWEEN ? AND ?")
+            values.extend((start, end))
 
-        with sqlite3.connect(self.db) as connection:
-            cursor = connection.cursor()
+        if id_conditions:
+            conditions.append(f"({' OR '.join(id_conditions)})")
+
+        if selection.status is not None:
+            conditions.append(f"status IN ({', '.join('?' for _ in selection.status)})")
+            values.extend(status.value for status in selection.status)
+
+        if selection.due_before is not None:
+            conditions.append("due_date < ?")
+            values.append(selection.due_before.isoformat())
+
+        return " AND ".join(conditions) or "1", values
+
+    def find_by_id(self, id: int) -> Task | None:
+        cursor = self.pool.acquire().cursor()
+        cursor.execute("SELECT * FROM tasks WHERE id = ?", (id,))
+        row = cursor.fetchone()
+
+        if not row:
+            return None
+
+        return Task.from_row(row)
+
+    def iter_by_status(
+        self,
+        status: list[Status] | None = None,
+        after: int = 0,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]:
+        if status is None:
+            query = "SELECT * FROM tasks WHERE id > ? ORDER BY id LIMIT ?"
+            values = []
+        elif status:
             placeholders = ", ".join("?" for _ in status)
-            query = f"SELECT * FROM tasks WHERE status IN ({placeholders})"
-            cursor.execute(query, [s.value for s in status])
-            rows = cursor.fetchall()
-            return [self.__hydrate(row) for row in rows]
+            query = f"SELECT * FROM tasks WHERE status IN ({placeholders}) AND id > ? ORDER BY id LIMIT ?"
+            values = [s.value for s in status]
+        else:
+            return
+
+        yield from self.__paginate(query, values, (after,), lambda row: (row[0],), limit, page_size)
+
+    def iter_by_due_date(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        status: list[Status] | None = None,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]:
+        conditions = []
+        values = []
+
+        if end is not None:
+            conditions.append("due_date < ?")
+            values.append(end.isoformat())
+
+        if status is not None:
+            if not status:
+                return
+
+            conditions.append(f"status IN ({', '.join('?' for _ in status)})")
+            values.extend(s.value for s in status)
+
+        # Pages follow the (due_date, status, id) order of the index, so no
+        # sorting is needed; INDEXED BY keeps the planner from choosing the
+        # (status, due_date) index and sorting its ranges instead. The start
+        # date is the lower bound of the first page's key, and '' sorts
+        # before every date while excluding tasks without one.
+        query = f"""
+            SELECT * FROM tasks INDEXED BY idx_tasks_due_date_status
+            WHERE {" AND ".join([*conditions, "(due_date, status, id) > (?, ?, ?)"])}
+            ORDER BY due_date, status, id
+            LIMIT ?
+        """
+        key = (start.isoformat() if start else "", "", 0)
+
+        yield from self.__paginate(
+            query, values, key, lambda row: (row[3], row[2], row[0]), limit, page_size
+        )
+
+    def __paginate(
+        self,
+        query: str,
+        values: list,
+        key: tuple,
+        key_of,
+        limit: int | None,
+        page_size: int,
+        from_row=Task.from_row,
+    ) -> Iterator:
+        # Keyset pagination: each page continues after the key of the last row
+        # of the previous one, which is passed after the query's own values.
+        connection = self.pool.acquire()
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            cursor = connection.execute(query, (*values, *key, size))
+            rows = cursor.fetchmany(size)
+            cursor.close()
+
+            with span("hydrate", rows=len(rows)):
+                items = list(map(from_row, rows))
+
+            yield from items
+
+            if len(rows) < size:
+                return
+
+            key = key_of(rows[-1])
+
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def iter_changes(
+        self,
+        since: int = 0,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Change]:
+        query = "SELECT * FROM task_changes WHERE seq > ? ORDER BY seq LIMIT ?"
+
+        yield from self.__paginate(
+            query, [], (since,), lambda row: (row[0],), limit, page_size, Change.from_row
+        )
+
+    def last_change(self) -> int:
+        cursor = self.pool.acquire().execute("SELECT COALESCE(MAX(seq), 0) FROM task_changes")
+        return cursor.fetchone()[0]
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> list[Task]:
+        match = build_match_query(query)
+
+        if not match:
+            return []
+
+        cursor = self.pool.acquire().execute(
+            """
+            SELECT tasks.* FROM (
+                SELECT rowid, rank FROM tasks_fts
+                WHERE tasks_fts MATCH ?
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+            ) AS matches
+            JOIN tasks ON tasks.id = matches.rowid
+            ORDER BY matches.rank
+            """,
+            (match, limit, offset),
+        )
+
+        rows = cursor.fetchall()
+
+        with span("hydrate", rows=len(rows)):
+            return list(map(Task.from_row, rows))
 
-    def add(self, task: CreateTask):
-        with sqlite3.connect(self.db) as connection:
+    def add(self, task: CreateTask) -> Task | None:
+        with self.transaction() as connection:
             cursor = connection.cursor()
 
+            if RETURNING_SUPPORTED:
+                cursor.execute(
+                    "INSERT INTO tasks (description, status, due_date) VALUES (?, ?, ?) RETURNING *",
+                    self.__insert_values(task),
+                )
+                row = cursor.fetchone()
+                cursor.close()
+                return Task.from_row(row) if row else None
+
             result = cursor.execute(
-                "INSERT INTO tasks (description, status) VALUES (?, ?)",
-                (task.description, task.status.value),
+                "INSERT INTO tasks (description, status, due_date) VALUES (?, ?, ?)",
+                self.__insert_values(task),
             )
 
-            connection.commit()
-
             task_id = result.lastrowid
 
             if task_id is None:
@@ -59,39 +410,232 @@ class TaskRepository:
 
             return self.find_by_id(task_id)
 
-    def update(self, task: Task, data: UpdateTask):
-        with sqlite3.connect(self.db) as connection:
-            field_keys = []
-            field_values = []
-            cursor = connection.cursor()
+    def add_many(self, tasks: Iterable[CreateTask]) -> int:
+        with self.transaction() as connection:
+            cursor = connection.executemany(
+                "INSERT INTO tasks (description, status, due_date) VALUES (?, ?, ?)",
+                map(self.__insert_values, tasks),
+            )
 
-            for field, value in data.items():
-                if data.is_set(field):
-                    field_keys.append(f"{field} = ?")
+            return cursor.rowcount
 
-                    if type(value) is Status:
-                        field_values.append(value.value)
-                    elif type(value) is date:
-                        field_values.append(value.isoformat())
-                    else:
-                        field_values.append(value)
+    def import_many(self, tasks: Iterable[CreateTask]) -> int:
+        # Like add_many, but for large batches: the insert triggers are dropped
+        # for the transaction, so the search index, counters and journal are
+        # updated by one statement each instead of once per row.
+        with self.transaction() as connection:
+            last_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0]
+            triggers = []
 
-            query = f"UPDATE tasks SET {', '.join(field_keys)} WHERE id = ?"
-            result = cursor.execute(query, (*field_values, task.id))
-            connection.commit()
+            for name, bulk_sql in BULK_INSERT_TRIGGERS:
+                row = connection.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+                ).fetchone()
 
-            return result.rowcount > 0
+                if row is not None:
+                    connection.execute(f"DROP TRIGGER {name}")
+                    triggers.append((row[0], bulk_sql))
+
+            cursor = connection.executemany(
+                "INSERT INTO tasks (description, status, due_date) VALUES (?, ?, ?)",
+                map(self.__insert_values, tasks),
+            )
+
+            for trigger_sql, bulk_sql in triggers:
+                connection.execute(bulk_sql, (last_id,))
+                connection.execute(trigger_sql)
+
+            return cursor.rowcount
+
+    def update_by_id(
+        self,
+        id: int,
+        data: UpdateTask,
+        if_status: list[Status] | None = None,
+    ) -> Task | None:
+        compiled, values = bind_update(data)
+        values.append(id)
+        query = compiled.by_id
+        returning = compiled.by_id_returning
+
+        if if_status is not None:
+            query += f" AND status IN ({', '.join('?' for _ in if_status)})"
+            returning = query + " RETURNING *"
+            values.extend(status.value for status in if_status)
+
+        with self.transaction() as connection:
+            if RETURNING_SUPPORTED:
+                cursor = connection.execute(returning, values)
+                row = cursor.fetchone()
+                cursor.close()
+                return Task.from_row(row) if row else None
+
+            if connection.execute(query, values).rowcount == 0:
+                return None
+
+            return self.find_by_id(id)
+
+    def update_many(self, updates: Iterable[tuple[int, UpdateTask]]) -> int:
+        count = 0
+
+        with self.transaction() as connection:
+            compiled = (
+                (*bind_update(data), id) for id, data in updates
+            )
+
+            for statement, group in groupby(compiled, key=lambda item: item[0].by_id):
+                cursor = connection.executemany(
+                    statement, ((*field_values, id) for _, field_values, id in group)
+                )
+
+                count += cursor.rowcount
+
+        return count
+
+    def iter_matching(
+        self, selection: TaskSelection, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        condition, values = self.__compile_selection(selection)
+        query = f"SELECT * FROM tasks WHERE {condition} AND id > ? ORDER BY id LIMIT ?"
+
+        yield from self.__paginate(query, values, (0,), lambda row: (row[0],), None, page_size)
+
+    def update_matching(self, selection: TaskSelection, data: UpdateTask) -> int:
+        compiled, field_values = bind_update(data)
+        condition, values = self.__compile_selection(selection)
+
+        with self.transaction() as connection:
+            cursor = connection.execute(
+                f"UPDATE tasks SET {compiled.assignments} WHERE {condition}",
+                (*field_values, *values),
+            )
+
+            return cursor.rowcount
+
+    def iter_update_matching(
+        self, selection: TaskSelection, data: UpdateTask, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        if not RETURNING_SUPPORTED:
+            yield from super().iter_update_matching(selection, data, page_size)
+            return
+
+        compiled, field_values = bind_update(data)
+        condition, values = self.__compile_selection(selection)
+        query = f"UPDATE tasks SET {compiled.assignments} WHERE {condition} RETURNING *"
+
+        yield from self.__returning(query, (*field_values, *values), page_size)
+
+    def __returning(self, query: str, values: tuple, page_size: int) -> Iterator[Task]:
+        # SQLite makes every change on the first step of a RETURNING statement
+        # and only hands out the rows afterwards; they are streamed a page at a
+        # time and the transaction commits once all were read. An iterator that
+        # is closed early rolls the changes back. While it is suspended, the
+        # thread cannot start other writes.
+        with self.transaction() as connection:
+            cursor = connection.execute(query, values)
+
+            while rows := cursor.fetchmany(page_size):
+                with span("hydrate", rows=len(rows)):
+                    tasks = list(map(Task.from_row, rows))
+
+                self._local.streaming = True
+
+                try:
+                    yield from tasks
+                finally:
+                    self._local.streaming = False
+
+            cursor.close()
 
     def delete_by_id(self, id: int) -> bool:
-        with sqlite3.connect(self.db) as connection:
+        with self.transaction() as connection:
             cursor = connection.cursor()
             result = cursor.execute("DELETE FROM tasks WHERE id = ?", (id,))
-            connection.commit()
             return result.rowcount > 0
 
+    def delete_many(self, ids: Iterable[int]) -> int:
+        with self.transaction() as connection:
+            cursor = connection.executemany(
+                "DELETE FROM tasks WHERE id = ?",
+                ((id,) for id in ids),
+            )
+
+            return cursor.rowcount
+
+    def delete_matching(self, selection: TaskSelection) -> int:
+        condition, values = self.__compile_selection(selection)
+
+        with self.transaction() as connection:
+            return connection.execute(f"DELETE FROM tasks WHERE {condition}", values).rowcount
+
+    def iter_delete_matching(
+        self, selection: TaskSelection, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        if not RETURNING_SUPPORTED:
+            yield from super().iter_delete_matching(selection, page_size)
+            return
+
+        condition, values = self.__compile_selection(selection)
+        query = f"DELETE FROM tasks WHERE {condition} RETURNING *"
+
+        yield from self.__returning(query, tuple(values), page_size)
+
     def size(self) -> int:
-        with sqlite3.connect(self.db) as connection:
-            cursor = connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM tasks")
-            count = cursor.fetchone()[0]
-            return count
+        cursor = self.pool.acquire().cursor()
+        cursor.execute("SELECT COALESCE(SUM(count), 0) FROM task_counts")
+        count = cursor.fetchone()[0]
+        return count
+
+    def counts(self, today: date | None = None) -> TaskCounts:
+        connection = self.pool.acquire()
+        by_status = dict.fromkeys(Status, 0)
+
+        for status, count in connection.execute("SELECT status, count FROM task_counts"):
+            by_status[STATUS_BY_VALUE[status]] = count
+
+        # Whether a task is overdue changes with the date, so triggers cannot
+        # maintain it; the (status, due_date) index only visits overdue rows.
+        open_values = [status.value for status in OPEN_STATUSES]
+        overdue = connection.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status IN (?, ?) AND due_date < ?",
+            (*open_values, (today or date.today()).isoformat()),
+        ).fetchone()[0]
+
+        rows = [
+            connection.execute(
+                "SELECT * FROM tasks WHERE status = ? ORDER BY created_at, id LIMIT 1",
+                (value,),
+            ).fetchone()
+            for value in open_values
+        ]
+        oldest = min(filter(None, rows), key=lambda row: (row[4], row[0]), default=None)
+
+        return TaskCounts(
+            by_status=by_status,
+            overdue=overdue,
+            oldest_open=Task.from_row(oldest) if oldest else None,
+        )
+
+    def check_counts(self) -> dict[Status, tuple[int, int]]:
+        with self.transaction() as connection:
+            stored = dict(connection.execute("SELECT status, count FROM task_counts"))
+            actual = dict(
+                connection.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
+            )
+
+        return {
+            status: (stored.get(value, 0), actual.get(value, 0))
+            for value, status in STATUS_BY_VALUE.items()
+            if stored.get(value, 0) != actual.get(value, 0)
+        }
+
+    def rebuild_counts(self) -> dict[Status, tuple[int, int]]:
+        with self.transaction() as connection:
+            mismatches = self.check_counts()
+            connection.execute("DELETE FROM task_counts")
+            connection.execute(
+                "INSERT INTO task_counts (status, count) "
+                "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+            )
+
+        return mismatches
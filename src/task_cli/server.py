@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from task_cli.cli import create_parser, dispatch_command
+from task_cli.client import forward
+from task_cli.database import default_durability, init_db
+from task_cli.repository import TaskRepository
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    server: "TaskServer"
+
+    def handle(self):
+        for line in self.rfile:
+            self.wfile.write(b"\n")
+            self.wfile.flush()
+
+            try:
+                request = json.loads(line)
+                response = self.server.execute(request["argv"], request.get("cwd"))
+            except (ValueError, KeyError, TypeError):
+                response = {"stdout": "", "stderr": "Malformed request.\n", "code": 2}
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class TaskServer(socketserver.UnixStreamServer):
+    def __init__(self, path: str, database: str, durability: str = default_durability):
+        self.path = path
+        self.database = os.path.abspath(database)
+        init_db(self.database)
+        self.repository = TaskRepository(self.database, durability=durability)
+        self.parser = create_parser()
+        super().__init__(path, CommandHandler)
+
+    def execute(self, argv: list[str], cwd: str | None = None) -> dict:
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        code = 0
+        previous_cwd = os.getcwd()
+
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                if cwd:
+                    os.chdir(cwd)
+
+                args = self.parser.parse_args(argv)
+
+                if not args.command:
+                    print("No command provided.", file=sys.stderr)
+                    print("Use 'task-cli --help' for more information.", file=sys.stderr)
+                elif args.command == "serve":
+                    print("Server is already running.", file=sys.stderr)
+                    code = 1
+                elif args.shards > 1 or args.storage != "sqlite":
+                    print(
+                        "The server only serves an SQLite database without shards.",
+                        file=sys.stderr,
+                    )
+                    code = 1
+                elif args.command == "batch" and args.file == "-":
+                    print("Batch commands cannot be read from the server's input.", file=sys.stderr)
+                    code = 1
+                else:
+                    dispatch_command(self.repository, args)
+            except SystemExit as exit:
+                code = exit.code if isinstance(exit.code, int) else 1
+            except Exception as error:
+                print(f"Internal error: {error}", file=sys.stderr)
+                code = 1
+            finally:
+                os.chdir(previous_cwd)
+
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "code": code}
+
+    def server_close(self):
+        super().server_close()
+        self.repository.close()
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def remove_stale_socket(path: str):
+    if not os.path.exists(path):
+        return
+
+    if forward([], path) is not None:
+        raise OSError(f"A server is already listening on '{path}'.")
+
+    os.remove(path)
+
+
+def serve(path: str, database: str, durability: str = default_durability):
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix domain sockets are not supported on this platform.")
+
+    remove_stale_socket(path)
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+
+    with TaskServer(path, database, durability) as server:
+        print(f"Listening on {path}.")
+        sys.stdout.flush()
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,314 @@
+import heapq
+import sqlite3
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import replace
+from datetime import date
+from itertools import chain, count
+import os
+from os import path
+from task_cli.database import default_durability, init_db
+from task_cli.model import CreateTask, Status, Task, TaskCounts, TaskSelection, UpdateTask
+from task_cli.repository import DEFAULT_PAGE_SIZE, GroupCommit, TaskRepository
+from task_cli.store import TaskStore
+
+
+def shard_paths(db: str, shards: int) -> list[str]:
+    root, extension = path.splitext(db)
+    return [f"{root}.{index}{extension}" for index in range(shards)]
+
+
+def load_by_status(db: str, status: list[str] | None) -> list[tuple]:
+    # Runs in a worker process, so it opens its own connection and returns
+    # plain rows, which are cheaper to pickle than tasks.
+    with closing(sqlite3.connect(db)) as connection:
+        if status is None:
+            return connection.execute("SELECT * FROM tasks ORDER BY id").fetchall()
+
+        placeholders = ", ".join("?" for _ in status)
+
+        return connection.execute(
+            f"SELECT * FROM tasks WHERE status IN ({placeholders}) ORDER BY id", status
+        ).fetchall()
+
+
+class ShardedTaskRepository(TaskStore):
+    # Tasks are spread over one SQLite file per shard. A task stored with
+    # local id n in shard s has the global id n * shards + s, so ids are
+    # unique, the shard of an id is id % shards, and the order of local ids
+    # within a shard is the global order. The number of shards of a database
+    # must therefore never change. Writes to different shards take different
+    # locks; there are no transactions spanning shards.
+    def __init__(
+        self,
+        db: str,
+        shards: int,
+        durability: str = default_durability,
+        group_commit: GroupCommit | None = None,
+        home: int | None = None,
+        processes: int | None = None,
+    ):
+        if shards < 1:
+            raise ValueError("Number of shards must be at least 1.")
+
+        if home is not None and not 0 <= home < shards:
+            raise ValueError(f"Home shard must be between 0 and {shards - 1}.")
+
+        self.db = db
+        self.paths = shard_paths(db, shards)
+        self.shards = [
+            TaskRepository(shard, durability=durability, group_commit=group_commit)
+            for shard in self.paths
+        ]
+        self.home = home
+        self.processes = processes
+        self._next_shard = count(os.getpid())
+        self._executor: Executor | None = None
+
+    def __len__(self) -> int:
+        return len(self.shards)
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def flush(self):
+        for shard in self.shards:
+            shard.flush()
+
+    def init_db(self) -> int:
+        return min(init_db(shard) for shard in self.paths)
+
+    def locate(self, id: int) -> tuple[TaskRepository, int]:
+        return self.shards[id % len(self.shards)], id // len(self.shards)
+
+    def __global_id(self, id: int, shard: int) -> int:
+        return id * len(self.shards) + shard
+
+    def __globalize(self, task: Task | None, shard: int) -> Task | None:
+        if task is not None:
+            task.id = self.__global_id(task.id, shard)
+
+        return task
+
+    def __route(self) -> int:
+        # Without a home shard new tasks are spread round-robin, starting from
+        # the process id so that one-off CLI invocations do not all pick the
+        # first shard. Writers that each use a different home shard never wait
+        # for each other's locks.
+        if self.home is not None:
+            return self.home
+
+        return next(self._next_shard) % len(self.shards)
+
+    def __globalize_all(self, tasks: Iterable[Task], shard: int) -> Iterator[Task]:
+        for task in tasks:
+            task.id = self.__global_id(task.id, shard)
+            yield task
+
+    def __merge(self, iterators: list[Iterator[Task]], key=None) -> Iterator[Task]:
+        return heapq.merge(
+            *(self.__globalize_all(tasks, shard) for shard, tasks in enumerate(iterators)),
+            key=key or (lambda task: task.id),
+        )
+
+    def __sum(self, method, routed: list[list]) -> int:
+        # Shards without work are skipped: executemany reports -1 for no rows.
+        return sum(method(shard, group) for shard, group in zip(self.shards, routed) if group)
+
+    def __localize(self, selection: TaskSelection, shard: int) -> TaskSelection | None:
+        # Global ids n * shards + shard in [start, end] are the local ids n in
+        # [ceil((start - shard) / shards), floor((end - shard) / shards)].
+        # Returns None when no selected id belongs to the shard.
+        shards = len(self.shards)
+        ids = [id // shards for id in selection.ids if id % shards == shard]
+        ranges = [
+            (-((shard - start) // shards), (end - shard) // shards)
+            for start, end in selection.ranges
+        ]
+        ranges = [(start, end) for start, end in ranges if start <= end]
+
+        if (selection.ids or selection.ranges) and not (ids or ranges):
+            return None
+
+        return replace(selection, ids=ids, ranges=ranges)
+
+    def __localize_all(self, selection: TaskSelection) -> list[tuple[int, TaskSelection]]:
+        return [
+            (index, local)
+            for index in range(len(self.shards))
+            if (local := self.__localize(selection, index)) is not None
+        ]
+
+    def find_by_id(self, id: int) -> Task | None:
+        shard, local_id = self.locate(id)
+        return self.__globalize(shard.find_by_id(local_id), id % len(self.shards))
+
+    def find_by_status(self, status: list[Status] | None = None) -> list[Task]:
+        if not self.processes or len(self.shards) == 1:
+            return list(self.iter_by_status(status))
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(min(self.processes, len(self.shards)))
+
+        values = None if status is None else [s.value for s in status]
+        pages = self._executor.map(load_by_status, self.paths, [values] * len(self.shards))
+
+        return list(self.__merge([map(Task.from_row, rows) for rows in pages]))
+
+    def iter_by_status(
+        self,
+        status: list[Status] | None = None,
+        after: int = 0,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]:
+        # A task of shard s comes after the global id `after` when its local
+        # id is greater than (after - s) // shards.
+        shards = len(self.shards)
+        tasks = self.__merge(
+            [
+                shard.iter_by_status(status, (after - index) // shards, limit, page_size)
+                for index, shard in enumerate(self.shards)
+            ]
+        )
+
+        for index, task in enumerate(tasks):
+            if limit is not None and index >= limit:
+                return
+
+            yield task
+
+    def iter_by_due_date(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        status: list[Status] | None = None,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]:
+        tasks = self.__merge(
+            [
+                shard.iter_by_due_date(start, end, status, limit, page_size)
+                for shard in self.shards
+            ],
+            key=lambda task: (task.due_date, task.status.value, task.id),
+        )
+
+        for index, task in enumerate(tasks):
+            if limit is not None and index >= limit:
+                return
+
+            yield task
+
+    def add(self, task: CreateTask) -> Task | None:
+        shard = self.__route()
+        return self.__globalize(self.shards[shard].add(task), shard)
+
+    def add_many(self, tasks: Iterable[CreateTask]) -> int:
+        if self.home is not None:
+            return self.shards[self.home].add_many(tasks)
+
+        routed: list[list[CreateTask]] = [[] for _ in self.shards]
+
+        for task in tasks:
+            routed[self.__route()].append(task)
+
+        return self.__sum(TaskRepository.add_many, routed)
+
+    def update_by_id(
+        self,
+        id: int,
+        data: UpdateTask,
+        if_status: list[Status] | None = None,
+    ) -> Task | None:
+        shard, local_id = self.locate(id)
+        task = shard.update_by_id(local_id, data, if_status)
+        return self.__globalize(task, id % len(self.shards))
+
+    def update_many(self, updates: Iterable[tuple[int, UpdateTask]]) -> int:
+        routed: list[list[tuple[int, UpdateTask]]] = [[] for _ in self.shards]
+
+        for id, data in updates:
+            routed[id % len(self.shards)].append((id // len(self.shards), data))
+
+        return self.__sum(TaskRepository.update_many, routed)
+
+    def iter_matching(
+        self, selection: TaskSelection, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        iterators: list[Iterator[Task]] = [iter(()) for _ in self.shards]
+
+        for index, local in self.__localize_all(selection):
+            iterators[index] = self.shards[index].iter_matching(local, page_size)
+
+        return self.__merge(iterators)
+
+    def update_matching(self, selection: TaskSelection, data: UpdateTask) -> int:
+        return sum(
+            self.shards[index].update_matching(local, data)
+            for index, local in self.__localize_all(selection)
+        )
+
+    # Tasks are yielded shard by shard, each shard's changes committed once
+    # its tasks were read.
+    def iter_update_matching(
+        self, selection: TaskSelection, data: UpdateTask, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        return chain.from_iterable(
+            self.__globalize_all(
+                self.shards[index].iter_update_matching(local, data, page_size), index
+            )
+            for index, local in self.__localize_all(selection)
+        )
+
+    def delete_by_id(self, id: int) -> bool:
+        shard, local_id = self.locate(id)
+        return shard.delete_by_id(local_id)
+
+    def delete_many(self, ids: Iterable[int]) -> int:
+        routed: list[list[int]] = [[] for _ in self.shards]
+
+        for id in ids:
+            routed[id % len(self.shards)].append(id // len(self.shards))
+
+        return self.__sum(TaskRepository.delete_many, routed)
+
+    def delete_matching(self, selection: TaskSelection) -> int:
+        return sum(
+            self.shards[index].delete_matching(local)
+            for index, local in self.__localize_all(selection)
+        )
+
+    def iter_delete_matching(
+        self, selection: TaskSelection, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        return chain.from_iterable(
+            self.__globalize_all(self.shards[index].iter_delete_matching(local, page_size), index)
+            for index, local in self.__localize_all(selection)
+        )
+
+    def size(self) -> int:
+        return sum(shard.size() for shard in self.shards)
+
+    def counts(self, today: date | None = None) -> TaskCounts:
+        counts = [shard.counts(today) for shard in self.shards]
+        oldest = [
+            replace(task, id=self.__global_id(task.id, index))
+            for index, task in enumerate(shard_counts.oldest_open for shard_counts in counts)
+            if task is not None
+        ]
+
+        return TaskCounts(
+            by_status={
+                status: sum(shard_counts.by_status[status] for shard_counts in counts)
+                for status in Status
+            },
+            overdue=sum(shard_counts.overdue for shard_counts in counts),
+            oldest_open=min(oldest, key=lambda task: (task.created_at, task.id), default=None),
+        )
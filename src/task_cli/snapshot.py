@@ -0,0 +1,343 @@
+import fcntl
+import heapq
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from itertools import islice
+from task_cli.database import default_durability, migrate, snapshot_path
+from task_cli.model import (
+    EPOCH,
+    EPOCH_DAY,
+    MISSING_VALUE,
+    OPEN_STATUSES,
+    STATUS_CODES,
+    STATUSES,
+    Status,
+    Task,
+    TaskCounts,
+)
+from task_cli.repository import DEFAULT_PAGE_SIZE, TaskRepository
+from task_cli.store import TaskReader
+
+MAGIC = b"TASKSNP1"
+# Magic, fingerprint of the database, number of tasks and of due dates per
+# status, index of the oldest open task (-1 if there is none) and offsets of
+# the due date tables and the string heap.
+HEADER = struct.Struct(f"<8s96s{len(Status) * 2}IiQQ")
+# id, due date in days since 1970-01-01, created_at and updated_at in
+# microseconds since 1970-01-01, and offset and length of the description
+# in the string heap. Records are grouped by status, each group in id order.
+RECORD = struct.Struct("<qiqqIH")
+ID = struct.Struct("<q")
+# Sorted due dates of each status, in days since 1970-01-01.
+DUE = struct.Struct("<i")
+MICROSECOND = timedelta(microseconds=1)
+
+
+def fingerprint(db: str) -> bytes:
+    # Identifies the committed state of the database without opening it, as
+    # PRAGMA data_version only compares states seen by one connection. The
+    # file change counter in the database header (bytes 24-27) changes with
+    # every commit in rollback journal mode, the WAL index header in the -shm
+    # file with every commit in WAL mode, and the database file's size and
+    # modification time with the checkpoint made when the last connection
+    # closes. Sessions that only read leave all of them unchanged.
+    parts = []
+
+    for file_name, offset, size in ((db, 24, 4), (db + "-shm", 0, 48)):
+        try:
+            with open(file_name, "rb") as file:
+                stat = os.fstat(file.fileno())
+                parts.append(struct.pack("<qq", stat.st_size, stat.st_mtime_ns))
+                parts.append(os.pread(file.fileno(), size, offset))
+        except FileNotFoundError:
+            parts.append(b"")
+
+    return b"\x00".join(parts)
+
+
+def to_micros(value: str | None) -> int:
+    if not value:
+        return MISSING_VALUE
+
+    return (datetime.fromisoformat(value) - EPOCH) // MICROSECOND
+
+
+def build_snapshot(db: str, file_name: str, durability: str = default_durability) -> int:
+    # The fingerprint is read before the database is opened: a write committed
+    # before the tasks are read then only makes the snapshot look stale.
+    key = fingerprint(db)
+
+    with TaskRepository(db, durability=durability) as repository:
+        migrate(repository.pool.acquire())
+        return write_snapshot(repository, file_name, key)
+
+
+def write_snapshot(repository: TaskRepository, file_name: str, key: bytes) -> int:
+    records = bytearray()
+    heap = bytearray()
+    due_days: list[list[int]] = []
+    counts: list[int] = []
+    oldest = None
+
+    with repository.transaction() as connection:
+        for status in STATUSES:
+            cursor = connection.execute(
+                "SELECT id, description, due_date, created_at, updated_at "
+                "FROM tasks WHERE status = ? ORDER BY id",
+                (status.value,),
+            )
+            count = 0
+            due_days.append([])
+
+            for id, description, due_date, created_at, updated_at in cursor:
+                encoded = description.encode()
+                due_day = (
+                    date.fromisoformat(due_date).toordinal() - EPOCH_DAY
+                    if due_date
+                    else MISSING_VALUE
+                )
+                created = to_micros(created_at)
+                records += RECORD.pack(
+                    id, due_day, created, to_micros(updated_at), len(heap), len(encoded)
+                )
+                heap += encoded
+
+                if due_day != MISSING_VALUE:
+                    due_days[-1].append(due_day)
+
+                if status in OPEN_STATUSES and (oldest is None or (created, id) < oldest[:2]):
+                    oldest = (created, id, sum(counts) + count)
+
+                count += 1
+
+            counts.append(count)
+
+    due_tables = b"".join(
+        struct.pack(f"<{len(days)}i", *sorted(days)) for days in due_days
+    )
+    header = HEADER.pack(
+        MAGIC,
+        key,
+        *counts,
+        *map(len, due_days),
+        oldest[2] if oldest else -1,
+        HEADER.size + len(records),
+        HEADER.size + len(records) + len(due_tables),
+    )
+    temporary = file_name + ".tmp"
+
+    with open(temporary, "wb") as file:
+        file.write(header)
+        file.write(records)
+        file.write(due_tables)
+        file.write(heap)
+
+    os.replace(temporary, file_name)
+    return sum(counts)
+
+
+def rebuild_snapshot(db: str, file_name: str, durability: str = default_durability) -> int | None:
+    # Returns None without building when another process is rebuilding it.
+    with open(file_name + ".lock", "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return None
+
+        return build_snapshot(db, file_name, durability)
+
+
+def rebuild_in_background(db: str, file_name: str, durability: str = default_durability) -> bool:
+    # Starts a process that rebuilds a stale snapshot, so that reads do not
+    # wait for it; they use the database until it is done. Returns False if a
+    # rebuild is already running.
+    with open(file_name + ".lock", "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, "-m", "task_cli.snapshot", db, file_name, durability],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return True
+
+
+class TaskSnapshot(TaskReader):
+    # Read-only view of a snapshot file through a memory map. Tasks are only
+    # built from their records when they are iterated.
+    def __init__(self, file_name: str):
+        with open(file_name, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.fingerprint, *counts, self._oldest, self._due, self._heap = (
+            HEADER.unpack_from(self._map)
+        )
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{file_name}' is not a task snapshot.")
+
+        self._counts = counts[: len(STATUSES)]
+        self._due_counts = counts[len(STATUSES) :]
+        self._starts = [sum(self._counts[:code]) for code in range(len(STATUSES))]
+        self._due_starts = [sum(self._due_counts[:code]) for code in range(len(STATUSES))]
+
+    @classmethod
+    def open(cls, file_name: str, db: str) -> "TaskSnapshot | None":
+        # Returns None when there is no valid snapshot or the database has
+        # changed since it was written.
+        try:
+            snapshot = cls(file_name)
+        except (FileNotFoundError, ValueError, struct.error):
+            return None
+
+        if snapshot.fingerprint.rstrip(b"\x00") != fingerprint(db).rstrip(b"\x00"):
+            snapshot.close()
+            return None
+
+        return snapshot
+
+    def close(self):
+        self._map.close()
+
+    def __record(self, index: int) -> tuple:
+        return RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+
+    def __task(self, record: tuple, status: Status) -> Task:
+        id, due_day, created, updated, offset, length = record
+        start = self._heap + offset
+        task = object.__new__(Task)
+        task.id = id
+        task.status = status
+        task.description = str(self._map[start : start + length], "utf-8")
+        task.due_date = date.fromordinal(EPOCH_DAY + due_day) if due_day != MISSING_VALUE else None
+        task.created_at = EPOCH + created * MICROSECOND
+        task.updated_at = EPOCH + updated * MICROSECOND if updated != MISSING_VALUE else None
+        return task
+
+    def __first_after(self, code: int, after: int) -> int:
+        # Binary search for the first task of the group after the given id.
+        low = self._starts[code]
+        high = low + self._counts[code]
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if ID.unpack_from(self._map, HEADER.size + middle * RECORD.size)[0] <= after:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def __group(self, code: int, after: int, page_size: int) -> Iterator[tuple[tuple, int]]:
+        low = self.__first_after(code, after)
+        end = self._starts[code] + self._counts[code]
+
+        # Records are decoded a page at a time; tuples compare by id first.
+        for start in range(low, end, page_size):
+            offset = HEADER.size + start * RECORD.size
+            page = self._map[offset : offset + min(page_size, end - start) * RECORD.size]
+
+            for record in RECORD.iter_unpack(page):
+                yield record, code
+
+    def size(self) -> int:
+        return sum(self._counts)
+
+    def find_by_id(self, id: int) -> Task | None:
+        for code in range(len(STATUSES)):
+            index = self.__first_after(code, id - 1)
+
+            if index < self._starts[code] + self._counts[code]:
+                record = self.__record(index)
+
+                if record[0] == id:
+                    return self.__task(record, STATUSES[code])
+
+        return None
+
+    def iter_by_status(
+        self,
+        status: list[Status] | None = None,
+        after: int = 0,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]:
+        codes = sorted({STATUS_CODES[s] for s in (STATUSES if status is None else status)})
+        groups = [self.__group(code, after, page_size) for code in codes]
+        entries = groups[0] if len(groups) == 1 else heapq.merge(*groups)
+
+        for record, code in islice(entries, limit):
+            yield self.__task(record, STATUSES[code])
+
+    def iter_by_due_date(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        status: list[Status] | None = None,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]:
+        # The due date tables only hold dates, so the records are scanned.
+        low = start.toordinal() - EPOCH_DAY if start else MISSING_VALUE + 1
+        high = end.toordinal() - EPOCH_DAY if end else 2**31
+        matches = sorted(
+            (record[1], STATUSES[code].value, record[0], record, code)
+            for code in sorted({STATUS_CODES[s] for s in (STATUSES if status is None else status)})
+            for record, _ in self.__group(code, 0, page_size)
+            if low <= record[1] < high
+        )
+
+        for *_, record, code in matches[:limit]:
+            yield self.__task(record, STATUSES[code])
+
+    def counts(self, today: date | None = None) -> TaskCounts:
+        day = (today or date.today()).toordinal() - EPOCH_DAY
+        overdue = 0
+
+        # Binary search for the number of due dates before today.
+        for status in OPEN_STATUSES:
+            start = low = self._due_starts[STATUS_CODES[status]]
+            high = low + self._due_counts[STATUS_CODES[status]]
+
+            while low < high:
+                middle = (low + high) // 2
+
+                if DUE.unpack_from(self._map, self._due + middle * DUE.size)[0] < day:
+                    low = middle + 1
+                else:
+                    high = middle
+
+            overdue += low - start
+
+        oldest = None
+
+        if self._oldest >= 0:
+            code = next(
+                code
+                for code, start in reversed(list(enumerate(self._starts)))
+                if start <= self._oldest
+            )
+            oldest = self.__task(self.__record(self._oldest), STATUSES[code])
+
+        return TaskCounts(
+            by_status=dict(zip(STATUSES, self._counts)),
+            overdue=overdue,
+            oldest_open=oldest,
+        )
+
+
+if __name__ == "__main__":
+    rebuild_snapshot(*sys.argv[1:4])
@@ -0,0 +1,149 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from datetime import date, timedelta
+from task_cli.model import (
+    OPEN_STATUSES,
+    CreateTask,
+    Status,
+    Task,
+    TaskCounts,
+    TaskSelection,
+    UpdateTask,
+)
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+class TaskReader(ABC):
+    # Read side of TaskStore, also implemented by read-only copies of the
+    # tasks. Lists are returned in id order unless stated otherwise.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @abstractmethod
+    def close(self): ...
+
+    @abstractmethod
+    def find_by_id(self, id: int) -> Task | None: ...
+
+    def find_by_status(self, status: list[Status] | None = None) -> list[Task]:
+        return list(self.iter_by_status(status))
+
+    @abstractmethod
+    def iter_by_status(
+        self,
+        status: list[Status] | None = None,
+        after: int = 0,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]: ...
+
+    # Tasks with a due date in [start, end), ordered by due date, status and id.
+    @abstractmethod
+    def iter_by_due_date(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        status: list[Status] | None = None,
+        limit: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Task]: ...
+
+    def overdue(self, today: date | None = None, limit: int | None = None) -> Iterator[Task]:
+        return self.iter_by_due_date(
+            end=today or date.today(), status=list(OPEN_STATUSES), limit=limit
+        )
+
+    def upcoming(
+        self, days: int = 7, today: date | None = None, limit: int | None = None
+    ) -> Iterator[Task]:
+        today = today or date.today()
+
+        return self.iter_by_due_date(
+            today, today + timedelta(days=days + 1), list(OPEN_STATUSES), limit
+        )
+
+    @abstractmethod
+    def size(self) -> int: ...
+
+    @abstractmethod
+    def counts(self, today: date | None = None) -> TaskCounts: ...
+
+
+class TaskStore(TaskReader):
+    # Storage interface the commands depend on. Ids are assigned by the store
+    # and never reused.
+    @abstractmethod
+    def flush(self): ...
+
+    @abstractmethod
+    def add(self, task: CreateTask) -> Task | None: ...
+
+    @abstractmethod
+    def add_many(self, tasks: Iterable[CreateTask]) -> int: ...
+
+    def update(self, task: Task, data: UpdateTask) -> Task | None:
+        return self.update_by_id(task.id, data)
+
+    @abstractmethod
+    def update_by_id(
+        self,
+        id: int,
+        data: UpdateTask,
+        if_status: list[Status] | None = None,
+    ) -> Task | None: ...
+
+    @abstractmethod
+    def update_many(self, updates: Iterable[tuple[int, UpdateTask]]) -> int: ...
+
+    # Stores that can select tasks in their query language override the
+    # *_matching methods with single statements; these defaults select the
+    # tasks first and write them with update_many or delete_many.
+    def iter_matching(
+        self, selection: TaskSelection, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        tasks = self.iter_by_status(selection.status, page_size=page_size)
+        return (task for task in tasks if selection.matches(task))
+
+    def update_matching(self, selection: TaskSelection, data: UpdateTask) -> int:
+        ids = [task.id for task in self.iter_matching(selection)]
+        return self.update_many((id, data) for id in ids) if ids else 0
+
+    # Yields the updated tasks.
+    def iter_update_matching(
+        self, selection: TaskSelection, data: UpdateTask, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        ids = [task.id for task in self.iter_matching(selection, page_size)]
+
+        if ids:
+            self.update_many((id, data) for id in ids)
+
+        for id in ids:
+            task = self.find_by_id(id)
+
+            if task is not None:
+                yield task
+
+    @abstractmethod
+    def delete_by_id(self, id: int) -> bool: ...
+
+    @abstractmethod
+    def delete_many(self, ids: Iterable[int]) -> int: ...
+
+    def delete_matching(self, selection: TaskSelection) -> int:
+        ids = [task.id for task in self.iter_matching(selection)]
+        return self.delete_many(ids) if ids else 0
+
+    # Yields the deleted tasks as they were before the delete.
+    def iter_delete_matching(
+        self, selection: TaskSelection, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Task]:
+        tasks = list(self.iter_matching(selection, page_size))
+
+        if tasks:
+            self.delete_many(task.id for task in tasks)
+
+        yield from tasks
@@ -1,11 +1,51 @@
-from task_cli.cli import create_parser, process_command
-from task_cli.database import init_db
+import sys
+from task_cli import instrumentation
+from task_cli.client import forward
+from task_cli.options import find_command, storage_options
+
+# serve must not be forwarded to a server, and batch reads this process's stdin.
+LOCAL_COMMANDS = ("serve", "batch")
+# The server only serves an SQLite database without shards.
+SERVED_STORAGE = ("sqlite", "1")
+
+
+def forwardable(argv: list[str]) -> bool:
+    return find_command(argv) not in LOCAL_COMMANDS and storage_options(argv) == SERVED_STORAGE
 
 
 def main():
-    init_db()
-    parser = create_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    trace = instrumentation.trace_target(argv)
+
+    if trace:
+        instrumentation.enable(trace)
+    elif forwardable(argv):
+        response = forward(argv)
+
+        if response is not None:
+            sys.stdout.write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+
+            if response["code"]:
+                sys.exit(response["code"])
+
+            return
+
+    try:
+        run(argv)
+    finally:
+        instrumentation.finish()
+
+
+def run(argv: list[str]):
+    # The CLI, argparse and sqlite3 are only needed when running in-process.
+    with instrumentation.span("import"):
+        from task_cli.cli import create_parser, process_command
+
+    with instrumentation.span("parse"):
+        parser = create_parser(find_command(argv))
+        args = parser.parse_args(argv)
+
     process_command(args)
 
 
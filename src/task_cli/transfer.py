@@ -0,0 +1,96 @@
+import csv
+import json
+from datetime import date
+from collections.abc import Iterable, Iterator
+from typing import IO
+from task_cli.model import TASK_FIELD_NAMES, CreateTask, Status, Task, to_record
+from task_cli.repository import TaskRepository
+from task_cli.utils import chunked, encode, serialize
+
+FORMATS = ("jsonl", "csv")
+EXPORT_FIELDS = TASK_FIELD_NAMES
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def detect_format(file_name: str) -> str:
+    _, _, extension = file_name.rpartition(".")
+    extension = extension.lower()
+
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+
+    if extension == "csv":
+        return "csv"
+
+    raise ValueError(f"Cannot detect format of '{file_name}'.")
+
+
+def to_create_task(record: dict) -> CreateTask:
+    due_date = record.get("due_date")
+
+    return CreateTask(
+        status=Status(record.get("status") or Status.TODO.value),
+        description=record["description"],
+        due_date=date.fromisoformat(due_date) if due_date else None,
+    )
+
+
+def read_records(file: IO[str], format: str) -> Iterator[dict]:
+    if format == "csv":
+        yield from csv.DictReader(file)
+        return
+
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def write_tasks(file: IO[str], tasks: Iterable[Task], format: str, chunk_size: int) -> int:
+    count = 0
+    writer = csv.writer(file) if format == "csv" else None
+
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
+
+    for chunk in chunked(map(to_record, tasks), chunk_size):
+        if writer:
+            writer.writerows(
+                ["" if value is None else encode(value) for value in record.values()]
+                for record in chunk
+            )
+        else:
+            file.write("".join(serialize(record, indent=None) + "\n" for record in chunk))
+
+        count += len(chunk)
+
+    return count
+
+
+def import_tasks(
+    repository: TaskRepository,
+    file_name: str,
+    format: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    format = format or detect_format(file_name)
+    count = 0
+
+    with open(file_name, newline="", encoding="utf-8") as file:
+        tasks = map(to_create_task, read_records(file, format))
+
+        for chunk in chunked(tasks, chunk_size):
+            count += repository.import_many(chunk)
+
+    return count
+
+
+def export_tasks(
+    repository: TaskRepository,
+    file_name: str,
+    format: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    format = format or detect_format(file_name)
+
+    with open(file_name, "w", newline="", encoding="utf-8") as file:
+        return write_tasks(file, repository.iter_by_status(page_size=chunk_size), format, chunk_size)
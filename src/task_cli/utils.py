@@ -1,11 +1,21 @@
-import json
-from typing import Any
+from enum import Enum
+from itertools import islice
+from collections.abc import Iterable, Iterator
+from datetime import date
 from dataclasses import is_dataclass, asdict
 from functools import singledispatch
 
 
+# Built-in types are handled inline: registering them would make singledispatch
+# import typing, which is noticeable at CLI startup.
 @singledispatch
-def encode(value: Any) -> Any:
+def encode(value: object) -> object:
+    if isinstance(value, Enum):
+        return value.value
+
+    if isinstance(value, date):
+        return value.isoformat()
+
     if is_dataclass(value):
         if not isinstance(value, type):
             return asdict(value)
@@ -13,5 +23,14 @@ def encode(value: Any) -> Any:
     return value
 
 
-def serialize(value: Any) -> str:
-    return json.dumps(value, default=encode, indent=4)
+def serialize(value: object, indent: int | None = 4) -> str:
+    import json
+
+    return json.dumps(value, default=encode, indent=indent)
+
+
+def chunked(values: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(values)
+
+    while chunk := list(islice(iterator, size)):
+        yield chunk
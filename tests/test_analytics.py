@@ -0,0 +1,79 @@
+import unittest
+from datetime import date
+from os import path, remove
+from task_cli.analytics import build_report, load_snapshot, to_epoch_day
+from task_cli.database import init_db
+from task_cli.model import Status
+from task_cli.repository import TaskRepository
+
+
+class TestAnalytics(unittest.TestCase):
+    db_name = "tests/data_testrun.db"
+    today = date(2025, 5, 20)
+
+    def setUp(self):
+        init_db(self.db_name)
+        self.repo = TaskRepository(self.db_name)
+
+        with self.repo.transaction() as connection:
+            connection.executemany(
+                """
+                INSERT INTO tasks (description, status, due_date, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    ("Task #1", "todo", "2025-05-01", "2025-05-20 08:00:00", None),
+                    ("Task #2", "todo", None, "2025-05-15 23:59:59", None),
+                    ("Task #3", "in-progress", "2025-06-01", "2024-01-01 00:00:00", "2025-05-19 10:00:00"),
+                    ("Task #4", "done", "2025-05-01", "2025-05-18 12:00:00", "2025-05-19 09:00:00"),
+                    ("Task #5", "done", None, "2025-05-19 12:00:00", "2025-05-20 09:00:00"),
+                ],
+            )
+
+    def tearDown(self):
+        self.repo.close()
+
+        if path.exists(self.db_name):
+            remove(self.db_name)
+
+    def test_snapshot_columns(self):
+        snapshot = load_snapshot(self.repo, self.today, page_size=2)
+
+        self.assertEqual(list(snapshot.ids), [1, 2, 3, 4, 5])
+        self.assertEqual(list(snapshot.statuses), [0, 0, 1, 2, 2])
+        self.assertEqual(snapshot.created[1], to_epoch_day(date(2025, 5, 15)))
+        self.assertEqual(snapshot.today, to_epoch_day(self.today))
+        self.assertEqual(
+            snapshot.status_counts(), {Status.TODO: 2, Status.IN_PROGRESS: 1, Status.DONE: 2}
+        )
+
+    def test_report(self):
+        report = build_report(load_snapshot(self.repo, self.today), days=3)
+
+        self.assertEqual(report["total"], 5)
+        self.assertEqual(report["completion_rate"], 0.4)
+        self.assertEqual(report["overdue"], 1, "Only open tasks can be overdue.")
+        self.assertEqual(
+            report["open_age"],
+            {"0d": 1, "1d": 0, "2-7d": 1, "8-30d": 0, "31-90d": 0, "91-365d": 0, ">365d": 1},
+        )
+        self.assertEqual(
+            report["per_day"],
+            [
+                {"date": "2025-05-18", "created": 1, "completed": 0},
+                {"date": "2025-05-19", "created": 1, "completed": 1},
+                {"date": "2025-05-20", "created": 1, "completed": 1},
+            ],
+        )
+
+    def test_empty_report(self):
+        with self.repo.transaction() as connection:
+            connection.execute("DELETE FROM tasks")
+
+        report = build_report(load_snapshot(self.repo, self.today), days=1)
+        self.assertEqual(report["total"], 0)
+        self.assertEqual(report["completion_rate"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
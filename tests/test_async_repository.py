@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+from os import path, remove
+from task_cli.async_repository import AsyncTaskRepository
+from task_cli.database import init_db
+from task_cli.model import CreateTask, Status, UpdateTask
+
+
+class TestAsyncTaskRepository(unittest.IsolatedAsyncioTestCase):
+    db_name = "tests/data_testrun.db"
+
+    async def asyncSetUp(self):
+        init_db(self.db_name)
+        self.repo = AsyncTaskRepository(self.db_name, readers=2, max_batch=16)
+
+    async def asyncTearDown(self):
+        await self.repo.close()
+
+        for suffix in ("", "-wal", "-shm"):
+            if path.exists(self.db_name + suffix):
+                remove(self.db_name + suffix)
+
+    async def test_concurrent_writes(self):
+        tasks = await asyncio.gather(
+            *(
+                self.repo.add(CreateTask(status=Status.TODO, description=f"Task #{index}"))
+                for index in range(100)
+            )
+        )
+
+        self.assertEqual(len({task.id for task in tasks if task}), 100)
+        self.assertEqual(await self.repo.size(), 100)
+
+    async def test_read_update_delete(self):
+        task = await self.repo.add(CreateTask(status=Status.TODO, description="Task #1"))
+
+        if task is None:
+            self.fail("Could not create new task.")
+
+        self.assertTrue(await self.repo.update(task, UpdateTask(status=Status.DONE)))
+        self.assertEqual(len(await self.repo.find_by_status([Status.DONE])), 1)
+        self.assertEqual(getattr(await self.repo.find_by_id(task.id), "status"), Status.DONE)
+        self.assertTrue(await self.repo.delete_by_id(task.id))
+        self.assertIsNone(await self.repo.find_by_id(task.id))
+
+    async def test_failed_mutation_does_not_affect_batch(self):
+        class BrokenTask(CreateTask):
+            @property
+            def status(self):
+                raise RuntimeError("Broken task.")
+
+            @status.setter
+            def status(self, value):
+                pass
+
+        results = await asyncio.gather(
+            self.repo.add(CreateTask(status=Status.TODO, description="Task #1")),
+            self.repo.add(BrokenTask(status=Status.TODO, description="Task #2")),
+            self.repo.add(CreateTask(status=Status.TODO, description="Task #3")),
+            return_exceptions=True,
+        )
+
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(await self.repo.size(), 2)
+
+    async def test_close_flushes_pending_writes(self):
+        pending = asyncio.ensure_future(
+            self.repo.add(CreateTask(status=Status.TODO, description="Task #1"))
+        )
+        await asyncio.sleep(0)
+        await self.repo.close()
+
+        self.assertIsNotNone(await pending)
+        self.repo = AsyncTaskRepository(self.db_name)
+        self.assertEqual(await self.repo.size(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import io
+import json
+import shlex
+import unittest
+from os import path, remove
+from task_cli.batch import run_batch, split_line
+from task_cli.database import init_db
+from task_cli.model import Status
+from task_cli.repository import TaskRepository
+
+
+class TestBatch(unittest.TestCase):
+    db_name = "tests/data_testrun.db"
+
+    def setUp(self):
+        init_db(self.db_name)
+        self.repo = TaskRepository(self.db_name)
+
+    def tearDown(self):
+        self.repo.close()
+
+        if path.exists(self.db_name):
+            remove(self.db_name)
+
+    def run_lines(self, lines, chunk_size=2):
+        output = io.StringIO()
+        counts = run_batch(self.repo, lines, output, chunk_size)
+        return counts, [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_commands(self):
+        counts, results = self.run_lines(
+            [
+                'add "Task #1"\n',
+                "add Task\n",
+                "\n",
+                "# comment\n",
+                "mark-in-progress 1\n",
+                "due 2 2025-05-20\n",
+                'update 2 "Task #2"\n',
+                "delete 1\n",
+            ]
+        )
+
+        self.assertEqual(counts, (6, 0))
+        self.assertEqual([result["line"] for result in results], [1, 2, 5, 6, 7, 8])
+        self.assertEqual(results[2]["task"]["status"], "in-progress")
+        self.assertEqual(results[3]["task"]["due_date"], "2025-05-20")
+        self.assertEqual(results[5], {"line": 8, "ok": True, "id": 1})
+
+        tasks = self.repo.find_by_status()
+        self.assertEqual([(task.id, task.description) for task in tasks], [(2, "Task #2")])
+        self.assertEqual(tasks[0].status, Status.TODO)
+
+    def test_failures_do_not_undo_chunk(self):
+        counts, results = self.run_lines(
+            [
+                "add First",
+                "due 1 tomorrow",
+                "delete x",
+                "mark-later 1",
+                "update 5 Missing",
+                "add",
+                "frobnicate",
+                'add "Unterminated',
+                "add Last",
+            ],
+            chunk_size=4,
+        )
+
+        self.assertEqual(counts, (2, 7))
+        self.assertEqual([result["ok"] for result in results], [True, *[False] * 7, True])
+        self.assertEqual(results[5]["error"], "Usage: add <description>")
+        self.assertEqual(self.repo.size(), 2)
+
+    def test_selections(self):
+        self.run_lines([f"add 'Task #{index}'" for index in range(1, 7)])
+        counts, results = self.run_lines(
+            [
+                "mark-done 1-3",
+                "mark-in-progress 4 6 --status todo",
+                "delete 2-3 5",
+                "delete --status=done --due-before 2025-01-01",
+                "mark-done 1-x",
+                "delete --status later",
+                "mark-done --status",
+            ]
+        )
+
+        self.assertEqual(counts, (4, 3))
+        self.assertEqual([task["id"] for task in results[0]["tasks"]], [1, 2, 3])
+        self.assertEqual([task["status"] for task in results[1]["tasks"]], ["in-progress"] * 2)
+        self.assertEqual(results[2]["ids"], [2, 3, 5])
+        self.assertEqual(results[3]["ids"], [])
+        self.assertEqual(results[4]["error"], "Invalid id or range: '1-x'.")
+        self.assertEqual(results[5]["error"], "Invalid status 'later'.")
+        self.assertEqual(results[6]["error"], "Option --status needs a value.")
+
+        tasks = self.repo.find_by_status()
+        self.assertEqual(
+            [(task.id, task.status) for task in tasks],
+            [(1, Status.DONE), (4, Status.IN_PROGRESS), (6, Status.IN_PROGRESS)],
+        )
+
+    def test_split_line(self):
+        for line in ("add Task", "update 1 'Task #1'", 'add "A \\"quoted\\" task"', "mark-done  3 "):
+            self.assertEqual(split_line(line), shlex.split(line))
+
+
+if __name__ == "__main__":
+    unittest.main()
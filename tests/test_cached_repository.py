@@ -0,0 +1,181 @@
+import sqlite3
+import threading
+import unittest
+from unittest.mock import patch
+from contextlib import closing
+from os import path, remove
+from task_cli.cached_repository import CachedTaskRepository
+from task_cli.database import init_db
+from task_cli.model import CreateTask, Status, TaskSelection, UpdateTask
+from task_cli.repository import TaskRepository
+
+
+class TestCachedTaskRepository(unittest.TestCase):
+    db_name = "tests/data_testrun.db"
+
+    def setUp(self):
+        init_db(self.db_name)
+        self.repo = CachedTaskRepository(self.db_name, cache_size=8)
+
+        for index, status in enumerate(Status, 1):
+            self.repo.add(CreateTask(status=status, description=f"Task #{index}"))
+
+    def tearDown(self):
+        self.repo.close()
+
+        if path.exists(self.db_name):
+            remove(self.db_name)
+
+    def test_find_by_id_hits_cache(self):
+        first = self.repo.find_by_id(1)
+        second = self.repo.find_by_id(1)
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertIsNone(self.repo.find_by_id(100))
+        self.assertEqual(self.repo.stats.misses, 1)
+        self.assertEqual(self.repo.stats.hits, 2)
+
+    def test_status_query_invalidated_by_writes(self):
+        self.assertEqual([task.id for task in self.repo.find_by_status([Status.TODO])], [1])
+        self.assertEqual(len(self.repo.find_by_status([Status.DONE])), 1)
+
+        self.repo.update_by_id(2, UpdateTask(status=Status.TODO))
+        self.assertEqual([task.id for task in self.repo.find_by_status([Status.TODO])], [1, 2])
+
+        hits = self.repo.stats.hits
+        self.assertEqual(len(self.repo.find_by_status([Status.DONE])), 1)
+        self.assertEqual(self.repo.stats.hits, hits + 1)
+
+        self.repo.add(CreateTask(status=Status.DONE, description="Task #4"))
+        self.assertEqual(len(self.repo.find_by_status([Status.DONE])), 2)
+
+        self.repo.delete_by_id(1)
+        self.assertIsNone(self.repo.find_by_id(1))
+        self.assertEqual([task.id for task in self.repo.find_by_status([Status.TODO])], [2])
+
+    def test_update_refreshes_cached_task(self):
+        self.repo.find_by_id(1)
+        self.repo.update_by_id(1, UpdateTask(description="Renamed"))
+
+        self.assertEqual(self.repo.find_by_id(1).description, "Renamed")
+
+    def test_matching_writes_refresh_cache(self):
+        self.repo.find_by_id(1)
+        self.repo.find_by_id(2)
+        self.assertEqual(len(self.repo.find_by_status([Status.DONE])), 1)
+
+        done = UpdateTask(status=Status.DONE)
+        self.assertEqual(self.repo.update_matching(TaskSelection(ids=[1]), done), 1)
+        self.assertEqual(self.repo.find_by_id(1).status, Status.DONE)
+        self.assertEqual(len(self.repo.find_by_status([Status.DONE])), 2)
+
+        renamed = UpdateTask(description="Renamed")
+        updated = list(self.repo.iter_update_matching(TaskSelection(ranges=[(1, 2)]), renamed))
+        self.assertEqual([task.id for task in updated], [1, 2])
+        self.assertEqual(self.repo.find_by_id(2).description, "Renamed")
+
+        self.assertEqual(self.repo.delete_matching(TaskSelection(ids=[1])), 1)
+        self.assertIsNone(self.repo.find_by_id(1))
+        self.assertEqual(len(list(self.repo.iter_delete_matching(TaskSelection(ids=[2])))), 1)
+        self.assertIsNone(self.repo.find_by_id(2))
+        self.assertEqual([task.id for task in self.repo.find_by_status()], [3])
+
+    def test_iter_matching_refreshes_cached_tasks(self):
+        repo = CachedTaskRepository(self.db_name, check_interval=60)
+        repo.find_by_id(1)
+
+        with closing(sqlite3.connect(self.db_name)) as connection, connection:
+            connection.execute("UPDATE tasks SET description = 'Changed' WHERE id = 1")
+
+        tasks = list(repo.iter_matching(TaskSelection(status=[Status.TODO])))
+        self.assertEqual([task.description for task in tasks], ["Changed"])
+        self.assertEqual(repo.find_by_id(1).description, "Changed")
+        repo.close()
+
+    def test_returned_tasks_are_copies(self):
+        self.repo.find_by_id(1).description = "Changed"
+        self.repo.find_by_status()[1].description = "Changed"
+
+        self.assertEqual(self.repo.find_by_id(1).description, "Task #1")
+        self.assertEqual(self.repo.find_by_status()[1].description, "Task #2")
+
+    def test_rollback_drops_cache_writes(self):
+        self.repo.find_by_id(1)
+        self.assertEqual(len(self.repo.find_by_status([Status.TODO])), 1)
+
+        with self.assertRaises(RuntimeError):
+            with self.repo.transaction():
+                self.repo.add(CreateTask(status=Status.TODO, description="Task #4"))
+                self.repo.update_by_id(1, UpdateTask(description="Renamed"))
+                self.assertEqual(self.repo.find_by_id(1).description, "Renamed")
+                raise RuntimeError
+
+        self.assertIsNone(self.repo.find_by_id(4))
+        self.assertEqual(self.repo.find_by_id(1).description, "Task #1")
+        self.assertEqual(len(self.repo.find_by_status([Status.TODO])), 1)
+
+    def test_commit_applies_cache_writes(self):
+        with self.repo.transaction():
+            self.repo.add(CreateTask(status=Status.TODO, description="Task #4"))
+            self.assertNotIn(("id", 4), self.repo.cache.entries, "Cache written before commit.")
+
+        self.assertEqual(self.repo.find_by_id(4).description, "Task #4")
+        self.assertEqual(self.repo.stats.hits, 1)
+
+    def test_eviction(self):
+        repo = CachedTaskRepository(self.db_name, cache_size=2)
+
+        for id in (1, 2, 3, 1):
+            repo.find_by_id(id)
+
+        self.assertEqual(repo.stats.evictions, 2)
+        self.assertEqual(len(repo.cache), 2)
+        repo.close()
+
+    def test_change_from_other_connection(self):
+        self.assertEqual(self.repo.find_by_id(1).description, "Task #1")
+
+        with closing(sqlite3.connect(self.db_name)) as connection, connection:
+            connection.execute("UPDATE tasks SET description = 'Changed' WHERE id = 1")
+
+        self.assertEqual(self.repo.find_by_id(1).description, "Changed")
+        self.assertGreater(self.repo.stats.invalidations, 0)
+
+    def test_check_interval_defers_data_version(self):
+        repo = CachedTaskRepository(self.db_name, check_interval=60)
+        self.assertEqual(repo.find_by_id(1).description, "Task #1")
+
+        with closing(sqlite3.connect(self.db_name)) as connection, connection:
+            connection.execute("UPDATE tasks SET description = 'Changed' WHERE id = 1")
+
+        self.assertEqual(repo.find_by_id(1).description, "Task #1")
+        repo.close()
+
+    def test_read_racing_a_write_is_not_cached(self):
+        read = threading.Event()
+        written = threading.Event()
+        find_by_id = TaskRepository.find_by_id
+
+        def slow_find_by_id(repository, id):
+            task = find_by_id(repository, id)
+
+            if threading.current_thread() is not threading.main_thread():
+                read.set()
+                written.wait(5)
+
+            return task
+
+        with patch.object(TaskRepository, "find_by_id", slow_find_by_id):
+            reader = threading.Thread(target=self.repo.find_by_id, args=(1,))
+            reader.start()
+            read.wait(5)
+            self.repo.update_by_id(1, UpdateTask(status=Status.DONE))
+            written.set()
+            reader.join()
+
+        self.assertEqual(self.repo.find_by_id(1).status, Status.DONE)
+
+
+if __name__ == "__main__":
+    unittest.main()
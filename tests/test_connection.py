@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from os import path, remove
+from task_cli.connection import ConnectionPool
+from task_cli.database import init_db
+from task_cli.model import CreateTask, Status
+from task_cli.repository import TaskRepository
+
+
+class TestConnectionPool(unittest.TestCase):
+    db_name = "tests/data_testrun.db"
+
+    def setUp(self):
+        init_db(self.db_name)
+
+    def tearDown(self):
+        if path.exists(self.db_name):
+            remove(self.db_name)
+
+    def test_reuses_connection_per_thread(self):
+        with ConnectionPool(self.db_name) as pool:
+            self.assertIs(pool.acquire(), pool.acquire())
+
+    def test_threads_get_own_connections(self):
+        connections = []
+
+        with ConnectionPool(self.db_name) as pool:
+            worker = threading.Thread(target=lambda: connections.append(pool.acquire()))
+            worker.start()
+            worker.join()
+
+            self.assertIsNot(connections[0], pool.acquire())
+
+    def test_release_returns_connection_to_pool(self):
+        with ConnectionPool(self.db_name, size=1) as pool:
+            connection = pool.acquire()
+            pool.release()
+            self.assertIs(pool.acquire(), connection)
+
+    def test_reclaims_connection_of_finished_thread(self):
+        connections = []
+
+        with ConnectionPool(self.db_name, size=1) as pool:
+            worker = threading.Thread(target=lambda: connections.append(pool.acquire()))
+            worker.start()
+            worker.join()
+
+            self.assertIs(pool.acquire(), connections[0])
+
+    def test_more_threads_than_pool_size(self):
+        with TaskRepository(self.db_name) as repo:
+            repo.add(CreateTask(status=Status.TODO, description="Task #1"))
+            repo.pool.size = 2
+
+            with ThreadPoolExecutor(8) as executor:
+                barrier = threading.Barrier(8)
+
+                def size(_):
+                    barrier.wait()
+                    return repo.size()
+
+                self.assertEqual(list(executor.map(size, range(8))), [1] * 8)
+
+    def test_keeps_at_most_size_idle_connections(self):
+        with ConnectionPool(self.db_name, size=1) as pool:
+            worker = threading.Thread(target=lambda: (pool.acquire(), pool.release()))
+            pool.acquire()
+            worker.start()
+            worker.join()
+            connection = pool.acquire()
+            pool.release()
+
+            self.assertEqual(len(pool._idle), 1)
+            self.assertIsNot(pool._idle[0], connection)
+
+    def test_close(self):
+        pool = ConnectionPool(self.db_name)
+        connection = pool.acquire()
+        pool.close()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            pool.acquire()
+
+    def test_repository_context_manager(self):
+        with TaskRepository(self.db_name) as repo:
+            repo.add(CreateTask(status=Status.TODO, description="Task #1"))
+            self.assertEqual(repo.size(), 1)
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            repo.size()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,127 @@
+import sqlite3
+import subprocess
+import sys
 import unittest
+from contextlib import closing
 from os import path, remove
-from task_cli.database import init_db
+from task_cli.connection import ConnectionPool
+from task_cli.database import (
+    SCHEMA_VERSION,
+    durability_pragmas,
+    init_db,
+    migrate,
+    schema_version,
+)
 
 
 class TestDatabase(unittest.TestCase):
     db_name = "tests/data_testrun.db"
 
     def tearDown(self):
-        if path.exists(self.db_name):
-            remove(self.db_name)
+        for suffix in ("", "-wal", "-shm"):
+            if path.exists(self.db_name + suffix):
+                remove(self.db_name + suffix)
 
     def test_init(self):
         init_db(self.db_name)
         self.assertTrue(path.exists(self.db_name), "File does not exist.")
+
+    def test_init_sets_schema_version(self):
+        self.assertEqual(init_db(self.db_name), SCHEMA_VERSION)
+        self.assertEqual(init_db(self.db_name), SCHEMA_VERSION)
+
+    def test_migrate_legacy_database(self):
+        with closing(sqlite3.connect(self.db_name)) as connection:
+            migrate(connection, target=1)
+            connection.execute("PRAGMA user_version = 0")
+            connection.execute(
+                "INSERT INTO tasks (description, status) VALUES ('Task #1', 'todo')"
+            )
+            connection.commit()
+
+            self.assertEqual(migrate(connection), SCHEMA_VERSION)
+            self.assertEqual(schema_version(connection), SCHEMA_VERSION)
+            self.assertEqual(
+                connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0], 1
+            )
+            self.assertEqual(
+                connection.execute("SELECT status, count FROM task_counts").fetchall(),
+                [("todo", 1)],
+            )
+            self.assertEqual(
+                connection.execute("SELECT seq, op, task_id FROM task_changes").fetchall(),
+                [(1, "insert", 1)],
+            )
+
+    def test_rerun_step_keeps_journal(self):
+        with closing(sqlite3.connect(self.db_name)) as connection:
+            migrate(connection, target=5)
+            connection.execute("INSERT INTO tasks (description, status) VALUES ('Task #1', 'todo')")
+            connection.commit()
+            migrate(connection)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION - 1}")
+
+            self.assertEqual(migrate(connection), SCHEMA_VERSION)
+            self.assertEqual(
+                connection.execute("SELECT COUNT(*) FROM task_changes").fetchone()[0], 1
+            )
+
+    def test_concurrent_migrations_apply_steps_once(self):
+        with closing(sqlite3.connect(self.db_name)) as connection:
+            migrate(connection, target=5)
+            connection.executemany(
+                "INSERT INTO tasks (description, status) VALUES (?, 'todo')",
+                ((f"Task #{index}",) for index in range(2000)),
+            )
+            connection.commit()
+
+        code = (
+            "import sqlite3, sys; from task_cli.database import migrate; "
+            "migrate(sqlite3.connect(sys.argv[1], timeout=30))"
+        )
+        processes = [
+            subprocess.Popen([sys.executable, "-c", code, self.db_name]) for _ in range(3)
+        ]
+
+        for process in processes:
+            self.assertEqual(process.wait(), 0)
+
+        with closing(sqlite3.connect(self.db_name)) as connection:
+            self.assertEqual(
+                connection.execute("SELECT COUNT(*) FROM task_changes").fetchone()[0], 2000
+            )
+
+    def test_indexes(self):
+        init_db(self.db_name)
+
+        with closing(sqlite3.connect(self.db_name)) as connection:
+            indexes = {
+                row[0]
+                for row in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks'"
+                )
+            }
+
+            plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE status = 'todo'"
+            ).fetchall()
+
+        self.assertTrue(
+            {"idx_tasks_status", "idx_tasks_due_date_status", "idx_tasks_status_due_date"}
+            <= indexes
+        )
+        self.assertIn("USING INDEX", plan[0][-1])
+
+    def test_durability_profiles(self):
+        init_db(self.db_name)
+
+        with ConnectionPool(self.db_name, pragmas=durability_pragmas("fast")) as pool:
+            connection = pool.acquire()
+            journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = connection.execute("PRAGMA synchronous").fetchone()[0]
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 0)
+
+        with self.assertRaises(ValueError):
+            durability_pragmas("unsafe")
@@ -0,0 +1,83 @@
+import io
+import json
+import sqlite3
+import unittest
+from os import path, remove
+from task_cli import instrumentation
+from task_cli.database import init_db
+from task_cli.model import CreateTask, Status
+from task_cli.render import render_tasks
+from task_cli.repository import TaskRepository
+
+
+class TestInstrumentation(unittest.TestCase):
+    db_name = "tests/data_testrun.db"
+    trace_name = "tests/data_testrun.json"
+    profile_name = "tests/data_testrun.prof"
+
+    def setUp(self):
+        init_db(self.db_name)
+
+    def tearDown(self):
+        instrumentation.finish(io.StringIO())
+
+        for file_name in (self.db_name, self.trace_name, self.profile_name):
+            if path.exists(file_name):
+                remove(file_name)
+
+    def run_commands(self):
+        with TaskRepository(self.db_name) as repository:
+            repository.add_many(
+                CreateTask(status=Status.TODO, description=f"Task #{index}") for index in range(3)
+            )
+            tasks = repository.iter_by_status([Status.TODO], page_size=2)
+            render_tasks(tasks, "tsv", io.StringIO())
+
+            return repository.pool.acquire()
+
+    def test_disabled_records_nothing(self):
+        connection = self.run_commands()
+
+        self.assertIs(type(connection), sqlite3.Connection)
+        self.assertEqual(instrumentation.events, [])
+        self.assertEqual(instrumentation.counters, {})
+
+    def test_trace_target(self):
+        self.assertEqual(instrumentation.trace_target(["--profile", "a.json", "list"]), "a.json")
+        self.assertEqual(instrumentation.trace_target(["list", "--profile=b.prof"]), "b.prof")
+
+    def test_chrome_trace(self):
+        instrumentation.enable(self.trace_name)
+        self.run_commands()
+
+        summary = io.StringIO()
+        instrumentation.finish(summary)
+
+        with open(self.trace_name, encoding="utf-8") as file:
+            events = json.load(file)["traceEvents"]
+
+        statements = [event["args"] for event in events if event["name"] == "sql"]
+        selects = [args for args in statements if args["query"].startswith("SELECT")]
+        inserts = [args for args in statements if args["query"].startswith("INSERT")]
+
+        self.assertEqual([args["rows"] for args in selects], [2, 1])
+        self.assertEqual(inserts[0]["rows"], 3)
+        self.assertEqual(
+            [event["args"]["rows"] for event in events if event["name"] == "hydrate"], [2, 1]
+        )
+        self.assertEqual(
+            [event["args"]["rows"] for event in events if event["name"] == "render"], [3]
+        )
+        self.assertIn("connections: 1", summary.getvalue())
+        self.assertFalse(instrumentation.enabled)
+
+    def test_profile_dump(self):
+        instrumentation.enable(self.profile_name)
+        self.run_commands()
+        instrumentation.finish(io.StringIO())
+
+        self.assertTrue(path.exists(self.profile_name))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import os
+import time
+import unittest
+from contextlib import redirect_stderr
+from os import path, remove
+from task_cli.cli import create_parser, dispatch_command
+from task_cli.log_store import LogStoreError, LogTaskStore
+from task_cli.model import CreateTask, Status, UpdateTask
+from task_cli.repository import GroupCommit
+
+
+class TestLogTaskStore(unittest.TestCase):
+    db_name = "tests/data_testrun.log"
+
+    def setUp(self):
+        with LogTaskStore(self.db_name) as store:
+            store.add_many(
+                CreateTask(status=Status.TODO, description=f"Task #{index}") for index in range(1, 4)
+            )
+
+    def tearDown(self):
+        for file_name in (self.db_name, self.db_name + ".compact"):
+            if path.exists(file_name):
+                remove(file_name)
+
+    def append(self, data: bytes):
+        with open(self.db_name, "ab") as file:
+            file.write(data)
+
+    def test_recovers_torn_tail(self):
+        with LogTaskStore(self.db_name) as store:
+            store.update_by_id(2, UpdateTask(status=Status.DONE))
+
+        size = path.getsize(self.db_name)
+
+        with open(self.db_name, "r+b") as file:
+            file.truncate(size - 3)
+
+        with LogTaskStore(self.db_name) as store:
+            self.assertGreater(store.recovered_bytes, 0)
+            self.assertEqual(getattr(store.find_by_id(2), "status"), Status.TODO)
+            self.assertEqual(getattr(store.add(CreateTask(Status.TODO, "Task #4")), "id"), 4)
+
+        with LogTaskStore(self.db_name) as store:
+            self.assertEqual(store.recovered_bytes, 0)
+            self.assertEqual(store.size(), 4)
+
+    def test_discards_corrupt_and_incomplete_records(self):
+        with LogTaskStore(self.db_name) as store:
+            store.delete_many([1, 2])
+
+        with open(self.db_name, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b"\xff")
+
+        with LogTaskStore(self.db_name) as store:
+            # The two deletes were one group; losing the second drops both.
+            self.assertEqual([task.id for task in store.find_by_status()], [1, 2, 3])
+
+    def test_compaction_keeps_live_tasks_and_ids(self):
+        with LogTaskStore(self.db_name) as store:
+            for _ in range(20):
+                store.update_by_id(1, UpdateTask(status=Status.IN_PROGRESS))
+
+            store.delete_by_id(3)
+            size = path.getsize(self.db_name)
+            store.compact()
+
+            self.assertLess(path.getsize(self.db_name), size)
+            self.assertEqual([task.id for task in store.find_by_status()], [1, 2])
+            self.assertEqual(getattr(store.find_by_id(1), "status"), Status.IN_PROGRESS)
+
+        with LogTaskStore(self.db_name) as store:
+            self.assertEqual(getattr(store.add(CreateTask(Status.TODO, "Task #4")), "id"), 4)
+
+    def test_single_writer(self):
+        with LogTaskStore(self.db_name):
+            with self.assertRaises(LogStoreError):
+                LogTaskStore(self.db_name)
+
+    def test_iterators_survive_remap_and_compaction(self):
+        with LogTaskStore(self.db_name) as store:
+            tasks = store.iter_by_status()
+            self.assertEqual(getattr(next(tasks), "id"), 1)
+            store.add(CreateTask(status=Status.TODO, description="Task #4"))
+            store.find_by_status()
+            self.assertEqual(getattr(next(tasks), "id"), 2)
+            store.compact()
+            self.assertEqual(getattr(next(tasks), "id"), 3)
+            self.assertEqual(len(store.find_by_status()), 4)
+
+    def test_repository_commands_are_rejected(self):
+        with LogTaskStore(self.db_name) as store, redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                dispatch_command(store, create_parser().parse_args(["stats"]))
+
+        self.assertIn("needs an SQLite database", stderr.getvalue())
+
+    def test_group_commit(self):
+        store = LogTaskStore(self.db_name, group_commit=GroupCommit(3, 60))
+        size = path.getsize(self.db_name)
+
+        store.add(CreateTask(status=Status.TODO, description="Task #4"))
+        self.assertEqual(getattr(store.find_by_id(4), "description"), "Task #4")
+        self.assertEqual(path.getsize(self.db_name), size, "Write left the open group.")
+
+        store.update_by_id(4, UpdateTask(status=Status.DONE))
+        store.delete_by_id(1)
+        self.assertGreater(path.getsize(self.db_name), size)
+
+        store.close()
+
+        with LogTaskStore(self.db_name) as store:
+            self.assertEqual([task.id for task in store.find_by_status([Status.DONE])], [4])
+
+
+    def test_group_commit_after_delay_without_writes(self):
+        with LogTaskStore(self.db_name, group_commit=GroupCommit(100, 0.1)) as store:
+            size = path.getsize(self.db_name)
+            store.add(CreateTask(status=Status.TODO, description="Task #4"))
+            time.sleep(0.5)
+            self.assertGreater(path.getsize(self.db_name), size, "Group not written after delay.")
+
+if __name__ == "__main__":
+    unittest.main()
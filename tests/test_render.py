@@ -0,0 +1,95 @@
+import io
+import json
+import unittest
+from datetime import date, datetime
+from task_cli.model import Status, Task
+from task_cli.render import render_agenda, render_tasks
+
+
+def make_task(id: int, description: str = "Test task") -> Task:
+    return Task(
+        id=id,
+        description=description,
+        status=Status.TODO,
+        due_date=date(2025, 5, 17) if id % 2 else None,
+        created_at=datetime(2025, 5, 14, 22, 8, 16),
+        updated_at=None,
+    )
+
+
+class TestRender(unittest.TestCase):
+    def render(self, tasks, format, window_size=1000):
+        output = io.StringIO()
+        count = render_tasks(tasks, format, output, window_size)
+        return count, output.getvalue()
+
+    def test_table(self):
+        count, text = self.render([make_task(1), make_task(10, "Longer task")], "table")
+        expected = (
+            "ID  STATUS  DESCRIPTION  DUE_DATE    CREATED_AT           UPDATED_AT\n"
+            "1   todo    Test task    2025-05-17  2025-05-14 22:08:16  -\n"
+            "10  todo    Longer task  -           2025-05-14 22:08:16  -\n"
+        )
+
+        self.assertEqual(count, 2)
+        self.assertEqual(text, expected)
+
+    def test_table_header_once_per_listing(self):
+        count, text = self.render([make_task(id) for id in range(1, 6)], "table", 2)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(text.count("DESCRIPTION"), 1)
+        self.assertEqual(len(text.splitlines()), 6)
+
+    def test_boxed(self):
+        task = make_task(1)
+        _, text = self.render([task], "boxed")
+        self.assertEqual(text, f"{task}\n")
+
+    def test_jsonl(self):
+        _, text = self.render([make_task(1), make_task(2)], "jsonl")
+        records = [json.loads(line) for line in text.splitlines()]
+
+        self.assertEqual(records[0]["status"], "todo")
+        self.assertEqual(records[0]["due_date"], "2025-05-17")
+        self.assertIsNone(records[1]["due_date"])
+
+    def test_tsv_escapes_description(self):
+        _, text = self.render([make_task(2, "Tab\there\nnewline")], "tsv")
+        header, row = text.splitlines()
+
+        self.assertEqual(header.split("\t")[2], "description")
+        self.assertEqual(row.split("\t")[2], "Tab\\there\\nnewline")
+        self.assertEqual(row.split("\t")[3], "")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.render([make_task(1)], "xml")
+
+    def test_empty(self):
+        self.assertEqual(self.render([], "table"), (0, ""))
+
+    def test_agenda_groups_by_due_date(self):
+        tasks = [make_task(id) for id in (1, 3, 5, 7)]
+
+        for task, day in zip(tasks, (10, 17, 17, 20)):
+            task.due_date = date(2025, 5, day)
+
+        output = io.StringIO()
+        count = render_agenda(tasks, date(2025, 5, 17), output, window_size=2)
+
+        self.assertEqual(count, 4)
+        self.assertEqual(
+            output.getvalue(),
+            "Overdue\n"
+            "  #1 [todo] Test task (due 2025-05-10)\n"
+            "Today\n"
+            "  #3 [todo] Test task\n"
+            "  #5 [todo] Test task\n"
+            "Tuesday 2025-05-20\n"
+            "  #7 [todo] Test task\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from os import path, remove
+from task_cli.client import forward
+from task_cli.task_cli import forwardable
+from task_cli.server import TaskServer
+
+
+class TestServer(unittest.TestCase):
+    db_name = "tests/data_testrun.db"
+    socket_name = "tests/data_testrun.sock"
+
+    def setUp(self):
+        self.server = TaskServer(self.socket_name, self.db_name)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.stop()
+
+        if path.exists(self.db_name):
+            remove(self.db_name)
+
+    def stop(self):
+        if self.thread.is_alive():
+            self.server.shutdown()
+            self.thread.join()
+            self.server.server_close()
+
+    def test_forward_command(self):
+        response = forward(["add", "Task #1"], self.socket_name)
+
+        self.assertIsNotNone(response)
+        self.assertEqual(response["code"], 0)
+        self.assertIn("Task was added successfully.", response["stdout"])
+
+        response = forward(["list", "--format", "tsv"], self.socket_name) or {}
+        self.assertIn("\tTask #1\t", response["stdout"])
+
+    def test_parser_errors_are_returned(self):
+        response = forward(["mark-done", "abc"], self.socket_name) or {}
+
+        self.assertEqual(response["code"], 2)
+        self.assertIn("invalid id or range", response["stderr"])
+
+    def test_nested_serve_is_rejected(self):
+        response = forward(["serve"], self.socket_name) or {}
+        self.assertEqual(response["code"], 1)
+
+    def test_other_storage_runs_in_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, "TASK_CLI_SOCKET": path.abspath(self.socket_name)}
+
+            def run(*argv, **extra_env):
+                return subprocess.run(
+                    [sys.executable, "-m", "task_cli.task_cli", *argv],
+                    cwd=directory,
+                    env={**env, **extra_env},
+                    capture_output=True,
+                    text=True,
+                )
+
+            self.assertEqual(run("--shards", "2", "add", "x").returncode, 0)
+            self.assertEqual(run("add", "y", TASK_CLI_SHARDS="3").returncode, 0)
+            self.assertEqual(run("--storage=log", "list").returncode, 0)
+            self.assertTrue(path.exists(path.join(directory, "tasks.2.db")))
+            self.assertTrue(path.exists(path.join(directory, "tasks.log")))
+
+        response = forward(["list", "--format", "tsv"], self.socket_name) or {}
+        self.assertEqual(response["stdout"], "")
+
+    def test_hung_server_is_not_waited_for(self):
+        hung_name = "tests/data_testrun_hung.sock"
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(hung_name)
+            listener.listen()
+
+            try:
+                self.assertIsNone(forward(["list"], hung_name, timeout=0.1))
+            finally:
+                remove(hung_name)
+
+    def test_forwardable(self):
+        self.assertTrue(forwardable(["--durability", "fast", "list"]))
+        self.assertFalse(forwardable(["--durability", "fast", "batch", "-"]))
+        self.assertFalse(forwardable(["--durability=fast", "serve"]))
+        self.assertFalse(forwardable(["--shards=2", "list"]))
+
+    def test_socket_removed_on_close(self):
+        self.stop()
+
+        self.assertFalse(path.exists(self.socket_name))
+        self.assertIsNone(forward(["list"], self.socket_name))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from datetime import date
+from os import path, remove
+from task_cli.model import CreateTask, Status, TaskSelection, UpdateTask
+from task_cli.sharding import ShardedTaskRepository, shard_paths
+
+
+class TestShardedTaskRepository(unittest.TestCase):
+    db_name = "tests/data_testrun.db"
+
+    def setUp(self):
+        self.repo = ShardedTaskRepository(self.db_name, 3)
+        self.repo.init_db()
+
+        for index in range(1, 8):
+            status = Status.DONE if index % 2 else Status.TODO
+            self.repo.add(CreateTask(status=status, description=f"Task #{index}"))
+
+    def tearDown(self):
+        self.repo.close()
+
+        for file_name in shard_paths(self.db_name, 3):
+            if path.exists(file_name):
+                remove(file_name)
+
+    def test_shard_paths(self):
+        self.assertEqual(shard_paths("tasks.db", 2), ["tasks.0.db", "tasks.1.db"])
+
+    def test_ids_are_global(self):
+        tasks = self.repo.find_by_status()
+        ids = [task.id for task in tasks]
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), 7)
+        self.assertEqual(sorted(shard.size() for shard in self.repo.shards), [2, 2, 3])
+
+        for task in tasks:
+            self.assertEqual(self.repo.find_by_id(task.id).description, task.description)
+
+    def test_iter_by_status(self):
+        ids = [task.id for task in self.repo.find_by_status()]
+        todo = [task.id for task in self.repo.find_by_status([Status.TODO])]
+
+        self.assertEqual([task.id for task in self.repo.iter_by_status(page_size=2)], ids)
+        self.assertEqual(
+            [task.id for task in self.repo.iter_by_status(after=ids[2], limit=3)], ids[3:6]
+        )
+        self.assertEqual(len(todo), 3)
+
+    def test_process_pool_fan_out(self):
+        with ShardedTaskRepository(self.db_name, 3, processes=2) as repo:
+            self.assertEqual(
+                [task.id for task in repo.find_by_status([Status.DONE])],
+                [task.id for task in self.repo.find_by_status([Status.DONE])],
+            )
+
+    def test_writes_are_routed(self):
+        ids = [task.id for task in self.repo.find_by_status([Status.DONE])]
+        todo = self.repo.find_by_status([Status.TODO])[-1].id
+
+        task = self.repo.update_by_id(todo, UpdateTask(due_date=date(2025, 5, 1)))
+        self.assertEqual(getattr(task, "id"), todo)
+        self.assertEqual(
+            self.repo.update_many((id, UpdateTask(status=Status.IN_PROGRESS)) for id in ids[:3]),
+            3,
+        )
+        self.assertEqual(
+            [task.id for task in self.repo.overdue(date(2025, 5, 2))], [todo]
+        )
+        self.assertTrue(self.repo.delete_by_id(ids[0]))
+        self.assertEqual(self.repo.delete_many(ids[1:3]), 2)
+        self.assertEqual(self.repo.size(), 4)
+
+    def test_matching_translates_ids(self):
+        ids = [task.id for task in self.repo.find_by_status()]
+        selection = TaskSelection(ids=[ids[0]], ranges=[(ids[2], ids[4])])
+
+        self.assertEqual(
+            [task.id for task in self.repo.iter_matching(selection)], [ids[0], *ids[2:5]]
+        )
+        self.assertEqual(
+            self.repo.update_matching(selection, UpdateTask(status=Status.IN_PROGRESS)), 4
+        )
+        self.assertEqual(
+            sorted(task.id for task in self.repo.iter_delete_matching(selection)),
+            [ids[0], *ids[2:5]],
+        )
+        self.assertEqual(self.repo.delete_matching(TaskSelection(ids=[ids[1], ids[5]])), 2)
+        self.assertEqual(self.repo.size(), 1)
+
+    def test_home_shard(self):
+        size = self.repo.shards[2].size()
+
+        with ShardedTaskRepository(self.db_name, 3, home=2) as repo:
+            task = repo.add(CreateTask(status=Status.TODO, description="Task #8"))
+            repo.add_many(CreateTask(status=Status.TODO, description="Task #9") for _ in range(2))
+
+            self.assertEqual(getattr(task, "id") % 3, 2)
+            self.assertEqual(repo.shards[2].size(), size + 3)
+
+        with self.assertRaises(ValueError):
+            ShardedTaskRepository(self.db_name, 3, home=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
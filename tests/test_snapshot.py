@@ -0,0 +1,118 @@
+import fcntl
+import time
+import unittest
+from datetime import date
+from os import path, remove
+from task_cli.database import init_db
+from task_cli.model import CreateTask, Status, UpdateTask
+from task_cli.repository import TaskRepository
+from task_cli.snapshot import (
+    TaskSnapshot,
+    build_snapshot,
+    rebuild_in_background,
+    rebuild_snapshot,
+    snapshot_path,
+)
+
+
+class TestTaskSnapshot(unittest.TestCase):
+    db_name = "tests/data_testrun.db"
+    today = date(2025, 5, 20)
+
+    def setUp(self):
+        self.snapshot_name = snapshot_path(self.db_name)
+        init_db(self.db_name)
+
+        with TaskRepository(self.db_name) as repository:
+            repository.add_many(
+                CreateTask(
+                    status=list(Status)[index % 3],
+                    description=f"Task #{index} ✓",
+                    due_date=date(2025, 5, index) if index % 2 else None,
+                )
+                for index in range(1, 11)
+            )
+
+        self.assertEqual(build_snapshot(self.db_name, self.snapshot_name), 10)
+
+    def tearDown(self):
+        for file_name in (self.db_name, self.snapshot_name, self.snapshot_name + ".lock"):
+            if path.exists(file_name):
+                remove(file_name)
+
+    def test_matches_database(self):
+        with TaskSnapshot.open(self.snapshot_name, self.db_name) as snapshot, TaskRepository(
+            self.db_name
+        ) as repository:
+            for status in (None, [Status.TODO], [Status.DONE, Status.TODO], []):
+                self.assertEqual(
+                    list(snapshot.iter_by_status(status, page_size=2)),
+                    list(repository.iter_by_status(status)),
+                )
+
+            self.assertEqual(
+                [task.id for task in snapshot.iter_by_status(after=4, limit=3)], [5, 6, 7]
+            )
+            self.assertEqual(
+                [task.id for task in snapshot.iter_by_status([Status.TODO], after=3)], [6, 9]
+            )
+            self.assertEqual(snapshot.counts(self.today), repository.counts(self.today))
+
+            for id in (1, 5, 10, 11):
+                self.assertEqual(snapshot.find_by_id(id), repository.find_by_id(id))
+
+            self.assertEqual(
+                list(snapshot.iter_by_due_date(date(2025, 5, 3), date(2025, 5, 9))),
+                list(repository.iter_by_due_date(date(2025, 5, 3), date(2025, 5, 9))),
+            )
+            self.assertEqual(
+                list(snapshot.overdue(self.today, limit=2)),
+                list(repository.overdue(self.today, limit=2)),
+            )
+
+    def test_stale_after_write(self):
+        with TaskRepository(self.db_name) as repository:
+            repository.update_by_id(1, UpdateTask(status=Status.DONE))
+
+        self.assertIsNone(TaskSnapshot.open(self.snapshot_name, self.db_name))
+        build_snapshot(self.db_name, self.snapshot_name)
+
+        with TaskSnapshot.open(self.snapshot_name, self.db_name) as snapshot:
+            self.assertEqual(snapshot.counts().by_status[Status.DONE], 4)
+
+    def test_reads_leave_snapshot_fresh(self):
+        with TaskRepository(self.db_name) as repository:
+            repository.find_by_status()
+
+        snapshot = TaskSnapshot.open(self.snapshot_name, self.db_name)
+        self.assertIsNotNone(snapshot)
+        getattr(snapshot, "close")()
+
+
+    def test_rebuild_in_background(self):
+        with TaskRepository(self.db_name) as repository:
+            repository.delete_by_id(1)
+
+        self.assertTrue(rebuild_in_background(self.db_name, self.snapshot_name))
+
+        for _ in range(100):
+            snapshot = TaskSnapshot.open(self.snapshot_name, self.db_name)
+
+            if snapshot is not None:
+                break
+
+            time.sleep(0.05)
+
+        self.assertIsNotNone(snapshot)
+
+        with snapshot:
+            self.assertEqual(snapshot.size(), 9)
+
+    def test_one_rebuild_at_a_time(self):
+        with open(self.snapshot_name + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self.assertFalse(rebuild_in_background(self.db_name, self.snapshot_name))
+            self.assertIsNone(rebuild_snapshot(self.db_name, self.snapshot_name))
+
+if __name__ == "__main__":
+    unittest.main()
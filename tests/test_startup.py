@@ -0,0 +1,121 @@
+import subprocess
+import sys
+import unittest
+
+# Cumulative import time budget for the in-process CLI, in microseconds. It is
+# generous to tolerate slow machines while still catching eager heavy imports.
+CLI_IMPORT_BUDGET = 150_000
+
+
+def loaded_modules(statement: str) -> set:
+    output = subprocess.run(
+        [sys.executable, "-c", f"import sys; {statement}; print(' '.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    return set(output.split())
+
+
+def import_time(module: str) -> int:
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    for line in output.splitlines():
+        _, cumulative, name = line.split("|")
+
+        if name.strip() == module:
+            return int(cumulative)
+
+    raise AssertionError(f"{module} was not imported.")
+
+
+class TestStartup(unittest.TestCase):
+    def test_entry_point_defers_cli(self):
+        modules = loaded_modules("import task_cli.task_cli")
+
+        for name in ("task_cli.cli", "argparse", "sqlite3", "socket", "json"):
+            self.assertNotIn(name, modules)
+
+    def test_cli_defers_optional_commands(self):
+        modules = loaded_modules("import task_cli.cli")
+
+        for name in (
+            "typing",
+            "json",
+            "subprocess",
+            "csv",
+            "socketserver",
+            "asyncio",
+            "task_cli.transfer",
+            "task_cli.server",
+            "task_cli.client",
+        ):
+            self.assertNotIn(name, modules)
+
+    def test_parsing_defers_shutil(self):
+        modules = loaded_modules(
+            "from task_cli.cli import create_parser; create_parser('list').parse_args(['list'])"
+        )
+        self.assertNotIn("shutil", modules)
+
+    def test_cli_import_time(self):
+        self.assertLess(import_time("task_cli.cli"), CLI_IMPORT_BUDGET)
+
+    def test_parser_builds_only_invoked_command(self):
+        from task_cli.cli import create_parser
+        from task_cli.options import find_command
+
+        argv = ["--durability", "fast", "list", "--limit", "5"]
+        self.assertEqual(find_command(argv), "list")
+
+        args = create_parser(find_command(argv)).parse_args(argv)
+        self.assertEqual(args.command, "list")
+        self.assertEqual(args.limit, 5)
+        self.assertEqual(args.durability, "fast")
+
+        with self.assertRaises(SystemExit):
+            create_parser("list").parse_args(["add", "Task #1"])
+
+    def test_help_before_command_lists_all_commands(self):
+        from task_cli.options import find_command
+
+        self.assertIsNone(find_command(["-h", "list"]))
+        self.assertIsNone(find_command(["--shards", "2", "--help", "add"]))
+        self.assertEqual(find_command(["list", "-h"]), "list")
+
+    def test_page_size_must_be_positive(self):
+        from task_cli.cli import create_parser
+
+        args = create_parser("list").parse_args(["list", "--page-size", "1"])
+        self.assertEqual(args.page_size, 1)
+
+        for value in ("0", "-1", "x"):
+            with self.assertRaises(SystemExit):
+                create_parser("list").parse_args(["list", "--page-size", value])
+
+    def test_limit_must_not_be_negative(self):
+        from task_cli.cli import create_parser
+
+        for command in ("list", "overdue", "upcoming", "agenda", "changes"):
+            args = create_parser(command).parse_args([command, "--limit", "0"])
+            self.assertEqual(args.limit, 0)
+
+            with self.assertRaises(SystemExit):
+                create_parser(command).parse_args([command, "--limit", "-1"])
+
+    def test_chunk_size_must_be_positive(self):
+        from task_cli.cli import create_parser
+
+        for command in ("import", "export", "batch"):
+            with self.assertRaises(SystemExit):
+                create_parser(command).parse_args([command, "tasks.jsonl", "--chunk-size", "0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
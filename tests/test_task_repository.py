@@ -1,34 +1,41 @@
-from datetime import datetime
+import sqlite3
+import time
+from datetime import date, datetime
 from unittest.mock import Mock, patch
 import unittest
 from os import path, remove
 from task_cli.database import init_db
-from task_cli.model import CreateTask, Status, Task, UpdateTask
-from task_cli.repository import TaskRepository
+from task_cli.model import ChangeOp, CreateTask, Status, Task, TaskSelection, UpdateTask
+from task_cli.log_store import LogTaskStore
+from task_cli.repository import GroupCommit, TaskRepository, bind_update
+from task_cli.store import TaskStore
 
 DB_FILE = "tests/data_testrun.json"
 
 
-class TestTaskRepository(unittest.TestCase):
+class TaskStoreTests:
+    # Tests shared by every TaskStore backend; subclasses open the store.
     db_name = "tests/data_testrun.db"
 
+    def open_repository(self) -> TaskStore:
+        raise NotImplementedError
+
     def setUp(self):
-        init_db(self.db_name)
-        repo = TaskRepository(db=self.db_name)
-        t1 = CreateTask(status=Status.TODO, description="Task #1")
-        t2 = CreateTask(status=Status.IN_PROGRESS, description="Task #2")
-        t3 = CreateTask(status=Status.DONE, description="Task #3")
-        tasks = [t1, t2, t3]
+        with self.open_repository() as repo:
+            t1 = CreateTask(status=Status.TODO, description="Task #1")
+            t2 = CreateTask(status=Status.IN_PROGRESS, description="Task #2")
+            t3 = CreateTask(status=Status.DONE, description="Task #3")
+            tasks = [t1, t2, t3]
 
-        for task in tasks:
-            repo.add(task)
+            for task in tasks:
+                repo.add(task)
 
     def tearDown(self):
         if path.exists(self.db_name):
             remove(self.db_name)
 
     def test_add(self):
-        repo = TaskRepository(db=self.db_name)
+        repo = self.open_repository()
         self.assertEqual(repo.size(), 3, "Repository size mismatch.")
 
         for task_id in [1, 2, 3]:
@@ -45,7 +52,7 @@ class TestTaskRepository(unittest.TestCase):
             )
 
     def test_find_by_id(self):
-        repo = TaskRepository(db=self.db_name)
+        repo = self.open_repository()
 
         t1 = repo.find_by_id(1)
         t2 = repo.find_by_id(2)
@@ -57,24 +64,8 @@ class TestTaskRepository(unittest.TestCase):
         self.assertIsNotNone(t3, "Task with id 3 not found in repository.")
         self.assertIsNone(t4, "Task with id 4 found in repository.")
 
-    def test_add_task_returns_none_on_failure(self):
-        repo = TaskRepository(self.db_name)
-        task = CreateTask(description="Test task", status=Status.TODO)
-
-        with patch("sqlite3.connect") as mock_connect:
-            mock_conn = Mock()
-            mock_conn.close = Mock()
-            mock_cursor = Mock()
-            mock_cursor.execute.return_value.lastrowid = None
-            mock_cursor.fetchone.return_value = None
-            mock_conn.cursor.return_value = mock_cursor
-            mock_connect.return_value.__enter__.return_value = mock_conn
-
-            result = repo.add(task)
-            self.assertIsNone(result)
-
     def test_find_by_status(self):
-        repo = TaskRepository(db=self.db_name)
+        repo = self.open_repository()
         tasks_all = repo.find_by_status()
         tasks_todo = repo.find_by_status([Status.TODO])
         tasks_in_progress = repo.find_by_status([Status.IN_PROGRESS])
@@ -84,8 +75,25 @@ class TestTaskRepository(unittest.TestCase):
         self.assertEqual(len(tasks_in_progress), 1, "Status filter mismatch.")
         self.assertEqual(len(tasks_done), 1, "Status filter mismatch.")
 
+    def test_iter_by_status_pagination(self):
+        repo = self.open_repository()
+        repo.add_many(
+            CreateTask(status=Status.TODO, description=f"Task #{index}")
+            for index in range(4, 11)
+        )
+
+        ids = [task.id for task in repo.iter_by_status(page_size=3)]
+        self.assertEqual(ids, list(range(1, 11)), "Pagination order mismatch.")
+
+        ids = [task.id for task in repo.iter_by_status(after=2, limit=4, page_size=3)]
+        self.assertEqual(ids, [3, 4, 5, 6], "Keyset window mismatch.")
+
+        ids = [task.id for task in repo.iter_by_status([Status.TODO], page_size=2)]
+        self.assertEqual(ids, [1, *range(4, 11)], "Status filter mismatch.")
+        self.assertEqual(list(repo.iter_by_status([])), [])
+
     def test_due_date(self):
-        repo = TaskRepository(db=self.db_name)
+        repo = self.open_repository()
         task_no_due = repo.add(CreateTask(status=Status.TODO, description="Coding."))
 
         if not task_no_due:
@@ -107,7 +115,7 @@ class TestTaskRepository(unittest.TestCase):
         self.assertEqual(str(task_due.due_date), "2025-05-17")
 
     def test_update(self):
-        repo = TaskRepository(db=self.db_name)
+        repo = self.open_repository()
         task = repo.find_by_id(1)
 
         self.assertEqual(
@@ -132,8 +140,29 @@ class TestTaskRepository(unittest.TestCase):
             "Status value mismatch - did not update to expected value.",
         )
 
+    def test_update_by_id_returns_task(self):
+        repo = self.open_repository()
+        task = repo.update_by_id(2, UpdateTask(description="Task #2 (edited)"))
+
+        if task is None:
+            self.fail("Task with id 2 not found in repository.")
+
+        self.assertEqual(task.description, "Task #2 (edited)")
+        self.assertIsNotNone(task.updated_at)
+        self.assertIsNone(repo.update_by_id(4, UpdateTask(status=Status.DONE)))
+
+    def test_conditional_update(self):
+        repo = self.open_repository()
+        data = UpdateTask(status=Status.DONE)
+
+        self.assertIsNone(repo.update_by_id(1, data, if_status=[Status.IN_PROGRESS]))
+        self.assertEqual(getattr(repo.find_by_id(1), "status"), Status.TODO)
+
+        task = repo.update_by_id(1, data, if_status=[Status.TODO, Status.IN_PROGRESS])
+        self.assertEqual(getattr(task, "status"), Status.DONE)
+
     def test_delete(self):
-        repo = TaskRepository(db=self.db_name)
+        repo = self.open_repository()
         self.assertEqual(repo.size(), 3, "Repository size mismatch.")
 
         for task in repo.find_by_status():
@@ -141,37 +170,113 @@ class TestTaskRepository(unittest.TestCase):
 
         self.assertEqual(repo.size(), 0, "Repository size mismatch.")
 
-    def test_create_task_desc_validator(self):
-        task = CreateTask(status=Status.TODO, description="Valid description")
-        self.assertIsNotNone(task, "Task creation failed with valid description.")
+    def test_add_many(self):
+        repo = self.open_repository()
+        tasks = (
+            CreateTask(status=Status.TODO, description=f"Bulk #{index}")
+            for index in range(100)
+        )
 
-        with self.assertRaises(ValueError):
-            CreateTask(status=Status.TODO, description="Invalid description" * 100)
+        self.assertEqual(repo.add_many(tasks), 100, "Inserted count mismatch.")
+        self.assertEqual(repo.size(), 103, "Repository size mismatch.")
+
+    def test_update_many(self):
+        repo = self.open_repository()
+        updates = [
+            (1, UpdateTask(status=Status.DONE)),
+            (2, UpdateTask(status=Status.DONE)),
+            (3, UpdateTask(description="Task #3 (edited)")),
+            (4, UpdateTask(status=Status.DONE)),
+        ]
+
+        self.assertEqual(repo.update_many(updates), 3, "Updated count mismatch.")
+        self.assertEqual(len(repo.find_by_status([Status.DONE])), 3)
+        self.assertEqual(getattr(repo.find_by_id(3), "description"), "Task #3 (edited)")
+
+    def test_delete_many(self):
+        repo = self.open_repository()
+        self.assertEqual(repo.delete_many([1, 3, 4]), 2, "Deleted count mismatch.")
+        self.assertEqual(repo.size(), 1, "Repository size mismatch.")
+
+    def test_update_matching(self):
+        repo = self.open_repository()
+        repo.update_by_id(2, UpdateTask(due_date=date(2025, 5, 1)))
+        done = UpdateTask(status=Status.DONE)
+
+        self.assertEqual(repo.update_matching(TaskSelection(ids=[1, 4], ranges=[(3, 9)]), done), 2)
+        self.assertEqual(
+            repo.update_matching(TaskSelection(status=[Status.TODO]), UpdateTask(description="-")),
+            0,
+        )
 
-    def test_task_repr(self):
-        task = Task(
-            id=1,
-            description="Test task",
-            status=Status.TODO,
-            due_date=None,
-            created_at=datetime(2025, 5, 14, 22, 8, 16),
-            updated_at=datetime(2025, 5, 14, 22, 8, 16),
+        selection = TaskSelection(status=[Status.IN_PROGRESS], due_before=date(2025, 5, 2))
+        self.assertEqual(
+            [(task.id, task.status) for task in repo.iter_update_matching(selection, done)],
+            [(2, Status.DONE)],
         )
+        self.assertEqual(len(repo.find_by_status([Status.DONE])), 3)
 
-        expected_str = """
--------------------------------------
-| ID          | 1                   |
-| STATUS      | Status.TODO         |
-| DESCRIPTION | Test task           |
-| DUE_DATE    | -                   |
-| CREATED_AT  | 2025-05-14 22:08:16 |
-| UPDATED_AT  | 2025-05-14 22:08:16 |
--------------------------------------""".strip()
+    def test_delete_matching(self):
+        repo = self.open_repository()
 
-        self.assertEqual(str(task), expected_str)
+        self.assertEqual(repo.delete_matching(TaskSelection(ranges=[(2, 3)], status=[])), 0)
+        self.assertEqual(
+            [task.id for task in repo.iter_delete_matching(TaskSelection(ranges=[(2, 9)]))],
+            [2, 3],
+        )
+        self.assertEqual(repo.delete_matching(TaskSelection()), 1)
+        self.assertEqual(repo.size(), 0)
+
+    def test_counts(self):
+        repo = self.open_repository()
+        repo.update_by_id(2, UpdateTask(due_date=date(2025, 1, 1)))
+        repo.update_by_id(3, UpdateTask(due_date=date(2025, 1, 1)))
+
+        counts = repo.counts(today=date(2025, 6, 1))
+        self.assertEqual(counts.by_status, dict.fromkeys(Status, 1))
+        self.assertEqual(counts.total, 3)
+        self.assertEqual(counts.overdue, 1, "Done tasks are never overdue.")
+        self.assertEqual(getattr(counts.oldest_open, "id"), 1)
+
+        repo.update_by_id(1, UpdateTask(status=Status.DONE))
+        repo.delete_by_id(3)
+
+        counts = repo.counts(today=date(2025, 6, 1))
+        self.assertEqual(list(counts.by_status.values()), [0, 1, 1])
+        self.assertEqual(getattr(counts.oldest_open, "id"), 2)
+        self.assertEqual(repo.size(), 2)
+
+    def test_iter_by_due_date(self):
+        repo = self.open_repository()
+        due_dates = {1: date(2025, 5, 20), 2: date(2025, 5, 10), 3: date(2025, 5, 10)}
+        repo.add_many(
+            CreateTask(status=Status.TODO, description=f"Task #{id}", due_date=date(2025, 5, 10))
+            for id in range(4, 7)
+        )
+        repo.add(CreateTask(status=Status.TODO, description="No due date"))
+
+        for id, due_date in due_dates.items():
+            repo.update_by_id(id, UpdateTask(due_date=due_date))
+
+        ids = [task.id for task in repo.iter_by_due_date(page_size=2)]
+        self.assertEqual(ids, [3, 2, 4, 5, 6, 1], "Tasks not in (due_date, status, id) order.")
+
+        ids = [
+            task.id
+            for task in repo.iter_by_due_date(
+                date(2025, 5, 10), date(2025, 5, 11), [Status.TODO, Status.DONE], page_size=2
+            )
+        ]
+        self.assertEqual(ids, [3, 4, 5, 6])
+        self.assertEqual(list(repo.iter_by_due_date(status=[])), [])
+
+        today = date(2025, 5, 15)
+        self.assertEqual([task.id for task in repo.overdue(today)], [2, 4, 5, 6])
+        self.assertEqual([task.id for task in repo.upcoming(5, today)], [1])
+        self.assertEqual(list(repo.upcoming(4, today)), [])
 
     def test_update_task_desc_validator(self):
-        repo = TaskRepository(db=self.db_name)
+        repo = self.open_repository()
         task = repo.find_by_id(1)
 
         if task is None:
@@ -198,5 +303,233 @@ class TestTaskRepository(unittest.TestCase):
         )
 
 
+class TestTaskRepository(TaskStoreTests, unittest.TestCase):
+    def open_repository(self) -> TaskRepository:
+        return TaskRepository(db=self.db_name)
+
+    def setUp(self):
+        init_db(self.db_name)
+        super().setUp()
+
+    def test_add_task_returns_none_on_failure(self):
+        repo = TaskRepository(self.db_name)
+        task = CreateTask(description="Test task", status=Status.TODO)
+
+        with patch("sqlite3.connect") as mock_connect:
+            mock_conn = Mock()
+            mock_conn.close = Mock()
+            mock_cursor = Mock()
+            mock_cursor.execute.return_value.lastrowid = None
+            mock_cursor.fetchone.return_value = None
+            mock_conn.cursor.return_value = mock_cursor
+            mock_connect.return_value.__enter__.return_value = mock_conn
+
+            result = repo.add(task)
+            self.assertIsNone(result)
+
+    def test_writes_without_returning(self):
+        repo = TaskRepository(db=self.db_name)
+
+        with patch("task_cli.repository.RETURNING_SUPPORTED", False):
+            task = repo.add(CreateTask(status=Status.TODO, description="Task #4"))
+            updated = repo.update_by_id(4, UpdateTask(status=Status.DONE))
+            missing = repo.update_by_id(5, UpdateTask(status=Status.DONE))
+
+        self.assertEqual(getattr(task, "id"), 4)
+        self.assertEqual(getattr(updated, "status"), Status.DONE)
+        self.assertIsNone(missing)
+
+    def test_bind_update(self):
+        data = UpdateTask(due_date=date(2025, 5, 1), status=Status.DONE)
+        compiled, values = bind_update(data)
+
+        self.assertEqual(compiled.names, ("status", "due_date", "updated_at"))
+        self.assertEqual(
+            compiled.by_id,
+            "UPDATE tasks SET status = ?, due_date = ?, updated_at = ? WHERE id = ?",
+        )
+        self.assertEqual(values, ["done", "2025-05-01", data.updated_at])
+        self.assertIs(bind_update(UpdateTask(status=Status.TODO, due_date=None))[0], compiled)
+
+    def test_matching_without_returning(self):
+        repo = TaskRepository(db=self.db_name)
+        selection = TaskSelection(ids=[1, 3])
+
+        with patch("task_cli.repository.RETURNING_SUPPORTED", False):
+            updated = list(repo.iter_update_matching(selection, UpdateTask(status=Status.DONE)))
+            deleted = list(repo.iter_delete_matching(selection))
+
+        self.assertEqual([task.id for task in updated], [1, 3])
+        self.assertEqual({task.status for task in updated}, {Status.DONE})
+        self.assertEqual([task.id for task in deleted], [1, 3])
+        self.assertEqual(repo.size(), 1)
+
+    def test_closing_returning_iterator_rolls_back(self):
+        repo = TaskRepository(db=self.db_name)
+        tasks = repo.iter_delete_matching(TaskSelection(), page_size=1)
+
+        next(tasks)
+        tasks.close()
+        self.assertEqual(repo.size(), 3)
+
+    def test_writes_wait_for_returning_iterator(self):
+        repo = TaskRepository(db=self.db_name)
+        deleted = repo.iter_delete_matching(TaskSelection(ids=[1]))
+        updated = repo.iter_update_matching(TaskSelection(), UpdateTask(status=Status.DONE))
+
+        self.assertEqual(next(deleted).id, 1)
+
+        with self.assertRaises(RuntimeError):
+            next(updated)
+
+        with self.assertRaises(RuntimeError):
+            repo.add(CreateTask(status=Status.TODO, description="Task #4"))
+
+        deleted.close()
+        repo.add(CreateTask(status=Status.TODO, description="Task #4"))
+
+        with TaskRepository(db=self.db_name) as other:
+            self.assertEqual(other.size(), 4)
+
+    def test_search(self):
+        repo = TaskRepository(db=self.db_name)
+        repo.add(CreateTask(status=Status.TODO, description="Pay the invoice"))
+        repo.add(CreateTask(status=Status.TODO, description="Archive invoices"))
+
+        self.assertEqual({task.id for task in repo.search("invoice")}, {4, 5})
+        self.assertEqual([task.id for task in repo.search("pay inv")], [4])
+        self.assertEqual(len(repo.search("inv", limit=1, offset=1)), 1)
+        self.assertEqual(repo.search('"'), [])
+        self.assertEqual(repo.search("   "), [])
+
+    def test_search_index_follows_writes(self):
+        repo = TaskRepository(db=self.db_name)
+        repo.update_by_id(1, UpdateTask(description="Renamed task"))
+        repo.delete_by_id(2)
+
+        self.assertEqual([task.id for task in repo.search("renamed")], [1])
+        self.assertEqual({task.id for task in repo.search("task")}, {1, 3})
+
+    def test_check_and_rebuild_counts(self):
+        repo = TaskRepository(db=self.db_name)
+        self.assertEqual(repo.check_counts(), {})
+
+        with repo.transaction() as connection:
+            connection.execute("UPDATE task_counts SET count = 7 WHERE status = 'todo'")
+
+        self.assertEqual(repo.check_counts(), {Status.TODO: (7, 1)})
+        self.assertEqual(repo.rebuild_counts(), {Status.TODO: (7, 1)})
+        self.assertEqual(repo.check_counts(), {})
+        self.assertEqual(repo.size(), 3)
+
+    def test_iter_changes(self):
+        repo = TaskRepository(db=self.db_name)
+        self.assertEqual(repo.last_change(), 3)
+
+        repo.update_by_id(1, UpdateTask(status=Status.DONE, due_date=date(2025, 5, 1)))
+        repo.update_by_id(2, UpdateTask(description="Task #2"))
+        repo.delete_by_id(3)
+
+        changes = list(repo.iter_changes(since=3, page_size=1))
+
+        self.assertEqual([change.seq for change in changes], [4, 5, 6])
+        self.assertEqual(
+            [(change.op, change.task_id) for change in changes],
+            [(ChangeOp.UPDATE, 1), (ChangeOp.UPDATE, 2), (ChangeOp.DELETE, 3)],
+        )
+        self.assertEqual(
+            set(changes[0].fields), {"status", "due_date", "updated_at"}
+        )
+        self.assertEqual(changes[0].fields["due_date"], "2025-05-01")
+        self.assertEqual(set(changes[1].fields), {"updated_at"})
+        self.assertEqual(changes[2].fields, {})
+
+        inserted = next(repo.iter_changes())
+        self.assertEqual(inserted.op, ChangeOp.INSERT)
+        self.assertEqual(inserted.fields["description"], "Task #1")
+        self.assertEqual([change.seq for change in repo.iter_changes(4, limit=1)], [5])
+        self.assertEqual(repo.last_change(), 6)
+
+    def test_group_commit(self):
+        repo = TaskRepository(db=self.db_name, group_commit=GroupCommit(3, 60))
+        reader = TaskRepository(db=self.db_name)
+
+        repo.add(CreateTask(status=Status.TODO, description="Task #4"))
+        repo.add(CreateTask(status=Status.TODO, description="Task #5"))
+        self.assertEqual(repo.size(), 5, "Writer should see its own writes.")
+        self.assertEqual(reader.size(), 3, "Writes committed before window closed.")
+
+        repo.delete_by_id(1)
+        self.assertEqual(reader.size(), 4, "Writes not committed after window closed.")
+
+        repo.add(CreateTask(status=Status.TODO, description="Task #6"))
+        repo.close()
+        self.assertEqual(reader.size(), 5, "Pending writes not flushed on close.")
+        reader.close()
+
+    def test_group_commit_after_delay_without_writes(self):
+        repo = TaskRepository(db=self.db_name, group_commit=GroupCommit(100, 0.1))
+        repo.add(CreateTask(status=Status.TODO, description="Task #4"))
+        time.sleep(0.5)
+
+        with TaskRepository(db=self.db_name) as writer:
+            self.assertEqual(writer.size(), 4, "Window not committed after max delay.")
+            writer.add(CreateTask(status=Status.TODO, description="Task #5"))
+
+        repo.add(CreateTask(status=Status.TODO, description="Task #6"))
+        self.assertEqual(repo.size(), 6)
+        repo.close()
+
+    def test_group_commit_failed_write_keeps_window(self):
+        repo = TaskRepository(db=self.db_name, group_commit=GroupCommit(10, 60))
+        repo.add(CreateTask(status=Status.TODO, description="Task #4"))
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            with repo.transaction() as connection:
+                connection.execute("DELETE FROM tasks WHERE id = 2")
+                connection.execute("INSERT INTO tasks (description, status) VALUES ('x', 'bad')")
+
+        repo.flush()
+        ids = [task.id for task in TaskRepository(db=self.db_name).find_by_status()]
+        self.assertEqual(ids, [1, 2, 3, 4])
+        repo.close()
+
+    def test_create_task_desc_validator(self):
+        task = CreateTask(status=Status.TODO, description="Valid description")
+        self.assertIsNotNone(task, "Task creation failed with valid description.")
+
+        with self.assertRaises(ValueError):
+            CreateTask(status=Status.TODO, description="Invalid description" * 100)
+
+    def test_task_repr(self):
+        task = Task(
+            id=1,
+            description="Test task",
+            status=Status.TODO,
+            due_date=None,
+            created_at=datetime(2025, 5, 14, 22, 8, 16),
+            updated_at=datetime(2025, 5, 14, 22, 8, 16),
+        )
+
+        expected_str = """
+-------------------------------------
+| ID          | 1                   |
+| STATUS      | Status.TODO         |
+| DESCRIPTION | Test task           |
+| DUE_DATE    | -                   |
+| CREATED_AT  | 2025-05-14 22:08:16 |
+| UPDATED_AT  | 2025-05-14 22:08:16 |
+-------------------------------------""".strip()
+
+        self.assertEqual(str(task), expected_str)
+
+
+class TestLogTaskStore(TaskStoreTests, unittest.TestCase):
+    db_name = "tests/data_testrun.log"
+
+    def open_repository(self) -> LogTaskStore:
+        return LogTaskStore(self.db_name)
+
+
 if __name__ == "__main__":
     unittest.main()
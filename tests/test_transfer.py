@@ -0,0 +1,98 @@
+import json
+import unittest
+from os import path, remove
+from task_cli.database import init_db
+from task_cli.model import CreateTask, Status
+from task_cli.repository import TaskRepository
+from task_cli.transfer import detect_format, export_tasks, import_tasks
+
+
+class TestTransfer(unittest.TestCase):
+    db_name = "tests/data_testrun.db"
+    files = ["tests/data_testrun.jsonl", "tests/data_testrun.csv"]
+
+    def setUp(self):
+        init_db(self.db_name)
+        self.repo = TaskRepository(db=self.db_name)
+        self.repo.add_many(
+            [
+                CreateTask(status=Status.TODO, description="Task #1"),
+                CreateTask(status=Status.IN_PROGRESS, description="Task, #2"),
+                CreateTask(status=Status.DONE, description='Task "#3"'),
+            ]
+        )
+
+    def tearDown(self):
+        self.repo.close()
+
+        for file_name in [self.db_name, *self.files]:
+            if path.exists(file_name):
+                remove(file_name)
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format("tasks.jsonl"), "jsonl")
+        self.assertEqual(detect_format("tasks.CSV"), "csv")
+
+        with self.assertRaises(ValueError):
+            detect_format("tasks.txt")
+
+    def test_export_jsonl(self):
+        self.assertEqual(export_tasks(self.repo, self.files[0], chunk_size=2), 3)
+
+        with open(self.files[0], encoding="utf-8") as file:
+            records = [json.loads(line) for line in file]
+
+        self.assertEqual([record["id"] for record in records], [1, 2, 3])
+        self.assertEqual(records[1]["status"], "in-progress")
+
+    def test_round_trip(self):
+        for file_name in self.files:
+            export_tasks(self.repo, file_name)
+
+        for file_name in self.files:
+            self.assertEqual(import_tasks(self.repo, file_name, chunk_size=2), 3)
+
+        descriptions = [task.description for task in self.repo.find_by_status()]
+        self.assertEqual(descriptions, ["Task #1", "Task, #2", 'Task "#3"'] * 3)
+
+    def test_import_updates_search_and_journal(self):
+        export_tasks(self.repo, self.files[0])
+        last_change = self.repo.last_change()
+        import_tasks(self.repo, self.files[0], chunk_size=2)
+
+        self.assertEqual([task.id for task in self.repo.search("task")], [1, 2, 3, 4, 5, 6])
+        changes = self.repo.iter_changes(last_change)
+        self.assertEqual(
+            [(change.task_id, change.fields["description"]) for change in changes],
+            [(4, "Task #1"), (5, "Task, #2"), (6, 'Task "#3"')],
+        )
+
+        # The insert triggers are back in place for later writes.
+        self.repo.add(CreateTask(status=Status.TODO, description="Invoice"))
+        self.assertEqual([task.id for task in self.repo.search("invoice")], [7])
+        self.assertEqual(self.repo.last_change(), last_change + 4)
+
+    def test_import_updates_counts(self):
+        export_tasks(self.repo, self.files[0])
+        import_tasks(self.repo, self.files[0], chunk_size=2)
+        self.repo.add(CreateTask(status=Status.DONE, description="Task #4"))
+
+        self.assertEqual(
+            self.repo.counts().by_status,
+            {Status.TODO: 2, Status.IN_PROGRESS: 2, Status.DONE: 3},
+        )
+        self.assertEqual(self.repo.check_counts(), {})
+
+    def test_import_invalid_status(self):
+        with open(self.files[0], "w", encoding="utf-8") as file:
+            file.write('{"description": "Task", "status": "blocked"}\n')
+
+        with self.assertRaises(ValueError):
+            import_tasks(self.repo, self.files[0])
+
+        self.repo.add(CreateTask(status=Status.TODO, description="Invoice"))
+        self.assertEqual([task.id for task in self.repo.search("invoice")], [4])
+
+
+if __name__ == "__main__":
+    unittest.main()